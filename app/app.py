@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Request, status, Depends
+from fastapi import FastAPI, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from app.config import get_config
@@ -6,7 +6,7 @@ from app.context import get_context
 from app.log import get_log
 from app.routers import (static_routers, user_routers, album_routers,
                          system_routers)
-from app.database import Base, sessionmanager, get_session
+from app.database import Base, sessionmanager, upgrade_schema
 from app.errors import Msg
 from contextlib import asynccontextmanager
 from pydantic import ValidationError
@@ -16,18 +16,57 @@ import os
 import fnmatch
 import importlib.util
 import inspect
+import asyncio
 from app.hooks import H, Hook
-from app.cache import get_cache
+from app.cache import cachepool
+from app.local_cache import listen_invalidations
+from app.revocation import listen_revocations
+from app.warmup import warm_up
 
 cfg = get_config()
 ctx = get_context()
 log = get_log()
 
 
-async def after_startup(session=Depends(get_session),
-                        cache=Depends(get_cache)):
-    hook = Hook(session, cache)
-    await hook.execute(H.AFTER_STARTUP)
+async def warm_up_cache():
+    """
+    Warm up the cache in its own session, cancelled when the time budget
+    runs out. Errors are logged and do not stop the startup.
+    """
+    session = sessionmanager.async_sessionmaker()
+    try:
+        await asyncio.wait_for(warm_up(session, cachepool.client),
+                               timeout=cfg.WARMUP_BUDGET)
+
+    except asyncio.TimeoutError:
+        log.error("Warm-up budget exceeded; module=app; "
+                  "function=warm_up_cache; budget=%s;" % cfg.WARMUP_BUDGET)
+
+    except Exception as e:
+        log.error("Warm-up failed; module=app; function=warm_up_cache; "
+                  "e=%s;" % str(e))
+
+    finally:
+        await session.close()
+
+
+async def after_startup():
+    """Warm up the cache and execute the startup hooks."""
+    if cfg.WARMUP_ENABLED:
+        await warm_up_cache()
+
+    session = sessionmanager.get_session()
+    try:
+        hook = Hook(session, cachepool.client)
+        await hook.execute(H.AFTER_STARTUP)
+
+    except Exception:
+        await session.rollback()
+        raise
+    else:
+        await session.commit()
+    finally:
+        await session.close()
 
 
 @asynccontextmanager
@@ -61,10 +100,26 @@ async def lifespan(app: FastAPI):
 
     async with sessionmanager.async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+
+    cachepool.open()
+    listen = cfg.LOCAL_CACHE_ENABLED and cachepool.is_shared
+    if listen:
+        listener = asyncio.create_task(listen_invalidations())
+
+    revoke = cfg.REVOCATION_ENABLED and cachepool.is_shared
+    if revoke:
+        revoke_listener = asyncio.create_task(listen_revocations())
 
     await after_startup()
     yield
 
+    if listen:
+        listener.cancel()
+    if revoke:
+        revoke_listener.cancel()
+    await cachepool.close()
+
 
 app = FastAPI(lifespan=lifespan, title=cfg.APP_TITLE, version=cfg.APP_VERSION)
 app.include_router(static_routers.router)
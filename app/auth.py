@@ -1,16 +1,21 @@
 
 from app.models.user_models import User, UserRole
 from sqlalchemy.ext.asyncio import AsyncSession
-from redis import Redis
+from app.cache import CacheBackend
 from app.database import get_session
 from app.cache import get_cache
 from fastapi import Depends
 from app.repository import Repository
+from app.managers.token_manager import TokenManager
+from app.revocation import RevocationManager
+from app.local_cache import local_cache
+from app.config import get_config
 from fastapi.security import HTTPBearer
 from app.helpers.jwt_helper import JWTHelper
 from jwt.exceptions import ExpiredSignatureError, PyJWTError
 from app.errors import E, Msg
 
+cfg = get_config()
 jwt = HTTPBearer()
 
 
@@ -29,7 +34,8 @@ def auth(user_role: UserRole):
 
 
 async def _can_read(session: AsyncSession = Depends(get_session),
-                    cache: Redis = Depends(get_cache), header=Depends(jwt)):
+                    cache: CacheBackend = Depends(get_cache),
+                    header=Depends(jwt)):
     user_token = header.credentials
     user = await _auth(user_token, session, cache)
     if not user.can_read:
@@ -38,7 +44,8 @@ async def _can_read(session: AsyncSession = Depends(get_session),
 
 
 async def _can_write(session: AsyncSession = Depends(get_session),
-                     cache: Redis = Depends(get_cache), header=Depends(jwt)):
+                     cache: CacheBackend = Depends(get_cache),
+                     header=Depends(jwt)):
     user_token = header.credentials
     user = await _auth(user_token, session, cache)
     if not user.can_write:
@@ -47,7 +54,8 @@ async def _can_write(session: AsyncSession = Depends(get_session),
 
 
 async def _can_edit(session: AsyncSession = Depends(get_session),
-                    cache: Redis = Depends(get_cache), header=Depends(jwt)):
+                    cache: CacheBackend = Depends(get_cache),
+                    header=Depends(jwt)):
     user_token = header.credentials
     user = await _auth(user_token, session, cache)
     if not user.can_edit:
@@ -56,7 +64,8 @@ async def _can_edit(session: AsyncSession = Depends(get_session),
 
 
 async def _can_admin(session: AsyncSession = Depends(get_session),
-                     cache: Redis = Depends(get_cache), header=Depends(jwt)):
+                     cache: CacheBackend = Depends(get_cache),
+                     header=Depends(jwt)):
     user_token = header.credentials
     user = await _auth(user_token, session, cache)
     if not user.can_admin:
@@ -64,18 +73,35 @@ async def _can_admin(session: AsyncSession = Depends(get_session),
     return user
 
 
-async def _auth(user_token: str, session: AsyncSession, cache: Redis):
+async def _auth(user_token: str, session: AsyncSession, cache: CacheBackend):
     if not user_token:
         raise E("user_token", user_token, Msg.USER_TOKEN_EMPTY)
 
-    try:
-        token_payload = JWTHelper.decode_token(user_token)
+    token_manager = TokenManager(
+        cache, local_cache=local_cache if cfg.LOCAL_CACHE_ENABLED else None)
+    token_verified = await token_manager.get(user_token)
 
-    except ExpiredSignatureError:
-        raise E("user_token", user_token, Msg.USER_TOKEN_EXPIRED)
+    # While the filter is synced, revoked tokens are rejected by it and
+    # the jti of the user is not checked.
+    revocation_manager = RevocationManager(cache)
+    revocation_synced = cfg.REVOCATION_ENABLED and revocation_manager.is_synced
 
-    except PyJWTError:
-        raise E("user_token", user_token, Msg.USER_TOKEN_INVALID)
+    if token_verified:
+        token_payload = token_verified
+
+    else:
+        try:
+            token_payload = JWTHelper.decode_token(user_token)
+
+        except ExpiredSignatureError:
+            raise E("user_token", user_token, Msg.USER_TOKEN_EXPIRED)
+
+        except PyJWTError:
+            raise E("user_token", user_token, Msg.USER_TOKEN_INVALID)
+
+        if (revocation_synced and
+                await revocation_manager.is_revoked(token_payload)):
+            raise E("user_token", user_token, Msg.USER_TOKEN_DECLINED)
 
     user_repository = Repository(session, cache, User)
     user = await user_repository.select(id=token_payload["user_id"])
@@ -83,7 +109,16 @@ async def _auth(user_token: str, session: AsyncSession, cache: Redis):
     if not user:
         raise E("user_token", user_token, Msg.USER_TOKEN_ORPHANED)
 
-    elif token_payload["jti"] != user.jti:
+    elif token_verified and token_verified["jti_version"] != user.jti_version:
         raise E("user_token", user_token, Msg.USER_TOKEN_DECLINED)
 
+    elif (not token_verified and not revocation_synced and
+            not user.check_jti(token_payload["jti"])):
+        raise E("user_token", user_token, Msg.USER_TOKEN_DECLINED)
+
+    elif not token_verified:
+        await token_manager.set(
+            user_token, user.id, token_payload["user_role"], user.jti_version,
+            token_payload["exp"])
+
     return user
@@ -1,16 +1,117 @@
 """Redis cache creator."""
 
 import redis.asyncio as redis
+from typing import Any, List, Optional, Protocol, Union
+from app.memory_cache import MemoryCache
 from app.config import get_config
+from app.log import get_log
 
 cfg = get_config()
+log = get_log()
+
+REDIS_BACKEND, MEMORY_BACKEND = "redis", "memory"
+
+
+class CacheBackend(Protocol):
+    """
+    Async cache commands the app relies on. Implemented by the Redis
+    client and by the in-process MemoryCache.
+    """
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def getex(self, key: str, ex: int = None) -> Optional[bytes]: ...
+
+    async def mget(self, keys: Union[str, List[str]], *args) -> list: ...
+
+    async def set(self, key: str, value: Any, ex: int = None,
+                  px: int = None, nx: bool = False) -> Optional[bool]: ...
+
+    async def incr(self, key: str) -> int: ...
+
+    async def expire(self, key: str, seconds: int) -> bool: ...
+
+    async def pttl(self, key: str) -> int: ...
+
+    async def delete(self, *keys: str) -> int: ...
+
+    async def unlink(self, *keys: str) -> int: ...
+
+    def scan_iter(self, match: str = None, count: int = None): ...
+
+    async def publish(self, channel: str, message: Any) -> int: ...
+
+    def pipeline(self, transaction: bool = True) -> Any: ...
+
+    def register_script(self, script: str) -> Any: ...
+
+    async def close(self): ...
+
+
+class CachePool:
+    """
+    Redis client and its connection pool (or the in-process cache if
+    CACHE_BACKEND is memory), created once per worker in the lifespan
+    handler and shared by all requests.
+    """
+
+    def __init__(self):
+        self.connection_pool = None
+        self.client = None
+
+    @property
+    def is_shared(self) -> bool:
+        """Whether the cache is shared by workers (Redis)."""
+        return cfg.CACHE_BACKEND != MEMORY_BACKEND
+
+    def open(self):
+        """
+        Create the connection pool and the client bound to it. The
+        in-process cache is refused with several workers: each of them
+        would see only its own changes.
+        """
+        if not self.is_shared and cfg.UVICORN_WORKERS > 1:
+            log.error("Memory cache with several workers; module=cache; "
+                      "function=open; workers=%s;" % cfg.UVICORN_WORKERS)
+            raise ValueError("CACHE_BACKEND=memory requires UVICORN_WORKERS=1")
+
+        elif not self.is_shared:
+            self.client = MemoryCache(cfg.CACHE_MEMORY_SIZE)
+            return
+
+        self.connection_pool = redis.BlockingConnectionPool(
+            host=cfg.REDIS_HOST, port=cfg.REDIS_PORT,
+            decode_responses=cfg.REDIS_DECODE,
+            max_connections=cfg.REDIS_MAX_CONNECTIONS,
+            timeout=cfg.REDIS_POOL_TIMEOUT,
+            health_check_interval=cfg.REDIS_HEALTH_CHECK_INTERVAL,
+            socket_timeout=cfg.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=cfg.REDIS_CONNECT_TIMEOUT)
+        self.client = redis.Redis(connection_pool=self.connection_pool)
+
+    async def close(self):
+        """Close the client and disconnect all pooled connections."""
+        await self.client.close()
+        if self.connection_pool:
+            await self.connection_pool.disconnect()
+
+    def stats(self) -> dict:
+        """Return connection pool utilisation."""
+        if not self.connection_pool:
+            return self.client.stats()
+
+        return {
+            "max_connections": self.connection_pool.max_connections,
+            "in_use_connections": len(
+                self.connection_pool._in_use_connections),
+            "idle_connections": len(
+                self.connection_pool._available_connections),
+        }
+
+
+cachepool = CachePool()
 
 
 async def get_cache():
-    """Return SQLAlchemy session object."""
-    try:
-        conn = redis.Redis(host=cfg.REDIS_HOST, port=cfg.REDIS_PORT,
-                           decode_responses=cfg.REDIS_DECODE)
-        yield conn
-    finally:
-        await conn.close()
+    """Return cache client shared by the worker."""
+    yield cachepool.client
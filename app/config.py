@@ -26,6 +26,27 @@ class Config:
     REDIS_PORT: int
     REDIS_DECODE: bool
     REDIS_EXPIRE: int
+    REDIS_MAX_CONNECTIONS: int
+    REDIS_POOL_TIMEOUT: int
+    REDIS_HEALTH_CHECK_INTERVAL: int
+    REDIS_SOCKET_TIMEOUT: int
+    REDIS_CONNECT_TIMEOUT: int
+    REDIS_COMPRESS_THRESHOLD: int
+    REDIS_COMPRESS_LEVEL: int
+    COUNT_ESTIMATE_THRESHOLD: int
+    BULK_BATCH_SIZE: int
+
+    CACHE_BACKEND: str
+    CACHE_MEMORY_SIZE: int
+
+    LOCAL_CACHE_ENABLED: bool
+    LOCAL_CACHE_SIZE: int
+    LOCAL_CACHE_EXPIRE: int
+
+    WARMUP_ENABLED: bool
+    WARMUP_SETS: list
+    WARMUP_LIMIT: int
+    WARMUP_BUDGET: int
 
     LOG_LEVEL: str
     LOG_NAME: str
@@ -48,12 +69,19 @@ class Config:
     APP_PREFIX: str
 
     HASH_SALT: str
+    SCRYPT_N: int
+    SCRYPT_R: int
+    SCRYPT_P: int
+    PASSWORD_HASH_WORKERS: int
     FERNET_KEY: str
 
     JWT_SECRET: str
     JWT_EXPIRES: int
     JWT_ALGORITHM: str
     JTI_LENGTH: int
+    JTI_HASH_ENABLED: bool
+    REVOCATION_ENABLED: bool
+    REVOCATION_CAPACITY: int
 
     PLUGINS_PATH: str
     PLUGINS_MASK: str
@@ -1,12 +1,16 @@
 """Async session manager."""
 
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.asyncio import (create_async_engine, async_scoped_session,
                                     async_sessionmaker)
 from asyncio import current_task
 from app.config import get_config
+from app.log import get_log
 
 cfg = get_config()
+log = get_log()
 Base = declarative_base()
 
 
@@ -58,6 +62,39 @@ class SessionManager:
 sessionmanager = SessionManager()
 
 
+def upgrade_schema(conn):
+    """
+    Add the columns and indexes missing in existing tables: create_all
+    only creates missing tables, so the columns and indexes added to
+    the models later are added here. New columns must be nullable.
+    """
+    inspector = inspect(conn)
+    quote = conn.dialect.identifier_preparer.quote
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        columns = {x["name"] for x in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+
+            elif not column.nullable:
+                log.error("Column not added; module=database; "
+                          "function=upgrade_schema; column=%s.%s;" % (
+                              table.name, column.name))
+                continue
+
+            sql = "ALTER TABLE %s ADD COLUMN IF NOT EXISTS %s %s" % (
+                quote(table.name), quote(column.name),
+                column.type.compile(dialect=conn.dialect))
+            conn.execute(text(sql))
+
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
 async def get_session():
     """SQLAlchemy session creator."""
     try:
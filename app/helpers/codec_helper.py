@@ -0,0 +1,83 @@
+"""Cache codecs for SQLAlchemy entities."""
+
+import orjson
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+from sqlalchemy import Enum, inspect
+from sqlalchemy.ext.serializer import dumps, loads
+from sqlalchemy.orm import DeclarativeBase, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+CODEC_VERSION = 1
+
+
+@lru_cache(maxsize=None)
+def _get_columns(cls: Type[DeclarativeBase]) -> List[Tuple[str, type]]:
+    """Return mapped column keys and their enum classes (if any)."""
+    columns = []
+    for column_attr in inspect(cls).column_attrs:
+        column_type = column_attr.columns[0].type
+        enum_class = (column_type.enum_class
+                      if isinstance(column_type, Enum) else None)
+        columns.append((column_attr.key, enum_class))
+    return columns
+
+
+@lru_cache(maxsize=None)
+def _get_fingerprint(cls: Type[DeclarativeBase]) -> int:
+    """Return a checksum of the mapped columns to tag cached payloads."""
+    schema = ",".join("%s:%s" % (x.key, x.columns[0].type)
+                      for x in inspect(cls).column_attrs)
+    return zlib.crc32(("%s|%s" % (cls.__tablename__, schema)).encode())
+
+
+class SerializerCodec:
+    """
+    Legacy codec that pickles the whole entity (instance state, mapper
+    references and loaded relationships) with SQLAlchemy serializer.
+    """
+
+    @staticmethod
+    def encode(entity: DeclarativeBase) -> bytes:
+        """Serialize an entity into bytes."""
+        return dumps(entity)
+
+    @staticmethod
+    def decode(cls: Type[DeclarativeBase],
+               data: bytes) -> Optional[DeclarativeBase]:
+        """Deserialize an entity from bytes."""
+        return loads(data)
+
+
+class ColumnCodec:
+    """
+    Compact codec that stores only mapped column values as an orjson
+    array prefixed with the codec version and the schema fingerprint.
+    Entities are rebuilt as detached instances without calling __init__,
+    payloads written for another schema are treated as a cache miss.
+    """
+
+    @staticmethod
+    def encode(entity: DeclarativeBase) -> bytes:
+        """Serialize entity column values into bytes."""
+        cls = type(entity)
+        values = [getattr(entity, key) for key, _ in _get_columns(cls)]
+        return orjson.dumps([CODEC_VERSION, _get_fingerprint(cls), *values])
+
+    @staticmethod
+    def decode(cls: Type[DeclarativeBase],
+               data: bytes) -> Optional[DeclarativeBase]:
+        """Rebuild a detached entity from serialized column values."""
+        payload = orjson.loads(data)
+        if payload[:2] != [CODEC_VERSION, _get_fingerprint(cls)]:
+            return None
+
+        entity = cls.__mapper__.class_manager.new_instance()
+        for (key, enum_class), value in zip(_get_columns(cls), payload[2:]):
+            if enum_class and value is not None:
+                value = enum_class(value)
+            set_committed_value(entity, key, value)
+
+        make_transient_to_detached(entity)
+        return entity
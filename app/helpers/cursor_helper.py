@@ -0,0 +1,38 @@
+"""Opaque cursors of keyset pagination."""
+
+import base64
+import binascii
+import orjson
+from typing import Any, Tuple
+
+MAX_ID = 2 ** 63  # ids are positive bigints
+
+
+class CursorHelper:
+    """
+    The cursor holds the sort column and direction along with the
+    (value, id) of the last entity of the page, encoded as url-safe
+    base64 of JSON. The next page starts right after that entity.
+    """
+
+    @staticmethod
+    def encode(order_by: str, order: str, value: Any, obj_id: int) -> str:
+        """Encode the position after the entity into a cursor."""
+        return base64.urlsafe_b64encode(orjson.dumps(
+            [order_by, order, value, obj_id])).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> Tuple[str, str, Any, int]:
+        """Decode the cursor, raise ValueError if it is malformed."""
+        try:
+            payload = orjson.loads(base64.urlsafe_b64decode(
+                cursor + "=" * (-len(cursor) % 4)))
+        except (binascii.Error, orjson.JSONDecodeError):
+            raise ValueError("cursor is malformed")
+
+        if not (isinstance(payload, list) and len(payload) == 4 and
+                not isinstance(payload[2], (list, dict)) and
+                type(payload[3]) is int and 0 < payload[3] < MAX_ID):
+            raise ValueError("cursor is malformed")
+
+        return tuple(payload)
@@ -1,4 +1,5 @@
 import hashlib
+import hmac
 from app.config import get_config
 
 cfg = get_config()
@@ -13,3 +14,14 @@ class HashHelper:
         encoded_value = (value + cfg.HASH_SALT).encode()
         hash = hashlib.sha512(encoded_value)
         return hash.hexdigest()
+
+    @staticmethod
+    def keyed_hash(value: str) -> str:
+        """Return HMAC of the value keyed with the salt."""
+        return hmac.new(cfg.HASH_SALT.encode(), value.encode(),
+                        hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def compare(value: str, other: str) -> bool:
+        """Compare hashes in constant time."""
+        return hmac.compare_digest(value, other)
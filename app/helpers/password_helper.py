@@ -0,0 +1,120 @@
+"""Password hashing with scrypt off the event loop."""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable
+from app.helpers.hash_helper import HashHelper
+from app.config import get_config
+
+cfg = get_config()
+
+SCRYPT = "scrypt"
+SCRYPT_SALT_SIZE = 16
+SCRYPT_HASH_SIZE = 32
+
+
+def _b64encode(value: bytes) -> str:
+    """Encode bytes to base64 without padding."""
+    return base64.b64encode(value).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    """Decode base64 without padding to bytes."""
+    return base64.b64decode(value + "=" * (-len(value) % 4))
+
+
+class PasswordHelper:
+    """
+    Password hashes are stored as scrypt$n$r$p$salt$hash, so the KDF
+    parameters can be tuned without breaking existing hashes. Hashes
+    without the prefix are legacy salted sha512 ones.
+    """
+
+    @staticmethod
+    def hash(user_password: str) -> str:
+        """Return scrypt hash of the password with current parameters."""
+        n, r, p = cfg.SCRYPT_N, cfg.SCRYPT_R, cfg.SCRYPT_P
+        salt = os.urandom(SCRYPT_SALT_SIZE)
+        password_hash = hashlib.scrypt(
+            user_password.encode(), salt=salt, n=n, r=r, p=p,
+            maxmem=256 * n * r, dklen=SCRYPT_HASH_SIZE)
+        return "%s$%s$%s$%s$%s$%s" % (SCRYPT, n, r, p, _b64encode(salt),
+                                      _b64encode(password_hash))
+
+    @staticmethod
+    def verify(user_password: str, password_hash: str) -> bool:
+        """Check the password against scrypt or legacy sha512 hash."""
+        if not password_hash.startswith(SCRYPT + "$"):
+            return hmac.compare_digest(HashHelper.hash(user_password),
+                                       password_hash)
+
+        _, n, r, p, salt, expected_hash = password_hash.split("$")
+        n, r, p = int(n), int(r), int(p)
+        actual_hash = hashlib.scrypt(
+            user_password.encode(), salt=_b64decode(salt), n=n, r=r, p=p,
+            maxmem=256 * n * r, dklen=SCRYPT_HASH_SIZE)
+        return hmac.compare_digest(actual_hash, _b64decode(expected_hash))
+
+    @staticmethod
+    def needs_upgrade(password_hash: str) -> bool:
+        """Check if the hash is legacy or made with other parameters."""
+        prefix = "%s$%s$%s$%s$" % (SCRYPT, cfg.SCRYPT_N, cfg.SCRYPT_R,
+                                   cfg.SCRYPT_P)
+        return not password_hash.startswith(prefix)
+
+
+class PasswordExecutor:
+    """
+    Runs password hashing in a bounded thread pool (scrypt releases
+    the GIL), so an expensive KDF does not block the event loop. Calls
+    beyond the pool size wait in the queue, its depth is reported.
+    """
+
+    def __init__(self, max_workers: int):
+        """Initialize the PasswordExecutor with the pool size."""
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="password")
+        self.pending = 0
+        self.completed = 0
+        self.total_time = 0
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run the hashing function in the pool."""
+        self.pending += 1
+        started = perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.total_time += perf_counter() - started
+
+    async def hash(self, user_password: str) -> str:
+        """Hash the password in the pool."""
+        return await self.run(PasswordHelper.hash, user_password)
+
+    async def verify(self, user_password: str, password_hash: str) -> bool:
+        """Verify the password in the pool."""
+        return await self.run(PasswordHelper.verify, user_password,
+                              password_hash)
+
+    def stats(self) -> dict:
+        """Return pool size, queue depth and average time."""
+        return {
+            "max_workers": self.max_workers,
+            "running": min(self.pending, self.max_workers),
+            "waiting": max(self.pending - self.max_workers, 0),
+            "completed": self.completed,
+            "average_ms": round(self.total_time / self.completed * 1000, 3)
+            if self.completed else None,
+        }
+
+
+password_executor = PasswordExecutor(cfg.PASSWORD_HASH_WORKERS)
@@ -2,7 +2,7 @@ from app.managers.entity_manager import EntityManager
 from app.managers.cache_manager import CacheManager
 import enum
 from app.context import get_context
-from redis import Redis
+from app.cache import CacheBackend
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user_models import User
 from typing import Any
@@ -20,7 +20,7 @@ class H(enum.Enum):
 
 class Hook:
 
-    def __init__(self, session: AsyncSession, cache: Redis,
+    def __init__(self, session: AsyncSession, cache: CacheBackend,
                  current_user: User = None):
         self.entity_manager = EntityManager(session)
         self.cache_manager = CacheManager(cache)
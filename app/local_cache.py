@@ -0,0 +1,146 @@
+"""In-process (per uvicorn worker) L1 cache in front of Redis."""
+
+import asyncio
+import redis.asyncio as redis
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional
+from app.config import get_config
+from app.log import get_log
+
+cfg = get_config()
+log = get_log()
+
+INVALIDATE_CHANNEL = "local_cache:invalidate"
+RECONNECT_DELAY = 1  # seconds
+
+
+class LocalCache:
+    """
+    Bounded LRU cache with TTL. Stores encoded entities (not ORM
+    instances) so the callers never share mutable objects. Every
+    invalidation bumps the version, so a value read from Redis before
+    an invalidation of its key is not set afterwards.
+    """
+
+    def __init__(self, maxsize: int, expire: int):
+        """Initialize the LocalCache with size and TTL limits."""
+        self.maxsize = maxsize
+        self.expire = expire
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.version = 0
+        self.invalidated = OrderedDict()  # key: version of the invalidation
+        self.invalidated_all = 0  # version of the namespace invalidation
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a value and mark it as recently used."""
+        item = self.items.get(key)
+        if item and item[0] > monotonic():
+            self.items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+        elif item:
+            del self.items[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: bytes, version: int = None):
+        """
+        Set a value and evict the least recently used if necessary. The
+        value read at the version is skipped if its key was invalidated
+        since then.
+        """
+        if version is not None and (
+                self.invalidated_all > version or
+                self.invalidated.get(key, 0) > version):
+            return
+
+        self.items[key] = (monotonic() + self.expire, value)
+        self.items.move_to_end(key)
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+    def delete(self, key: str):
+        """Delete a value by the key."""
+        self.items.pop(key, None)
+
+        self.version += 1
+        self.invalidated[key] = self.version
+        self.invalidated.move_to_end(key)
+        while len(self.invalidated) > self.maxsize:
+            _, self.invalidated_all = self.invalidated.popitem(last=False)
+
+    def delete_all(self, prefix: str):
+        """Delete all values which keys start with the prefix."""
+        for key in [x for x in self.items if x.startswith(prefix)]:
+            del self.items[key]
+
+        self.version += 1
+        self.invalidated_all = self.version
+
+    def clear(self):
+        """Delete all values."""
+        self.delete_all("")
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        return {
+            "size": len(self.items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+local_cache = LocalCache(cfg.LOCAL_CACHE_SIZE, cfg.LOCAL_CACHE_EXPIRE)
+
+
+async def listen_invalidations():
+    """
+    Keep the local cache in sync with the other workers. The listener is
+    restarted after a connection error and clears the local cache, so
+    the invalidations missed in between are not lost.
+    """
+    while True:
+        try:
+            await _listen_invalidations()
+
+        except Exception as e:
+            log.error("Invalidations listener failed; module=local_cache; "
+                      "function=listen_invalidations; e=%s;" % str(e))
+
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+async def _listen_invalidations():
+    """
+    Subscribe to the invalidation channel and drop keys that were updated
+    or deleted by any worker. Keys ending with asterisk drop a namespace.
+    """
+    conn = redis.Redis(host=cfg.REDIS_HOST, port=cfg.REDIS_PORT,
+                       decode_responses=True,
+                       health_check_interval=cfg.REDIS_HEALTH_CHECK_INTERVAL,
+                       socket_connect_timeout=cfg.REDIS_CONNECT_TIMEOUT)
+    pubsub = conn.pubsub()
+    await pubsub.subscribe(INVALIDATE_CHANNEL)
+
+    try:
+        local_cache.clear()
+
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+
+            key = message["data"]
+            if key.endswith("*"):
+                local_cache.delete_all(key[:-1])
+            else:
+                local_cache.delete(key)
+
+    finally:
+        await pubsub.aclose()
+        await conn.aclose()
@@ -0,0 +1,68 @@
+"""Failed login attempt counters kept in Redis."""
+
+from app.cache import CacheBackend
+from app.decorators.timed_deco import timed
+from app.memory_cache import memory_script
+
+PASSWORD_ATTEMPTS, MFA_ATTEMPTS = "password", "mfa"
+
+# Increments the counter and starts its window on the first attempt;
+# when the limit is reached the counter is dropped and 0 is returned.
+INCREMENT_SCRIPT = """
+local attempts = redis.call("INCR", KEYS[1])
+if attempts == 1 then
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+if attempts >= tonumber(ARGV[1]) then
+    redis.call("DEL", KEYS[1])
+    return 0
+end
+return attempts
+"""
+
+
+@memory_script(INCREMENT_SCRIPT)
+async def increment_attempts(cache: CacheBackend, keys: list,
+                             args: list) -> int:
+    """The increment script for the in-process cache backend."""
+    attempts = await cache.incr(keys[0])
+    if attempts == 1:
+        await cache.expire(keys[0], args[1])
+    if attempts >= int(args[0]):
+        await cache.delete(keys[0])
+        return 0
+    return attempts
+
+
+class AttemptManager:
+    """
+    Counts failed password and TOTP attempts of users in Redis with
+    an atomic Lua script, so repeated failures do not write the user
+    row. The row is updated by the caller only when the limit is
+    reached (or another state of the user changes).
+    """
+
+    def __init__(self, cache: CacheBackend):
+        """Initialize the AttemptManager with a Redis cache instance."""
+        self.cache = cache
+        self.increment_script = cache.register_script(INCREMENT_SCRIPT)
+
+    def _get_key(self, attempt_type: str, user_id: int) -> str:
+        """Create a key of the attempts counter."""
+        return "attempts:%s:%s" % (attempt_type, user_id)
+
+    @timed
+    async def increment(self, attempt_type: str, user_id: int, limit: int,
+                        expire: int) -> bool:
+        """
+        Count a failed attempt within the window (seconds). Returns True
+        when the limit is reached, the counter starts over then.
+        """
+        attempts = await self.increment_script(
+            keys=[self._get_key(attempt_type, user_id)], args=[limit, expire])
+        return int(attempts) == 0
+
+    @timed
+    async def reset(self, attempt_type: str, user_id: int):
+        """Reset the counter after a successful attempt."""
+        await self.cache.delete(self._get_key(attempt_type, user_id))
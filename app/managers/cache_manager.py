@@ -1,15 +1,72 @@
 
-from typing import Type, Optional, Union
-from sqlalchemy.ext.serializer import dumps, loads
+import hashlib
+import math
+import orjson
+import zlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from random import random
+from secrets import token_hex
+from time import perf_counter
+from typing import Any, Dict, List, Type, Optional, Tuple, Union
+from sqlalchemy import inspect
 from sqlalchemy.orm import DeclarativeBase
-from redis import Redis
+from app.cache import CacheBackend
 from app.decorators.timed_deco import timed
+from app.helpers.codec_helper import ColumnCodec
+from app.local_cache import LocalCache, INVALIDATE_CHANNEL
+from app.memory_cache import memory_script
 from app.config import get_config
 from app.log import get_log
 
 cfg = get_config()
 log = get_log()
 
+DELETE_ALL_BATCH_SIZE = 500
+LOCK_EXPIRE = 3000  # milliseconds
+EARLY_REFRESH_DELTA = 0.1  # expected reload time, seconds
+EARLY_REFRESH_BETA = 1.0
+TOMBSTONE = b"\x00"
+TOMBSTONE_EXPIRE = 60  # seconds
+FLAG_EXPIRE = 3600  # seconds
+
+# Deletes the lock only if it still holds the token of the caller, so a
+# lock that expired and was taken by another worker is kept.
+UNLOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+COMPRESSED = b"\x01"  # header byte of zlib-compressed values
+
+cache_stats = Counter()
+compression_stats = defaultdict(Counter)
+
+
+@memory_script(UNLOCK_SCRIPT)
+async def unlock_key(cache: CacheBackend, keys: list, args: list) -> int:
+    """The unlock script for the in-process cache backend."""
+    if await cache.get(keys[0]) == str(args[0]).encode():
+        return await cache.delete(keys[0])
+    return 0
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    TTL policy of the cached entity class (declared as _cache_policy
+    next to _cacheable). Expire defaults to REDIS_EXPIRE, jitter spreads
+    the TTL by the percentage, sliding entries get a full TTL on read.
+    """
+    expire: Optional[int] = None
+    jitter: int = 0
+    sliding: bool = False
+
+
+DEFAULT_POLICY = CachePolicy()
+
 
 class CacheManager:
     """
@@ -17,12 +74,19 @@ class CacheManager:
 
     Provides methods to set, get, delete, and delete all cache entries
     for SQLAlchemy entities. Uses Redis for storage and supports
-    asynchronous operations.
+    asynchronous operations. Entities are encoded with a pluggable codec
+    (compact column-level codec by default). An optional in-process
+    local cache is consulted before Redis. Unique columns declared in
+    the _cache_keys of the entity class are indexed with keys pointing
+    at the entity id.
     """
 
-    def __init__(self, cache: Redis):
+    def __init__(self, cache: CacheBackend, codec=ColumnCodec,
+                 local_cache: LocalCache = None):
         """Initialize the CacheManager with a Redis cache instance."""
         self.cache = cache
+        self.codec = codec
+        self.local_cache = local_cache
 
     def _get_key(self, entity: Type[DeclarativeBase],
                  entity_id: Union[int, str]) -> str:
@@ -32,29 +96,445 @@ class CacheManager:
         """
         return "%s:%s" % (entity.__tablename__, entity_id)
 
+    def _get_index_key(self, cls: Type[DeclarativeBase], column_name: str,
+                       value: Any) -> str:
+        """Create a key of the secondary index by the unique column."""
+        return "index:%s:%s:%s" % (cls.__tablename__, column_name, value)
+
+    def _get_index_keys(self, entity: DeclarativeBase) -> List[str]:
+        """Create secondary index keys by current column values."""
+        return [self._get_index_key(entity, x, getattr(entity, x))
+                for x in getattr(entity, "_cache_keys", ())
+                if getattr(entity, x) is not None]
+
+    def _get_renamed_index_keys(self, entity: DeclarativeBase) -> List[str]:
+        """
+        Create secondary index keys by previous values of the changed
+        columns (must be called before the changes are flushed).
+        """
+        entity_state = inspect(entity)
+        return [self._get_index_key(entity, x, value)
+                for x in getattr(entity, "_cache_keys", ())
+                for value in entity_state.attrs[x].history.deleted
+                if value is not None]
+
+    def _encode(self, entity: DeclarativeBase) -> bytes:
+        """
+        Encode an entity with the codec and compress the value if it is
+        larger than the threshold (the header byte marks it).
+        """
+        entity_bytes = self.codec.encode(entity)
+        if not 0 < cfg.REDIS_COMPRESS_THRESHOLD <= len(entity_bytes):
+            return entity_bytes
+
+        started = perf_counter()
+        compressed_bytes = COMPRESSED + zlib.compress(
+            entity_bytes, cfg.REDIS_COMPRESS_LEVEL)
+
+        stats = compression_stats[entity.__tablename__]
+        stats["compressed"] += 1
+        stats["raw_bytes"] += len(entity_bytes)
+        stats["compressed_bytes"] += len(compressed_bytes)
+        stats["compress_time"] += perf_counter() - started
+        return compressed_bytes
+
+    def _decode(self, cls: Type[DeclarativeBase],
+                entity_bytes: bytes) -> Optional[DeclarativeBase]:
+        """Decompress the value if necessary and decode an entity."""
+        if entity_bytes[:1] == COMPRESSED:
+            started = perf_counter()
+            entity_bytes = zlib.decompress(entity_bytes[1:])
+
+            stats = compression_stats[cls.__tablename__]
+            stats["decompressed"] += 1
+            stats["decompress_time"] += perf_counter() - started
+
+        return self.codec.decode(cls, entity_bytes)
+
+    def _get_policy(self, cls: Type[DeclarativeBase]) -> CachePolicy:
+        """Return the TTL policy of the entity class."""
+        policy = getattr(cls, "_cache_policy", None)
+        return policy if isinstance(policy, CachePolicy) else DEFAULT_POLICY
+
+    def _get_expire(self, cls: Type[DeclarativeBase]) -> int:
+        """
+        Return the TTL (seconds) of the entity by its class policy, with
+        random jitter so that keys written together expire apart.
+        """
+        policy = self._get_policy(cls)
+        expire = policy.expire or cfg.REDIS_EXPIRE
+        if policy.jitter:
+            expire += int(expire * policy.jitter / 100 * (2 * random() - 1))
+        return max(expire, 1)
+
+    def _get_generation_key(self, cls: Type[DeclarativeBase]) -> str:
+        """Create a key of the table generation counter."""
+        return "generation:%s" % cls.__tablename__
+
+    def _get_kwargs_hash(self, kwargs: dict) -> str:
+        """Create a hash of the normalized kwargs."""
+        return hashlib.md5(orjson.dumps(
+            kwargs, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def _get_query_key(self, cls: Type[DeclarativeBase], query_name: str,
+                       query_kwargs: dict) -> str:
+        """Create a query result key based on the normalized kwargs."""
+        return "query:%s:%s:%s" % (cls.__tablename__, query_name,
+                                   self._get_kwargs_hash(query_kwargs))
+
+    def _get_flag_key(self, cls: Type[DeclarativeBase],
+                      flag_kwargs: dict) -> str:
+        """Create a key of the exists flag based on the criteria."""
+        return "flag:%s:%s" % (cls.__tablename__,
+                               self._get_kwargs_hash(flag_kwargs))
+
     @timed
     async def set(self, entity: DeclarativeBase):
-        """Set an entity in the cache."""
+        """Set an entity and its secondary index keys in the cache."""
         key = self._get_key(entity, entity.id)
-        await self.cache.set(key, dumps(entity), ex=cfg.REDIS_EXPIRE)
+        entity_bytes = self._encode(entity)
+        expire = self._get_expire(entity)
+
+        pipe = self.cache.pipeline(transaction=False)
+        pipe.set(key, entity_bytes, ex=expire)
+        for index_key in self._get_index_keys(entity):
+            pipe.set(index_key, entity.id, ex=expire)
+        await pipe.execute()
+
+        if self.local_cache:
+            self.local_cache.set(key, entity_bytes)
 
     @timed
-    async def get(self, cls: Type[DeclarativeBase],
-                  entity_id: int) -> Optional[DeclarativeBase]:
-        """Retrieve an entity from the cache."""
+    async def set_many(self, entities: List[DeclarativeBase]):
+        """
+        Set many entities in the cache with one pipelined round trip.
+        The local cache is not filled, so list pages do not evict hot
+        entities from it.
+        """
+        if not entities:
+            return
+
+        pipe = self.cache.pipeline(transaction=False)
+        for entity in entities:
+            key = self._get_key(entity, entity.id)
+            expire = self._get_expire(entity)
+            pipe.set(key, self._encode(entity), ex=expire)
+            for index_key in self._get_index_keys(entity):
+                pipe.set(index_key, entity.id, ex=expire)
+        await pipe.execute()
+
+    @timed
+    async def get(self, cls: Type[DeclarativeBase], entity_id: int,
+                  early_refresh: bool = False) -> Optional[DeclarativeBase]:
+        """
+        Retrieve an entity from the cache (False if the entity is known
+        to be missing from the database). Entities with sliding policy
+        are read with GETEX, which resets their TTL, so hot ones stay
+        resident. Otherwise with early refresh the key TTL is fetched in
+        the same round trip and the entry is reported as missing with
+        a probability that grows as it approaches expiry (XFetch), so
+        hot keys are reloaded before they actually expire.
+        """
         key = self._get_key(cls, entity_id)
-        entity_bytes = await self.cache.get(key)
-        return loads(entity_bytes) if entity_bytes else None
+        entity_bytes = self.local_cache.get(key) if self.local_cache else None
+        version = self.local_cache.version if self.local_cache else None
+        sliding = self._get_policy(cls).sliding
+
+        if entity_bytes:
+            return self._decode(cls, entity_bytes)
+
+        elif sliding:
+            entity_bytes = await self.cache.getex(
+                key, ex=self._get_expire(cls))
+
+        elif early_refresh:
+            pipe = self.cache.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            entity_bytes, ttl = await pipe.execute()
+
+            if entity_bytes and self._expires_early(ttl):
+                return None
+
+        else:
+            entity_bytes = await self.cache.get(key)
+
+        if self._is_tombstone(entity_bytes):
+            cache_stats["tombstone_hits"] += 1
+            if sliding:
+                await self.cache.expire(key, TOMBSTONE_EXPIRE)
+            return False
+
+        elif entity_bytes and self.local_cache:
+            self.local_cache.set(key, entity_bytes, version)
+
+        return self._decode(cls, entity_bytes) if entity_bytes else None
+
+    def _is_tombstone(self, entity_bytes: Union[bytes, str, None]) -> bool:
+        """Check if the cached value marks a missing entity."""
+        return entity_bytes in (TOMBSTONE, TOMBSTONE.decode())
+
+    @timed
+    async def set_missing(self, cls: Type[DeclarativeBase],
+                          entity_ids: List[int]):
+        """
+        Set short-lived tombstones for entity ids that are not found in
+        the database, so repeated lookups do not reach it. Tombstones are
+        overwritten when the entity is cached.
+        """
+        pipe = self.cache.pipeline(transaction=False)
+        for entity_id in entity_ids:
+            pipe.set(self._get_key(cls, entity_id), TOMBSTONE,
+                     ex=TOMBSTONE_EXPIRE)
+        await pipe.execute()
+        cache_stats["tombstone_sets"] += len(entity_ids)
+
+    def _expires_early(self, ttl: int) -> bool:
+        """Decide if the key with the TTL (ms) should be reloaded now."""
+        threshold = -EARLY_REFRESH_DELTA * EARLY_REFRESH_BETA * math.log(
+            random())
+        return 0 <= ttl <= threshold * 1000
+
+    @timed
+    async def lock(self, cls: Type[DeclarativeBase],
+                   entity_id: int) -> Optional[str]:
+        """
+        Acquire a short lock on the entity key across all workers.
+        Returns the random token of the lock (None if it is taken).
+        """
+        key = "lock:%s" % self._get_key(cls, entity_id)
+        token = token_hex(16)
+        if await self.cache.set(key, token, nx=True, px=LOCK_EXPIRE):
+            return token
+        return None
+
+    @timed
+    async def unlock(self, cls: Type[DeclarativeBase], entity_id: int,
+                     token: str):
+        """Release the lock on the entity key if it still holds the token."""
+        key = "lock:%s" % self._get_key(cls, entity_id)
+        unlock_script = self.cache.register_script(UNLOCK_SCRIPT)
+        await unlock_script(keys=[key], args=[token])
+
+    @timed
+    async def get_many(self, cls: Type[DeclarativeBase],
+                       entity_ids: List[int]) -> Dict[int, DeclarativeBase]:
+        """
+        Retrieve many entities from the cache: the local cache first,
+        then all remaining keys with one MGET. Returns found entities
+        by their ids (False for ids known to be missing).
+        """
+        keys = [self._get_key(cls, x) for x in entity_ids]
+        values = [self.local_cache.get(x) if self.local_cache else None
+                  for x in keys]
+
+        missed_keys = [key for key, value in zip(keys, values) if not value]
+        if missed_keys:
+            missed_values = iter(await self.cache.mget(missed_keys))
+            values = [value or next(missed_values) for value in values]
+
+        entities = {}
+        for entity_id, entity_bytes in zip(entity_ids, values):
+            if self._is_tombstone(entity_bytes):
+                cache_stats["tombstone_hits"] += 1
+                entities[entity_id] = False
+                continue
+
+            elif not entity_bytes:
+                continue
+
+            entity = self._decode(cls, entity_bytes)
+            if entity:
+                entities[entity_id] = entity
+
+        return entities
+
+    @timed
+    async def get_index(self, cls: Type[DeclarativeBase], column_name: str,
+                        value: Any) -> Optional[int]:
+        """Retrieve an entity id by the unique column value."""
+        entity_id = await self.cache.get(
+            self._get_index_key(cls, column_name, value))
+        return int(entity_id) if entity_id else None
+
+    @timed
+    async def delete_index(self, index_keys: List[str]):
+        """Delete stale secondary index keys."""
+        if index_keys:
+            await self.cache.delete(*index_keys)
 
     @timed
     async def delete(self, entity: DeclarativeBase):
-        """Delete an entity from the cache."""
+        """Delete an entity and its secondary index keys from the cache."""
         key = self._get_key(entity, entity.id)
-        await self.cache.delete(key)
+        await self.cache.delete(key, *self._get_index_keys(entity))
+
+        if self.local_cache:
+            self.local_cache.delete(key)
+
+    @timed
+    async def delete_many(self, entities: List[DeclarativeBase]):
+        """Delete many entities and their index keys with one command."""
+        keys = [self._get_key(x, x.id) for x in entities]
+        index_keys = [y for x in entities for y in self._get_index_keys(x)]
+        if keys:
+            await self.cache.delete(*keys, *index_keys)
+
+        if self.local_cache:
+            for key in keys:
+                self.local_cache.delete(key)
 
     @timed
-    async def delete_all(self, cls: Type[DeclarativeBase]):
-        """Delete all entities of a given class from the cache."""
+    async def delete_ids(self, cls: Type[DeclarativeBase], ids: List[int],
+                         batch_size: int = DELETE_ALL_BATCH_SIZE):
+        """
+        Delete entities by ids with one UNLINK per batch and notify all
+        workers. Their index keys are left to expire, an index key of a
+        deleted entity is dropped when it is read.
+        """
+        keys = [self._get_key(cls, x) for x in ids]
+        for i in range(0, len(keys), batch_size):
+            await self.cache.unlink(*keys[i:i + batch_size])
+
+        if self.local_cache and keys:
+            pipe = self.cache.pipeline(transaction=False)
+            for key in keys:
+                self.local_cache.delete(key)
+                pipe.publish(INVALIDATE_CHANNEL, key)
+            await pipe.execute()
+
+    @timed
+    async def invalidate(self, entity: DeclarativeBase):
+        """Notify all workers to drop the entity from local caches."""
+        if self.local_cache:
+            key = self._get_key(entity, entity.id)
+            await self.cache.publish(INVALIDATE_CHANNEL, key)
+
+    @timed
+    async def invalidate_many(self, entities: List[DeclarativeBase]):
+        """Notify all workers to drop the entities with one pipeline."""
+        if self.local_cache and entities:
+            pipe = self.cache.pipeline(transaction=False)
+            for entity in entities:
+                pipe.publish(INVALIDATE_CHANNEL,
+                             self._get_key(entity, entity.id))
+            await pipe.execute()
+
+    @timed
+    async def get_query(self, cls: Type[DeclarativeBase], query_name: str,
+                        query_kwargs: dict) -> Tuple[Any, int]:
+        """
+        Retrieve a cached query result together with the current table
+        generation (one MGET). The result is returned only if it was
+        stored for the current generation.
+        """
+        generation, query_bytes = await self.cache.mget(
+            self._get_generation_key(cls),
+            self._get_query_key(cls, query_name, query_kwargs))
+        generation = int(generation or 0)
+
+        if query_bytes:
+            query_generation, query_result = orjson.loads(query_bytes)
+            if query_generation == generation:
+                return query_result, generation
+
+        return None, generation
+
+    @timed
+    async def set_query(self, cls: Type[DeclarativeBase], query_name: str,
+                        query_kwargs: dict, query_result: Any,
+                        generation: int):
+        """Set a query result for the table generation it was read at."""
+        key = self._get_query_key(cls, query_name, query_kwargs)
+        await self.cache.set(key, orjson.dumps([generation, query_result]),
+                             ex=cfg.REDIS_EXPIRE)
+
+    @timed
+    async def get_flag(self, cls: Type[DeclarativeBase],
+                       flag_kwargs: dict) -> Optional[bool]:
+        """
+        Retrieve the flag whether an entity matching the criteria exists
+        (the local cache first). Returns None if it is not cached.
+        """
+        key = self._get_flag_key(cls, flag_kwargs)
+        flag_bytes = self.local_cache.get(key) if self.local_cache else None
+
+        if not flag_bytes:
+            version = self.local_cache.version if self.local_cache else None
+            flag_bytes = await self.cache.get(key)
+            if flag_bytes and self.local_cache:
+                self.local_cache.set(key, flag_bytes, version)
+
+        return flag_bytes == b"1" if flag_bytes else None
+
+    @timed
+    async def set_flag(self, cls: Type[DeclarativeBase], flag_kwargs: dict,
+                       value: bool):
+        """Set the flag whether an entity matching the criteria exists."""
+        key = self._get_flag_key(cls, flag_kwargs)
+        flag_bytes = b"1" if value else b"0"
+        await self.cache.set(key, flag_bytes, ex=FLAG_EXPIRE)
+
+        if self.local_cache:
+            self.local_cache.set(key, flag_bytes)
+
+    @timed
+    async def delete_flags(self, cls: Type[DeclarativeBase],
+                           flags: List[dict]):
+        """Delete the flags in the cache of all workers."""
+        keys = [self._get_flag_key(cls, x) for x in flags]
+        await self.cache.delete(*keys)
+
+        if self.local_cache:
+            for key in keys:
+                self.local_cache.delete(key)
+                await self.cache.publish(INVALIDATE_CHANNEL, key)
+
+    @timed
+    async def bump_generation(self, cls: Type[DeclarativeBase]):
+        """Invalidate all cached query results of the table at once."""
+        await self.cache.incr(self._get_generation_key(cls))
+
+    @timed
+    async def delete_all(self, cls: Type[DeclarativeBase],
+                         batch_size: int = DELETE_ALL_BATCH_SIZE) -> int:
+        """
+        Delete all entities of a given class from the cache. Keys are
+        iterated with SCAN cursors (so Redis is not blocked by KEYS) and
+        removed with one non-blocking UNLINK per batch. Returns the number
+        of removed keys.
+        """
         key_pattern = self._get_key(cls, "*")
-        for key in await self.cache.keys(key_pattern):
-            await self.cache.delete(key)
+        keys, removed = [], 0
+
+        async for key in self.cache.scan_iter(match=key_pattern,
+                                              count=batch_size):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                removed += await self.cache.unlink(*keys)
+                keys = []
+
+        if keys:
+            removed += await self.cache.unlink(*keys)
+
+        if self.local_cache:
+            self.local_cache.delete_all(key_pattern[:-1])
+            await self.cache.publish(INVALIDATE_CHANNEL, key_pattern)
+
+        return removed
+
+
+def get_compression_stats() -> dict:
+    """Return compression ratio and CPU cost (microseconds) per table."""
+    return {table: {
+        "compressed": stats["compressed"],
+        "decompressed": stats["decompressed"],
+        "ratio": round(stats["compressed_bytes"] / stats["raw_bytes"], 3)
+        if stats["raw_bytes"] else None,
+        "compress_us": round(stats["compress_time"] * 1e6 /
+                             stats["compressed"], 1)
+        if stats["compressed"] else None,
+        "decompress_us": round(stats["decompress_time"] * 1e6 /
+                               stats["decompressed"], 1)
+        if stats["decompressed"] else None,
+    } for table, stats in compression_stats.items()}
@@ -1,15 +1,25 @@
-from typing import Union, Type, List, Optional
-from sqlalchemy import select, text, asc, desc
+import orjson
+from typing import Union, Type, List, Optional, Tuple
+from sqlalchemy import (
+    select, insert, update, delete, text, asc, desc, or_, inspect,
+    literal_column)
+from sqlalchemy.sql.expression import ClauseElement, Executable, Exists
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from app.decorators.timed_deco import timed
+from app.helpers.cursor_helper import CursorHelper
+from app.log import get_log
+
+log = get_log()
 
 ID = "id"
 ORDER_BY, ORDER = "order_by", "order"
 ASC, DESC = "asc", "desc"
-OFFSET, LIMIT = "offset", "limit"
-RESERVED_KEYS = [ORDER_BY, ORDER, OFFSET, LIMIT]
+OFFSET, LIMIT, CURSOR = "offset", "limit", "cursor"
+RESERVED_KEYS = [ORDER_BY, ORDER, OFFSET, LIMIT, CURSOR]
 RESERVED_OPERATORS = {
     "in": "in_",
     "eq": "__eq__",
@@ -22,6 +32,24 @@ RESERVED_OPERATORS = {
     "ilike": "ilike",
 }
 DELETE_ALL_BATCH_SIZE = 500
+BULK_BATCH_SIZE = 1000
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) of a statement. The statement is compiled by
+    the same compiler, so its binds keep their types (and processors).
+    """
+    inherit_cache = False
+
+    def __init__(self, statement: Executable):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) %s" % compiler.process(
+        element.statement, **kwargs)
 
 
 class EntityManager:
@@ -38,10 +66,28 @@ class EntityManager:
 
     @timed
     async def exists(self, cls: Type[DeclarativeBase], **kwargs) -> bool:
-        """Check if an entity exists based on provided filters."""
+        """
+        Check if an entity exists based on provided filters with SELECT
+        EXISTS, so no entity (nor its eager loaded relations) is loaded.
+        """
         async_result = await self.session.execute(
-            select(cls).where(*self._where(cls, **kwargs)).limit(1))
-        return async_result.unique().scalars().one_or_none() is not None
+            select(self._exists(cls, **kwargs)))
+        return bool(async_result.scalar())
+
+    @timed
+    async def exists_many(
+            self, conditions: List[Tuple[Type[DeclarativeBase], dict]],
+            ) -> List[bool]:
+        """
+        Check several conditions (entity class and filters) in one query,
+        one EXISTS column per condition.
+        """
+        if not conditions:
+            return []
+
+        async_result = await self.session.execute(select(
+            *[self._exists(cls, **kwargs) for cls, kwargs in conditions]))
+        return [bool(x) for x in async_result.one()]
 
     @timed
     async def insert(self, obj: DeclarativeBase, flush: bool = True,
@@ -55,6 +101,72 @@ class EntityManager:
         if commit:
             await self.commit()
 
+    @timed
+    async def insert_many(self, cls: Type[DeclarativeBase],
+                          objs: List[DeclarativeBase],
+                          batch_size: int = BULK_BATCH_SIZE,
+                          commit: bool = False) -> List[DeclarativeBase]:
+        """
+        Insert entities with multi-row INSERT ... RETURNING, one per
+        batch. Returns the inserted entities (with ids and defaults) in
+        the order of the given ones.
+        """
+        entities = []
+        for i in range(0, len(objs), batch_size):
+            async_result = await self.session.scalars(
+                insert(cls).returning(cls, sort_by_parameter_order=True),
+                [self._get_values(obj) for obj in objs[i:i + batch_size]])
+            entities.extend(async_result.all())
+
+        if commit:
+            await self.commit()
+
+        return entities
+
+    @timed
+    async def copy_many(self, cls: Type[DeclarativeBase],
+                        objs: List[DeclarativeBase],
+                        commit: bool = False) -> int:
+        """
+        Insert entities with COPY (asyncpg), the fastest way to load very
+        large batches. Ids are assigned by the database and not returned,
+        Python-side column defaults are applied here. COPY runs in the
+        session transaction, so it is rolled back unless committed.
+        """
+        if not objs:
+            return 0
+
+        values = [self._get_values(obj) for obj in objs]
+        keys = set().union(*values)
+        columns = [x for x in cls.__table__.columns
+                   if not x.primary_key and (x.key in keys or (
+                       x.default is not None and not x.default.is_sequence))]
+
+        conn = await self.session.connection()
+        dialect = conn.dialect
+        processors = [x.type.bind_processor(dialect) for x in columns]
+        records = []
+        for obj_values in values:
+            record = []
+            for column, processor in zip(columns, processors):
+                value = obj_values[column.key] if column.key in obj_values \
+                    else self._get_default(column)
+                record.append(processor(value) if processor else value)
+            records.append(tuple(record))
+
+        # The adapter begins its transaction on the first statement it
+        # executes, COPY on the driver connection would run in autocommit.
+        await conn.exec_driver_sql("SELECT 1")
+        raw_conn = await conn.get_raw_connection()
+        await raw_conn.driver_connection.copy_records_to_table(
+            cls.__tablename__, records=records,
+            columns=[x.name for x in columns])
+
+        if commit:
+            await self.commit()
+
+        return len(records)
+
     @timed
     async def select(self, cls: Type[DeclarativeBase],
                      obj_id: int) -> Union[DeclarativeBase, None]:
@@ -63,6 +175,14 @@ class EntityManager:
             select(cls).where(cls.id == obj_id).limit(1))
         return async_result.unique().scalars().one_or_none()
 
+    @timed
+    async def select_many(self, cls: Type[DeclarativeBase],
+                          obj_ids: List[int]) -> List[DeclarativeBase]:
+        """Select entities by their ids with a single IN query."""
+        async_result = await self.session.execute(
+            select(cls).where(cls.id.in_(obj_ids)))
+        return async_result.unique().scalars().all()
+
     @timed
     async def select_by(self, cls: Type[DeclarativeBase],
                         **kwargs) -> Union[DeclarativeBase, None]:
@@ -74,15 +194,51 @@ class EntityManager:
     @timed
     async def select_all(self, cls: Type[DeclarativeBase],
                          **kwargs) -> List[DeclarativeBase]:
-        """Select all entities matching the filters."""
+        """
+        Select all entities matching the filters. With a cursor the page
+        starts after the entity the cursor points to (keyset pagination)
+        instead of skipping offset rows.
+        """
         async_result = await self.session.execute(
             select(cls)
-            .where(*self._where(cls, **kwargs))
-            .order_by(self._order_by(cls, **kwargs))
+            .where(*self._where(cls, **kwargs), *self._seek(cls, **kwargs))
+            .order_by(self._order_by(cls, **kwargs),
+                      *self._tiebreaker(cls, **kwargs))
             .offset(self._offset(**kwargs))
             .limit(self._limit(**kwargs)))
         return async_result.unique().scalars().all()
 
+    @timed
+    async def select_all_counted(self, cls: Type[DeclarativeBase],
+                                 **kwargs) -> Tuple[List[DeclarativeBase],
+                                                    int]:
+        """
+        Select entities matching the filters together with their total
+        number in one query (count(*) OVER() is computed before limit).
+        A cursor narrows the window, so it is counted separately then,
+        as is a page past the end that has no rows to carry the total.
+        """
+        if kwargs.get(CURSOR):
+            return (await self.select_all(cls, **kwargs),
+                    await self.count_all(cls, **kwargs))
+
+        async_result = await self.session.execute(
+            select(cls, func.count().over())
+            .where(*self._where(cls, **kwargs))
+            .order_by(self._order_by(cls, **kwargs),
+                      *self._tiebreaker(cls, **kwargs))
+            .offset(self._offset(**kwargs))
+            .limit(self._limit(**kwargs)))
+        rows = async_result.unique().all()
+
+        if rows:
+            return [x[0] for x in rows], rows[0][1]
+
+        elif self._offset(**kwargs):
+            return [], await self.count_all(cls, **kwargs)
+
+        return [], 0
+
     @timed
     async def update(self, obj: DeclarativeBase, flush: bool = True,
                      commit: bool = False):
@@ -95,6 +251,40 @@ class EntityManager:
         if commit:
             await self.commit()
 
+    @timed
+    async def update_many(self, cls: Type[DeclarativeBase],
+                          objs: List[DeclarativeBase],
+                          batch_size: int = BULK_BATCH_SIZE,
+                          commit: bool = False):
+        """
+        Update changed columns of entities by primary key with one
+        executemany per batch (entities with the same changed columns
+        share a statement). The entities are marked as unchanged, so
+        the session does not update them once more on flush.
+        """
+        onupdate = [x for x in cls.__table__.columns
+                    if x.onupdate is not None and x.onupdate.is_callable]
+
+        for i in range(0, len(objs), batch_size):
+            changed = []
+            for obj in objs[i:i + batch_size]:
+                changes = self._get_changes(obj)
+                if changes:
+                    changes |= {x.key: x.onupdate.arg(None) for x in onupdate
+                                if x.key not in changes}
+                    changed.append((obj, changes))
+
+            if changed:
+                await self.session.execute(update(cls), [
+                    changes | {ID: obj.id} for obj, changes in changed])
+
+            for obj, changes in changed:
+                for key, value in changes.items():
+                    set_committed_value(obj, key, value)
+
+        if commit:
+            await self.commit()
+
     @timed
     async def delete(self, obj: DeclarativeBase, commit: bool = False):
         """Delete an entity from the database."""
@@ -105,15 +295,41 @@ class EntityManager:
 
     @timed
     async def delete_all(self, cls: Type[DeclarativeBase],
-                         commit: bool = False, **kwargs):
-        """Delete all entities of a class with optional filters."""
-        kwargs = kwargs | {ORDER_BY: ID, ORDER: ASC, OFFSET: 0,
-                           LIMIT: DELETE_ALL_BATCH_SIZE}
-
-        while objs := await self.select_all(cls, **kwargs):
-            kwargs[OFFSET] += kwargs[LIMIT]
-            for obj in objs:
-                await self.delete(obj, commit=commit)
+                         commit: bool = False,
+                         batch_size: int = DELETE_ALL_BATCH_SIZE,
+                         **kwargs) -> List[int]:
+        """
+        Delete all entities of a class with optional filters, batch by
+        batch with DELETE ... WHERE id IN (SELECT id ... ORDER BY id
+        LIMIT batch) RETURNING id. Each batch starts after the last
+        deleted id and, with commit, is committed on its own, so locks
+        are held shortly. Returns ids of the deleted entities.
+        """
+        id_column, deleted_ids = getattr(cls, ID), []
+
+        while True:
+            where = self._where(cls, **kwargs)
+            if deleted_ids:
+                where.append(id_column > deleted_ids[-1])
+
+            async_result = await self.session.execute(
+                delete(cls)
+                .where(id_column.in_(select(id_column).where(*where)
+                                     .order_by(id_column).limit(batch_size)))
+                .returning(id_column)
+                .execution_options(synchronize_session="fetch"))
+            batch_ids = sorted(async_result.scalars().all())
+
+            if commit:
+                await self.commit()
+
+            deleted_ids.extend(batch_ids)
+            log.info("Delete progress; module=entity_manager; "
+                     "function=delete_all; table=%s; deleted=%s;" % (
+                         cls.__tablename__, len(deleted_ids)))
+
+            if len(batch_ids) < batch_size:
+                return deleted_ids
 
     @timed
     async def count_all(self, cls: Type[DeclarativeBase], **kwargs) -> int:
@@ -123,6 +339,32 @@ class EntityManager:
                 *self._where(cls, **kwargs)))
         return async_result.unique().scalars().one_or_none() or 0
 
+    @timed
+    async def estimate_all(self, cls: Type[DeclarativeBase],
+                           **kwargs) -> int:
+        """
+        Estimate the number of entities matching the filters from the
+        planner statistics instead of counting them: reltuples of the
+        table without filters, the row estimate of EXPLAIN with them.
+        Returns -1 if the table has never been analyzed.
+        """
+        where = self._where(cls, **kwargs)
+
+        if not where:
+            async_result = await self.session.execute(text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = CAST(:table_name AS regclass);"),
+                {"table_name": cls.__tablename__})
+            return async_result.scalars().one_or_none() or 0
+
+        async_result = await self.session.execute(
+            Explain(select(getattr(cls, ID)).where(*where)))
+
+        plan = async_result.scalar()
+        if isinstance(plan, str):
+            plan = orjson.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     @timed
     async def sum_all(self, cls: Type[DeclarativeBase], column_name: str,
                       **kwargs) -> int:
@@ -154,6 +396,35 @@ class EntityManager:
         """Roll back the current transaction."""
         await self.session.rollback()
 
+    def _exists(self, cls: Type[DeclarativeBase], **kwargs) -> Exists:
+        """Construct EXISTS (SELECT 1 FROM table WHERE ...) clause."""
+        return select(literal_column("1")).select_from(cls).where(
+            *self._where(cls, **kwargs)).exists()
+
+    def _get_values(self, obj: DeclarativeBase) -> dict:
+        """Get values of the columns set in the entity."""
+        obj_state = inspect(obj)
+        return {x.key: obj_state.dict[x.key]
+                for x in obj_state.mapper.column_attrs
+                if x.key in obj_state.dict}
+
+    def _get_changes(self, obj: DeclarativeBase) -> dict:
+        """Get values of the columns changed in the entity."""
+        obj_state = inspect(obj)
+        return {x.key: obj_state.dict[x.key]
+                for x in obj_state.mapper.column_attrs
+                if x.key != ID and obj_state.attrs[x.key].history.has_changes()}
+
+    def _get_default(self, column) -> object:
+        """Get the Python-side default value of the column."""
+        if column.default is None:
+            return None
+
+        elif column.default.is_callable:
+            return column.default.arg(None)
+
+        return column.default.arg
+
     def _where(self, cls: Type[DeclarativeBase], **kwargs) -> list:
         """Construct a where clause from the kwargs."""
         where = []
@@ -190,9 +461,52 @@ class EntityManager:
         elif kwargs.get(ORDER) == DESC:
             return desc(order_by)
 
+    def _tiebreaker(self, cls: Type[DeclarativeBase], **kwargs) -> list:
+        """Order entities with equal sort values by id."""
+        if kwargs.get(ORDER_BY) == ID:
+            return []
+
+        return [self._order_by(cls, **kwargs | {ORDER_BY: ID})]
+
+    def _seek(self, cls: Type[DeclarativeBase], **kwargs) -> list:
+        """
+        Construct the seek predicate of the cursor. The range condition
+        on the sort column alone lets its index start right at the
+        cursor, the second one skips the ties already returned. Nulls
+        sort after all values (last ascending, first descending), as
+        they do in Postgres by default.
+        """
+        if not kwargs.get(CURSOR):
+            return []
+
+        _, _, value, last_id = CursorHelper.decode(kwargs[CURSOR])
+        column, id_column = getattr(cls, kwargs[ORDER_BY]), getattr(cls, ID)
+
+        if kwargs[ORDER_BY] == ID and kwargs.get(ORDER) == DESC:
+            return [id_column < last_id]
+
+        elif kwargs[ORDER_BY] == ID:
+            return [id_column > last_id]
+
+        elif value is None and kwargs.get(ORDER) == DESC:
+            return [or_(column.is_not(None), id_column < last_id)]
+
+        elif value is None:
+            return [column.is_(None), id_column > last_id]
+
+        elif kwargs.get(ORDER) == DESC:
+            return [column <= value, or_(column < value, id_column < last_id)]
+
+        elif column.nullable:
+            return [or_(column >= value, column.is_(None)),
+                    or_(column > value, column.is_(None),
+                        id_column > last_id)]
+
+        return [column >= value, or_(column > value, id_column > last_id)]
+
     def _offset(self, **kwargs) -> Optional[int]:
-        """Get the offset value from the kwargs."""
-        return kwargs.get(OFFSET)
+        """Get the offset value from the kwargs (none with a cursor)."""
+        return None if kwargs.get(CURSOR) else kwargs.get(OFFSET)
 
     def _limit(self, **kwargs) -> Optional[int]:
         """Get the limit value from the kwargs."""
@@ -0,0 +1,75 @@
+"""Cache of verified user tokens."""
+
+import hashlib
+import orjson
+from time import time
+from typing import Optional
+from app.cache import CacheBackend
+from app.decorators.timed_deco import timed
+from app.local_cache import LocalCache, INVALIDATE_CHANNEL
+
+
+class TokenManager:
+    """
+    Caches payloads of verified tokens (user id, role, jti version and
+    expiration) by the token hash, so repeated requests with the same
+    token skip JWT verification and jti decryption. Entries expire with
+    the token and are checked against the jti version of the user, so
+    rotating the jti declines them.
+    """
+
+    def __init__(self, cache: CacheBackend, local_cache: LocalCache = None):
+        """Initialize the TokenManager with a cache instance."""
+        self.cache = cache
+        self.local_cache = local_cache
+
+    def _get_key(self, user_token: str) -> str:
+        """Create a key by the token hash."""
+        return "token:%s" % hashlib.sha256(user_token.encode()).hexdigest()
+
+    @timed
+    async def get(self, user_token: str) -> Optional[dict]:
+        """Retrieve the payload of the verified token if not expired."""
+        key = self._get_key(user_token)
+        token_bytes = self.local_cache.get(key) if self.local_cache else None
+
+        if not token_bytes:
+            token_bytes = await self.cache.get(key)
+            if token_bytes and self.local_cache:
+                self.local_cache.set(key, token_bytes)
+
+        token_payload = orjson.loads(token_bytes) if token_bytes else None
+        if token_payload and token_payload["exp"] > time():
+            return token_payload
+
+        return None
+
+    @timed
+    async def set(self, user_token: str, user_id: int, user_role: str,
+                  jti_version: str, exp: int):
+        """Cache the payload of the verified token until it expires."""
+        expire = int(exp - time())
+        if expire <= 0:
+            return
+
+        key = self._get_key(user_token)
+        token_bytes = orjson.dumps({
+            "user_id": user_id,
+            "user_role": user_role,
+            "jti_version": jti_version,
+            "exp": exp,
+        })
+        await self.cache.set(key, token_bytes, ex=expire)
+
+        if self.local_cache:
+            self.local_cache.set(key, token_bytes)
+
+    @timed
+    async def delete(self, user_token: str):
+        """Delete the token from the cache of all workers."""
+        key = self._get_key(user_token)
+        await self.cache.delete(key)
+
+        if self.local_cache:
+            self.local_cache.delete(key)
+            await self.cache.publish(INVALIDATE_CHANNEL, key)
@@ -0,0 +1,179 @@
+"""In-process cache backend with the subset of the Redis API in use."""
+
+import fnmatch
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, List, Optional, Union
+
+MEMORY_SCRIPTS = {}
+
+
+def memory_script(script: str) -> Callable:
+    """
+    Register a Python equivalent of the Lua script for the in-process
+    backend. The function receives the backend, keys and args.
+    """
+    def decorator(func: Callable) -> Callable:
+        MEMORY_SCRIPTS[script] = func
+        return func
+    return decorator
+
+
+class MemoryScript:
+    """Callable returned by register_script (like redis AsyncScript)."""
+
+    def __init__(self, cache: "MemoryCache", script: str):
+        self.cache = cache
+        self.func = MEMORY_SCRIPTS[script]
+
+    async def __call__(self, keys: list = None, args: list = None) -> Any:
+        """Run the script with the keys and args."""
+        return await self.func(self.cache, keys or [], args or [])
+
+
+class MemoryPipeline:
+    """Records commands and runs them one by one on execute."""
+
+    def __init__(self, cache: "MemoryCache"):
+        self.cache = cache
+        self.commands = []
+
+    def __getattr__(self, name: str) -> Callable:
+        """Return a function that queues the command."""
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return command
+
+    async def execute(self) -> list:
+        """Run the queued commands and return their results."""
+        commands, self.commands = self.commands, []
+        return [await getattr(self.cache, name)(*args, **kwargs)
+                for name, args, kwargs in commands]
+
+
+class MemoryCache:
+    """
+    Bounded LRU dict with Redis semantics of the commands used by the
+    app (values are stored as bytes, TTLs are checked on access). It
+    lives in the worker process, so it is suitable for benchmarks and
+    single-worker deployments without Redis. Commands do not await
+    anything, so each of them (and each script) is atomic.
+    """
+
+    def __init__(self, maxsize: int):
+        """Initialize the MemoryCache with the size limit."""
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+
+    def _to_bytes(self, value: Union[bytes, str, int, float]) -> bytes:
+        """Convert the value to bytes as Redis does."""
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def _get_item(self, key: str) -> Optional[list]:
+        """Return [expires_at, value] of the key if it is not expired."""
+        item = self.items.get(key)
+        if item and item[0] and item[0] <= monotonic():
+            del self.items[key]
+            return None
+
+        elif item:
+            self.items.move_to_end(key)
+
+        return item
+
+    def _set_item(self, key: str, value: Any, expire: Optional[float]):
+        """Store the value and evict the least recently used if necessary."""
+        expires_at = monotonic() + expire if expire else None
+        self.items[key] = [expires_at, self._to_bytes(value)]
+        self.items.move_to_end(key)
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get the value of the key."""
+        item = self._get_item(key)
+        return item[1] if item else None
+
+    async def getex(self, key: str, ex: int = None) -> Optional[bytes]:
+        """Get the value of the key and reset its TTL."""
+        item = self._get_item(key)
+        if item and ex:
+            item[0] = monotonic() + ex
+        return item[1] if item else None
+
+    async def mget(self, keys: Union[str, List[str]], *args) -> list:
+        """Get values of the keys."""
+        keys = [keys, *args] if isinstance(keys, str) else list(keys)
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: Any, ex: int = None,
+                  px: int = None, nx: bool = False) -> Optional[bool]:
+        """Set the value (only if the key is missing with nx)."""
+        if nx and self._get_item(key):
+            return None
+
+        self._set_item(key, value, ex or (px / 1000 if px else None))
+        return True
+
+    async def incr(self, key: str) -> int:
+        """Increment the integer value, the TTL is kept."""
+        item = self._get_item(key)
+        if not item:
+            self._set_item(key, 1, None)
+            return 1
+
+        item[1] = self._to_bytes(int(item[1]) + 1)
+        return int(item[1])
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        """Set the TTL of the key."""
+        item = self._get_item(key)
+        if item:
+            item[0] = monotonic() + seconds
+        return bool(item)
+
+    async def pttl(self, key: str) -> int:
+        """Get the TTL of the key in milliseconds (-2 if missing)."""
+        item = self._get_item(key)
+        if not item:
+            return -2
+        return int((item[0] - monotonic()) * 1000) if item[0] else -1
+
+    async def delete(self, *keys: str) -> int:
+        """Delete the keys and return the number of removed ones."""
+        return sum(self.items.pop(key, None) is not None for key in keys)
+
+    async def unlink(self, *keys: str) -> int:
+        """Delete the keys (same as delete in the process)."""
+        return await self.delete(*keys)
+
+    async def scan_iter(self, match: str = None, count: int = None):
+        """Iterate over keys matching the glob pattern."""
+        for key in list(self.items):
+            if (not match or fnmatch.fnmatchcase(key, match)) and \
+                    self._get_item(key):
+                yield key
+
+    async def publish(self, channel: str, message: Any) -> int:
+        """There are no other workers sharing this cache to notify."""
+        return 0
+
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:
+        """Create a pipeline of commands."""
+        return MemoryPipeline(self)
+
+    def register_script(self, script: str) -> MemoryScript:
+        """Return the Python equivalent of the registered Lua script."""
+        return MemoryScript(self, script)
+
+    async def close(self):
+        """Drop all values."""
+        self.items.clear()
+
+    def stats(self) -> dict:
+        """Return size of the cache."""
+        return {
+            "size": len(self.items),
+            "maxsize": self.maxsize,
+        }
@@ -1,9 +1,13 @@
 from cryptography.fernet import Fernet
+from weakref import WeakKeyDictionary
 from app.config import get_config
 
 config = get_config()
 cipher_suite = Fernet(config.FERNET_KEY)
 
+# Plaintexts are kept out of the instance dict, which gets serialized.
+_decrypted = WeakKeyDictionary()
+
 
 class FernetMixin:
 
@@ -21,3 +25,14 @@ class FernetMixin:
         """Decrypt string value."""
         decoded_text = cipher_suite.decrypt(str.encode(value))
         return decoded_text.decode()
+
+    def decrypt_memoized(self, value: str) -> str:
+        """Decrypt string value once per instance."""
+        decrypted = _decrypted.setdefault(self, {})
+        if value not in decrypted:
+            decrypted[value] = self.decrypt(value)
+        return decrypted[value]
+
+    def forget_decrypted(self):
+        """Drop memoized plaintexts (when encrypted values change)."""
+        _decrypted.pop(self, None)
@@ -3,6 +3,7 @@ from sqlalchemy import (Boolean, Column, BigInteger, Integer, ForeignKey,
 from sqlalchemy.orm import relationship
 from app.config import get_config
 from app.database import Base
+from app.managers.cache_manager import CachePolicy
 from time import time
 
 cfg = get_config()
@@ -11,6 +12,8 @@ cfg = get_config()
 class Album(Base):
     __tablename__ = "albums"
     _cacheable = True
+    _cache_keys = ("album_name",)
+    _cache_policy = CachePolicy(jitter=10)
 
     id = Column(BigInteger, primary_key=True)
     created_date = Column(Integer, index=True, default=lambda: int(time()))
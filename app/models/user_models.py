@@ -1,13 +1,16 @@
 import enum
+import hashlib
 from sqlalchemy import (Boolean, Column, BigInteger, Integer, SmallInteger,
-                        String, Enum)
+                        String, Enum, Index)
 from sqlalchemy.ext.hybrid import hybrid_property
 from app.mixins.mfa_mixin import MFAMixin
 from app.mixins.fernet_mixin import FernetMixin
 from app.helpers.hash_helper import HashHelper
+from app.helpers.password_helper import PasswordHelper
 from sqlalchemy.orm import relationship
 from app.config import get_config
 from app.database import Base
+from app.managers.cache_manager import CachePolicy
 from time import time
 from app.helpers.jwt_helper import JWTHelper
 
@@ -24,6 +27,9 @@ class UserRole(enum.Enum):
 class User(Base, MFAMixin, FernetMixin):
     __tablename__ = "users"
     _cacheable = True
+    _cache_keys = ("user_login",)
+    _cache_policy = CachePolicy(jitter=10, sliding=True)
+    _cache_flags = ({"user_role__eq": UserRole.ADMIN, "is_active__eq": True},)
 
     id = Column(BigInteger, primary_key=True)
     created_date = Column(Integer, index=True, default=lambda: int(time()))
@@ -42,19 +48,27 @@ class User(Base, MFAMixin, FernetMixin):
     mfa_secret_encrypted = Column(String(512), nullable=False, unique=True)
     mfa_attempts = Column(SmallInteger(), nullable=False, default=0)
     jti_encrypted = Column(String(512), nullable=False, unique=True)
+    jti_hash = Column(String(64), nullable=True)
     user_summary = Column(String(512), index=False, nullable=True)
 
     user_albums = relationship("Album", back_populates="album_user",
                                lazy="noload")
 
+    __table_args__ = (
+        Index("ix_users_active_admins", id,
+              postgresql_where=(user_role == UserRole.ADMIN) &
+              is_active.is_(True)),
+    )
+
     def __init__(self, user_role: UserRole, user_login: str, user_password: str,
                  first_name: str, last_name: str, is_active: bool = False,
-                 user_summary: str = ""):
+                 user_summary: str = "", password_hash: str = None):
         self.suspended_date = 0
         self.user_role = user_role
         self.is_active = is_active
         self.user_login = user_login
-        self.password_hash = HashHelper.hash(user_password)
+        self.password_hash = password_hash or PasswordHelper.hash(
+            user_password)
         self.password_attempts = 0
         self.password_accepted = False
         self.first_name = first_name
@@ -66,10 +80,11 @@ class User(Base, MFAMixin, FernetMixin):
 
     @property
     def mfa_secret(self) -> str:
-        return self.decrypt(self.mfa_secret_encrypted)
+        return self.decrypt_memoized(self.mfa_secret_encrypted)
 
     @mfa_secret.setter
     def mfa_secret(self, value: str):
+        self.forget_decrypted()
         self.mfa_secret_encrypted = self.encrypt(value)
 
     @property
@@ -78,11 +93,29 @@ class User(Base, MFAMixin, FernetMixin):
 
     @property
     def jti(self) -> str:
-        return self.decrypt(self.jti_encrypted)
+        return self.decrypt_memoized(self.jti_encrypted)
 
     @jti.setter
     def jti(self, value: str):
+        self.forget_decrypted()
         self.jti_encrypted = self.encrypt(value)
+        self.jti_hash = (HashHelper.keyed_hash(value)
+                         if cfg.JTI_HASH_ENABLED else None)
+
+    def check_jti(self, value: str) -> bool:
+        """
+        Check the jti of the token: by the keyed hash if it is stored,
+        otherwise by the decrypted jti.
+        """
+        if self.jti_hash:
+            return HashHelper.compare(self.jti_hash,
+                                      HashHelper.keyed_hash(value))
+        return value == self.jti
+
+    @property
+    def jti_version(self) -> str:
+        """Changes with the jti, computed without decryption."""
+        return hashlib.sha256(self.jti_encrypted.encode()).hexdigest()[:16]
 
     @hybrid_property
     def full_name(self) -> str:
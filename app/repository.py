@@ -1,44 +1,184 @@
-from typing import List, Type, Union
-from redis import Redis
+import asyncio
+from typing import List, Tuple, Type, Union
+from sqlalchemy import inspect
+from app.cache import CacheBackend
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
-from app.managers.entity_manager import EntityManager, ID
+from app.managers.entity_manager import EntityManager, ID, RESERVED_KEYS
 from app.managers.cache_manager import CacheManager
+from app.local_cache import local_cache
+from app.config import get_config
+
+cfg = get_config()
+
+CACHE_WRITE, CACHE_DEFER, CACHE_SKIP = "write", "defer", "skip"
+SELECT_ALL, COUNT_ALL = "select_all", "count_all"
+SINGLE_FLIGHT_RETRIES = 20
+SINGLE_FLIGHT_DELAY = 0.05  # seconds
+_deferred_tasks = set()
+_inflight_loads = {}
 
 
 class Repository:
     """Manages CRUD operations and caching for SQLAlchemy models."""
 
-    def __init__(self, session: AsyncSession, cache: Redis,
+    def __init__(self, session: AsyncSession, cache: CacheBackend,
                  entity_class: Type[DeclarativeBase]):
         """Initializes a repository for specific SQLAlchemy model."""
         self.entity_manager = EntityManager(session)
-        self.cache_manager = CacheManager(cache)
+        self.cache_manager = CacheManager(
+            cache, local_cache=local_cache if cfg.LOCAL_CACHE_ENABLED else None)
         self.entity_class = entity_class
+        self.uncommitted = False
+        self.uncommitted_flags = []
 
     async def exists(self, **kwargs) -> bool:
-        """Checks if an entity exists with the given criteria."""
-        return await self.entity_manager.exists(self.entity_class, **kwargs)
+        """
+        Checks if an entity exists with the given criteria. Criteria
+        declared in _cache_flags of the class are answered by a cached
+        flag, which is dropped when the criteria columns change. Only
+        positive flags are cached: a negative one read before a concurrent
+        change could be stored after its flag is dropped and stay stale.
+        """
+        flags = getattr(self.entity_class, "_cache_flags", ())
+        if not self.entity_class._cacheable or kwargs not in flags:
+            return await self.entity_manager.exists(
+                self.entity_class, **kwargs)
+
+        if await self.cache_manager.get_flag(self.entity_class, kwargs):
+            return True
+
+        exists = await self.entity_manager.exists(self.entity_class, **kwargs)
+        if exists:
+            await self.cache_manager.set_flag(self.entity_class, kwargs, True)
+
+        return exists
+
+    async def exists_many(self, criteria: List[dict]) -> List[bool]:
+        """
+        Checks several criteria at once. Criteria of _cache_flags are
+        answered by cached positive flags, all others by one EXISTS query.
+        """
+        flags = getattr(self.entity_class, "_cache_flags", ())
+        cached = self.entity_class._cacheable
+        results = [None] * len(criteria)
+
+        for i, kwargs in enumerate(criteria):
+            if cached and kwargs in flags:
+                results[i] = await self.cache_manager.get_flag(
+                    self.entity_class, kwargs) or None
+
+        missing = [i for i, x in enumerate(results) if x is None]
+        found = await self.entity_manager.exists_many(
+            [(self.entity_class, criteria[i]) for i in missing])
+
+        for i, exists in zip(missing, found):
+            results[i] = exists
+            if cached and exists and criteria[i] in flags:
+                await self.cache_manager.set_flag(
+                    self.entity_class, criteria[i], True)
+
+        return results
+
+    def _get_changed_flags(self, entity: DeclarativeBase = None) -> list:
+        """
+        Returns flags of _cache_flags which criteria columns are changed
+        in the entity (all flags if the entity is inserted or deleted).
+        Must be called before the changes are flushed.
+        """
+        flags = getattr(self.entity_class, "_cache_flags", ())
+        if not self.entity_class._cacheable or entity is None:
+            return list(flags)
+
+        entity_state = inspect(entity)
+        return [flag for flag in flags if any(
+            entity_state.attrs[x.rpartition("__")[0]].history.has_changes()
+            for x in flag)]
+
+    async def _drop_flags(self, flags: list, commit: bool):
+        """
+        Drops the cached flags. Flags of uncommitted changes are dropped
+        once more after the commit, so values read in between are not
+        kept.
+        """
+        if flags:
+            await self.cache_manager.delete_flags(self.entity_class, flags)
+            self.uncommitted_flags = [] if commit else flags
 
     async def insert(self, entity: DeclarativeBase, commit: bool = True):
         """Inserts an entity and optionally caches it."""
         await self.entity_manager.insert(entity, commit=commit)
+        await self._drop_flags(self._get_changed_flags(), commit)
 
         if self.entity_class._cacheable and commit:
             await self.cache_manager.set(entity)
 
+        elif self.entity_class._cacheable:
+            await self.cache_manager.delete(entity)
+
+        await self._bump_generation(commit)
+
+    async def insert_many(self, entities: List[DeclarativeBase],
+                          commit: bool = True) -> List[DeclarativeBase]:
+        """
+        Inserts entities in batches with multi-row INSERT ... RETURNING
+        and writes the returned entities through to the cache in one
+        pipeline. Returns the inserted entities.
+        """
+        entities = await self.entity_manager.insert_many(
+            self.entity_class, entities, batch_size=cfg.BULK_BATCH_SIZE,
+            commit=commit)
+        await self._drop_flags(self._get_changed_flags(), commit)
+
+        if self.entity_class._cacheable and commit:
+            await self.cache_manager.set_many(entities)
+
+        elif self.entity_class._cacheable:
+            await self.cache_manager.delete_many(entities)
+
+        await self._bump_generation(commit)
+        return entities
+
+    async def copy_many(self, entities: List[DeclarativeBase],
+                        commit: bool = True) -> int:
+        """
+        Inserts entities with COPY, the fast path for very large loads.
+        Ids are not returned, so the entities are cached when they are
+        read. Returns the number of inserted entities.
+        """
+        count = await self.entity_manager.copy_many(
+            self.entity_class, entities, commit=commit)
+        await self._drop_flags(self._get_changed_flags(), commit)
+        await self._bump_generation(commit)
+        return count
+
     async def select(self, **kwargs) -> Union[DeclarativeBase, None]:
-        """Retrieves an entity by id or other criteria."""
+        """
+        Retrieves an entity by id or other criteria. Ids that are not
+        found are remembered in the cache for a short time, lookups by
+        a single unique column of _cache_keys are resolved to the id
+        through the secondary index.
+        """
         entity_id, entity = kwargs.get(ID), None
+        index_lookup = self._get_index_lookup(**kwargs)
 
         if self.entity_class._cacheable and entity_id:
-            entity = await self.cache_manager.get(self.entity_class, entity_id)
+            entity = await self.cache_manager.get(
+                self.entity_class, entity_id, early_refresh=True)
+
+            if entity is None:
+                entity = await self._select_once(entity_id)
 
-        if not entity and entity_id:
+            return entity or None
+
+        elif self.entity_class._cacheable and index_lookup:
+            return await self._select_indexed(*index_lookup)
+
+        elif entity_id:
             entity = await self.entity_manager.select(
                 self.entity_class, entity_id)
 
-        elif not entity and kwargs:
+        elif kwargs:
             entity = await self.entity_manager.select_by(
                 self.entity_class, **kwargs)
 
@@ -47,37 +187,337 @@ class Repository:
 
         return entity
 
-    async def select_all(self, **kwargs) -> List[DeclarativeBase]:
-        """Retrieves all entities matching the given criteria."""
+    def _get_index_lookup(self, **kwargs) -> Union[tuple, None]:
+        """
+        Returns the column name and the value if the criteria is a single
+        equality on a column of _cache_keys.
+        """
+        if len(kwargs) == 1:
+            key, value = next(iter(kwargs.items()))
+            column_name, _, operator = key.rpartition("__")
+            cache_keys = getattr(self.entity_class, "_cache_keys", ())
+            if operator == "eq" and column_name in cache_keys:
+                return column_name, value
+
+        return None
+
+    async def _select_indexed(self, column_name: str, value) -> Union[
+            DeclarativeBase, None]:
+        """
+        Retrieves an entity by the unique column through the secondary
+        index. An index key that points at the entity with another value
+        (renamed or deleted one) is dropped and the database is queried.
+        """
+        entity_id = await self.cache_manager.get_index(
+            self.entity_class, column_name, value)
+
+        if entity_id:
+            entity = await self.select(id=entity_id)
+            if entity and getattr(entity, column_name) == value:
+                return entity
+
+            await self.cache_manager.delete_index([
+                self.cache_manager._get_index_key(
+                    self.entity_class, column_name, value)])
+
+        entity = await self.entity_manager.select_by(
+            self.entity_class, **{column_name + "__eq": value})
+
+        if entity:
+            await self.cache_manager.set(entity)
+
+        return entity
+
+    async def _select_once(self, entity_id: int) -> Union[
+            DeclarativeBase, None]:
+        """
+        Loads a missed entity so that concurrent requests of the worker
+        wait for one load instead of querying the database each.
+        """
+        key = self.cache_manager._get_key(self.entity_class, entity_id)
+        future = _inflight_loads.get(key)
+
+        if future:
+            await asyncio.shield(future)
+            entity = await self.cache_manager.get(self.entity_class, entity_id)
+            if entity is not None:
+                return entity
+
+            return await self._select_locked(entity_id)
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight_loads[key] = future
+        try:
+            return await self._select_locked(entity_id)
+        finally:
+            del _inflight_loads[key]
+            future.set_result(None)
+
+    async def _select_locked(self, entity_id: int) -> Union[
+            DeclarativeBase, None]:
+        """
+        Loads a missed entity under a short Redis lock, so that only one
+        worker queries the database. Other workers serve the cached value
+        (possibly stale one while it is refreshed early) or wait for it.
+        """
+        lock_token = await self.cache_manager.lock(
+            self.entity_class, entity_id)
+        for _ in range(SINGLE_FLIGHT_RETRIES):
+            if lock_token:
+                break
+
+            entity = await self.cache_manager.get(self.entity_class, entity_id)
+            if entity is not None:
+                return entity
+
+            await asyncio.sleep(SINGLE_FLIGHT_DELAY)
+            lock_token = await self.cache_manager.lock(
+                self.entity_class, entity_id)
+
+        try:
+            entity = await self.entity_manager.select(
+                self.entity_class, entity_id)
+
+            if entity:
+                await self.cache_manager.set(entity)
+            else:
+                await self.cache_manager.set_missing(
+                    self.entity_class, [entity_id])
+
+            return entity
+
+        finally:
+            if lock_token:
+                await self.cache_manager.unlock(
+                    self.entity_class, entity_id, lock_token)
+
+    async def select_many(self, ids: List[int]) -> List[DeclarativeBase]:
+        """
+        Retrieves entities by ids: cached ones with one MGET, misses
+        with a single IN query. Returns found entities in request order.
+        """
+        entities = {}
+        if self.entity_class._cacheable:
+            entities = await self.cache_manager.get_many(
+                self.entity_class, ids)
+
+        missed_ids = list(dict.fromkeys(x for x in ids if x not in entities))
+        if missed_ids:
+            missed_entities = await self.entity_manager.select_many(
+                self.entity_class, missed_ids)
+
+            entities.update({x.id: x for x in missed_entities})
+
+            if self.entity_class._cacheable:
+                await self.cache_manager.set_many(missed_entities)
+
+                missing_ids = [x for x in missed_ids if x not in entities]
+                if missing_ids:
+                    await self.cache_manager.set_missing(
+                        self.entity_class, missing_ids)
+
+        return [entities[x] for x in ids if entities.get(x)]
+
+    async def select_all(self, cache_mode: str = CACHE_WRITE,
+                         **kwargs) -> List[DeclarativeBase]:
+        """
+        Retrieves all entities matching the given criteria. Depending on
+        the cache mode the entities are written to the cache in one
+        pipeline, written in a background task or not written at all.
+        Ids of the result are cached until any entity of the class is
+        changed, then a repeated query costs one MGET plus one MGET.
+        """
+        if self.entity_class._cacheable:
+            ids, generation = await self.cache_manager.get_query(
+                self.entity_class, SELECT_ALL, kwargs)
+
+            if ids is not None:
+                entities = await self.select_many(ids)
+                if len(entities) == len(ids):
+                    return entities
+
         entities = await self.entity_manager.select_all(
             self.entity_class, **kwargs)
 
         if self.entity_class._cacheable:
-            for entity in entities:
-                await self.cache_manager.set(entity)
+            await self._set_entities(entities, cache_mode)
+            await self.cache_manager.set_query(
+                self.entity_class, SELECT_ALL, kwargs,
+                [x.id for x in entities], generation)
 
         return entities
 
+    async def select_all_counted(
+            self, cache_mode: str = CACHE_WRITE,
+            **kwargs) -> Tuple[List[DeclarativeBase], int]:
+        """
+        Retrieves entities matching the given criteria and their total
+        number. If the count is not cached, both come from one query
+        and both are cached.
+        """
+        if self.entity_class._cacheable:
+            count, generation = await self.cache_manager.get_query(
+                self.entity_class, COUNT_ALL, self._get_filters(kwargs))
+
+            if count is not None:
+                return await self.select_all(cache_mode, **kwargs), count
+
+        entities, count = await self.entity_manager.select_all_counted(
+            self.entity_class, **kwargs)
+
+        if self.entity_class._cacheable:
+            await self._set_entities(entities, cache_mode)
+            await self.cache_manager.set_query(
+                self.entity_class, SELECT_ALL, kwargs,
+                [x.id for x in entities], generation)
+            await self.cache_manager.set_query(
+                self.entity_class, COUNT_ALL, self._get_filters(kwargs),
+                count, generation)
+
+        return entities, count
+
+    def _get_filters(self, kwargs: dict) -> dict:
+        """
+        Returns the filters of the kwargs (without order, offset, limit
+        and cursor), which the count depends on.
+        """
+        return {x: kwargs[x] for x in kwargs if x not in RESERVED_KEYS}
+
+    async def _set_entities(self, entities: List[DeclarativeBase],
+                            cache_mode: str):
+        """Write selected entities to the cache as the mode says."""
+        if cache_mode == CACHE_WRITE:
+            await self.cache_manager.set_many(entities)
+
+        elif cache_mode == CACHE_DEFER:
+            task = asyncio.create_task(self.cache_manager.set_many(entities))
+            _deferred_tasks.add(task)
+            task.add_done_callback(_deferred_tasks.discard)
+
     async def update(self, entity: DeclarativeBase, commit: bool = True):
         """Updates an entity and manages its cache status."""
+        renamed_keys = []
+        if self.entity_class._cacheable:
+            renamed_keys = self.cache_manager._get_renamed_index_keys(entity)
+
+        changed_flags = self._get_changed_flags(entity)
         await self.entity_manager.update(entity, commit=commit)
+        await self._drop_flags(changed_flags, commit)
 
         if self.entity_class._cacheable:
+            await self.cache_manager.delete_index(renamed_keys)
+
             if commit:
                 await self.cache_manager.set(entity)
             else:
                 await self.cache_manager.delete(entity)
 
+            await self.cache_manager.invalidate(entity)
+
+        await self._bump_generation(commit)
+
+    async def update_many(self, entities: List[DeclarativeBase],
+                          commit: bool = True):
+        """
+        Updates entities in batches with executemany and writes them
+        through to the cache in one pipeline.
+        """
+        renamed_keys, changed_flags = [], []
+        for entity in entities:
+            if self.entity_class._cacheable:
+                renamed_keys += self.cache_manager._get_renamed_index_keys(
+                    entity)
+
+            changed_flags += [x for x in self._get_changed_flags(entity)
+                              if x not in changed_flags]
+
+        await self.entity_manager.update_many(
+            self.entity_class, entities, batch_size=cfg.BULK_BATCH_SIZE,
+            commit=commit)
+        await self._drop_flags(changed_flags, commit)
+
+        if self.entity_class._cacheable:
+            await self.cache_manager.delete_index(renamed_keys)
+
+            if commit:
+                await self.cache_manager.set_many(entities)
+            else:
+                await self.cache_manager.delete_many(entities)
+
+            await self.cache_manager.invalidate_many(entities)
+
+        await self._bump_generation(commit)
+
     async def delete(self, entity: DeclarativeBase, commit: bool = True):
         """Deletes an entity and manages its cache status."""
         await self.entity_manager.delete(entity, commit=commit)
+        await self._drop_flags(self._get_changed_flags(), commit)
 
         if self.entity_class._cacheable:
             await self.cache_manager.delete(entity)
+            await self.cache_manager.invalidate(entity)
+
+        await self._bump_generation(commit)
+
+    async def delete_all(self, commit: bool = True, **kwargs) -> int:
+        """
+        Deletes all entities matching the given criteria in set-based
+        batches and drops them from the cache. Returns the number of
+        deleted entities.
+        """
+        deleted_ids = await self.entity_manager.delete_all(
+            self.entity_class, commit=commit, **kwargs)
+        await self._drop_flags(self._get_changed_flags(), commit)
+
+        if self.entity_class._cacheable:
+            await self.cache_manager.delete_ids(self.entity_class,
+                                                deleted_ids)
+
+        await self._bump_generation(commit)
+        return len(deleted_ids)
 
     async def count_all(self, **kwargs) -> int:
-        """Counts all entities matching the given criteria."""
-        return await self.entity_manager.count_all(self.entity_class, **kwargs)
+        """
+        Counts all entities matching the given criteria. The count is
+        cached until any entity of the class is changed.
+        """
+        if self.entity_class._cacheable:
+            count, generation = await self.cache_manager.get_query(
+                self.entity_class, COUNT_ALL, self._get_filters(kwargs))
+
+            if count is not None:
+                return count
+
+        count = await self.entity_manager.count_all(self.entity_class, **kwargs)
+
+        if self.entity_class._cacheable:
+            await self.cache_manager.set_query(
+                self.entity_class, COUNT_ALL, self._get_filters(kwargs),
+                count, generation)
+
+        return count
+
+    async def estimate_all(self, **kwargs) -> Tuple[int, bool]:
+        """
+        Returns the number of entities matching the criteria and whether
+        it is exact. The cached count is returned as is, otherwise the
+        planner estimate is, unless it is below the threshold (or the
+        table is not analyzed yet) and counting is cheap.
+        """
+        if self.entity_class._cacheable:
+            count, _ = await self.cache_manager.get_query(
+                self.entity_class, COUNT_ALL, self._get_filters(kwargs))
+
+            if count is not None:
+                return count, True
+
+        estimate = await self.entity_manager.estimate_all(
+            self.entity_class, **kwargs)
+
+        if estimate < cfg.COUNT_ESTIMATE_THRESHOLD:
+            return await self.count_all(**kwargs), True
+
+        return estimate, False
 
     async def sum_all(self, column_name: str, **kwargs) -> int:
         """Sums a column's values for entities matching the criteria."""
@@ -88,6 +528,22 @@ class Repository:
         """Commits the current transaction."""
         await self.entity_manager.commit()
 
+        if self.uncommitted:
+            await self._bump_generation(True)
+
+        if self.uncommitted_flags:
+            await self._drop_flags(self.uncommitted_flags, True)
+
+    async def _bump_generation(self, commit: bool):
+        """
+        Invalidates cached query results of the class. Uncommitted changes
+        bump the generation once more after the commit, so results read
+        in between are not kept.
+        """
+        if self.entity_class._cacheable:
+            await self.cache_manager.bump_generation(self.entity_class)
+            self.uncommitted = not commit
+
     async def rollback(self):
         """Rolls back the current transaction."""
         await self.entity_manager.rollback()
@@ -0,0 +1,170 @@
+"""Revoked tokens: Redis keys mirrored into a per-worker Bloom filter."""
+
+import asyncio
+import hashlib
+import math
+import redis.asyncio as redis
+from time import time
+from app.cache import CacheBackend
+from app.decorators.timed_deco import timed
+from app.helpers.hash_helper import HashHelper
+from app.config import get_config
+from app.log import get_log
+
+cfg = get_config()
+log = get_log()
+
+REVOCATION_CHANNEL = "revocation"
+REVOCATION_ERROR_RATE = 0.001
+REVOCATION_LEEWAY = 60  # seconds, tokens issued just after the cutoff
+RECONNECT_DELAY = 1  # seconds
+
+
+class BloomFilter:
+    """
+    Bit array with k positions per item (double hashing of sha256).
+    Never gives false negatives, gives false positives with the error
+    rate while the number of items is within the capacity.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """Initialize the BloomFilter sized for the capacity."""
+        self.size = math.ceil(-capacity * math.log(error_rate) /
+                              math.log(2) ** 2)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray(math.ceil(self.size / 8))
+        self.count = 0
+        self.synced = False
+
+    def _get_positions(self, item: str) -> list:
+        """Return bit positions of the item."""
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        """Add the item."""
+        for position in self._get_positions(item):
+            self.bits[position // 8] |= 1 << position % 8
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Check if the item might have been added."""
+        return all(self.bits[x // 8] & (1 << x % 8)
+                   for x in self._get_positions(item))
+
+    def clear(self):
+        """Remove all items."""
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+
+    def reset(self, items: list):
+        """Replace all items at once, the filter is never seen empty."""
+        bits = bytearray(len(self.bits))
+        for item in items:
+            for position in self._get_positions(item):
+                bits[position // 8] |= 1 << position % 8
+        self.bits, self.count = bits, len(items)
+
+
+revoked_users = BloomFilter(cfg.REVOCATION_CAPACITY, REVOCATION_ERROR_RATE)
+
+
+class RevocationManager:
+    """
+    Revokes tokens of a user issued up to a cutoff: the ones issued
+    before the cutoff second and the ones with the jti current at the
+    cutoff (issued within that second). The cutoff is stored in the
+    cache for the token lifetime and the user is announced to all
+    workers, which add the user to their Bloom filters. While the filter
+    is synced, tokens of users not in it are accepted without a lookup.
+    """
+
+    def __init__(self, cache: CacheBackend):
+        """Initialize the RevocationManager with a cache instance."""
+        self.cache = cache
+
+    @property
+    def is_synced(self) -> bool:
+        """Whether the filter holds all users with revoked tokens."""
+        return revoked_users.synced
+
+    def _get_key(self, user_id: int) -> str:
+        """Create a key of the user revocation cutoff."""
+        return "revoked:%s" % user_id
+
+    @timed
+    async def revoke(self, user_id: int, jti: str):
+        """Revoke all tokens of the user issued so far."""
+        cutoff = "%s:%s" % (int(time()), HashHelper.keyed_hash(jti))
+        await self.cache.set(self._get_key(user_id), cutoff,
+                             ex=cfg.JWT_EXPIRES + REVOCATION_LEEWAY)
+        await self.cache.publish(REVOCATION_CHANNEL, str(user_id))
+        revoked_users.add(str(user_id))
+
+    @timed
+    async def is_revoked(self, token_payload: dict) -> bool:
+        """Check the filter first and the cutoff on a possible match."""
+        user_id = token_payload["user_id"]
+        if str(user_id) not in revoked_users:
+            return False
+
+        cutoff = await self.cache.get(self._get_key(user_id))
+        if not cutoff:
+            return False
+
+        elif isinstance(cutoff, bytes):
+            cutoff = cutoff.decode()
+
+        cutoff_time, jti_hash = cutoff.split(":", 1)
+        return token_payload["iat"] < int(cutoff_time) or HashHelper.compare(
+            jti_hash, HashHelper.keyed_hash(token_payload["jti"]))
+
+
+async def listen_revocations():
+    """
+    Keep the Bloom filter in sync with the revoked users. The listener is
+    restarted after a connection error and reloads the filter, so the
+    announcements missed in between are not lost. The filter is not
+    synced meanwhile, so the tokens are checked by the jti of the user.
+    """
+    while True:
+        try:
+            await _listen_revocations()
+
+        except Exception as e:
+            log.error("Revocations listener failed; module=revocation; "
+                      "function=listen_revocations; e=%s;" % str(e))
+
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+async def _listen_revocations():
+    """
+    Subscribe to the revocation channel, then fill the Bloom filter
+    with the users revoked so far, and add every newly revoked one.
+    """
+    conn = redis.Redis(host=cfg.REDIS_HOST, port=cfg.REDIS_PORT,
+                       decode_responses=True)
+    pubsub = conn.pubsub()
+    await pubsub.subscribe(REVOCATION_CHANNEL)
+
+    try:
+        revoked = [key.split(":", 1)[1] async for key in conn.scan_iter(
+            match="revoked:*", count=1000)]
+        revoked_users.reset(revoked)
+        revoked_users.synced = True
+
+        log.info("Revocations loaded; module=revocation; "
+                 "function=listen_revocations; count=%s;" %
+                 revoked_users.count)
+
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                revoked_users.add(message["data"])
+
+    finally:
+        revoked_users.synced = False
+        await pubsub.aclose()
+        await conn.aclose()
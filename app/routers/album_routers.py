@@ -7,9 +7,10 @@ from app.schemas.album_schemas import (
     AlbumInsertRequest, AlbumInsertResponse,  AlbumSelectRequest,
     AlbumSelectResponse, AlbumUpdateRequest, AlbumUpdateResponse,
     AlbumDeleteRequest, AlbumDeleteResponse, AlbumsListRequest,
-    AlbumsListResponse)
-from app.repository import Repository
+    AlbumsListResponse, AlbumsBatchRequest, AlbumsBatchResponse)
+from app.repository import Repository, CACHE_DEFER
 from app.errors import E, Msg
+from app.helpers.cursor_helper import CursorHelper
 from app.config import get_config
 from app.hooks import H, Hook
 from app.auth import auth
@@ -110,10 +111,44 @@ async def albums_list(session=Depends(get_session), cache=Depends(get_cache),
                       schema=Depends(AlbumsListRequest)):
     album_repository = Repository(session, cache, Album)
 
-    albums = await album_repository.select_all(**schema.__dict__)
-    albums_count = await album_repository.count_all(**schema.__dict__)
+    kwargs = schema.model_dump(exclude={"count_estimated"})
+
+    if schema.count_estimated:
+        albums = await album_repository.select_all(
+            cache_mode=CACHE_DEFER, **kwargs)
+        albums_count, albums_count_exact = \
+            await album_repository.estimate_all(**kwargs)
+
+    else:
+        albums, albums_count = await album_repository.select_all_counted(
+            cache_mode=CACHE_DEFER, **kwargs)
+        albums_count_exact = True
+
+    next_cursor = None
+    if len(albums) == schema.limit:
+        next_cursor = CursorHelper.encode(
+            schema.order_by, schema.order,
+            getattr(albums[-1], schema.order_by), albums[-1].id)
 
     return {
         "albums": [album.to_dict() for album in albums],
         "albums_count": albums_count,
+        "albums_count_exact": albums_count_exact,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/albums/batch", response_model=AlbumsBatchResponse, tags=["albums"])  # noqa E501
+async def albums_batch(session=Depends(get_session), cache=Depends(get_cache),
+                       current_user: User = Depends(auth(UserRole.READER)),
+                       schema=Depends(AlbumsBatchRequest)):
+    album_repository = Repository(session, cache, Album)
+    albums = await album_repository.select_many(schema.album_ids)
+
+    hook = Hook(session, cache)
+    for album in albums:
+        await hook.execute(H.AFTER_ALBUM_SELECT, album)
+
+    return {
+        "albums": [album.to_dict() for album in albums],
     }
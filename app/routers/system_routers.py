@@ -1,6 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 import time
 from fastapi.security import HTTPBearer
+from app.models.user_models import User, UserRole
+from app.local_cache import local_cache
+from app.cache import cachepool
+from app.managers.cache_manager import cache_stats, get_compression_stats
+from app.helpers.password_helper import password_executor
+from app.auth import auth
 
 router = APIRouter()
 jwt = HTTPBearer()
@@ -13,3 +19,19 @@ async def current_time():
         "timezone_name": time.tzname[0],
         "timezone_offset": time.timezone,
     }
+
+
+@router.get("/metrics/cache", tags=["system"])
+async def cache_metrics(current_user: User = Depends(auth(UserRole.ADMIN))):
+    return {
+        "local_cache": local_cache.stats(),
+        "connection_pool": cachepool.stats(),
+        "cache_manager": dict(cache_stats),
+        "compression": get_compression_stats(),
+    }
+
+
+@router.get("/metrics/password", tags=["system"])
+async def password_metrics(
+        current_user: User = Depends(auth(UserRole.ADMIN))):
+    return password_executor.stats()
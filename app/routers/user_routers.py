@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.database import get_session
 from app.cache import get_cache
 from app.models.user_models import User, UserRole
-from app.helpers.hash_helper import HashHelper
+from app.helpers.password_helper import PasswordHelper, password_executor
 from app.helpers.jwt_helper import JWTHelper
 from app.schemas.user_schemas import (
     UserRegisterRequest, UserRegisterResponse, UserLoginRequest,
@@ -13,8 +13,13 @@ from app.errors import E, Msg
 from app.config import get_config
 from time import time
 from app.hooks import H, Hook
-from app.auth import auth
+from app.auth import auth, jwt
 from app.repository import Repository
+from app.managers.attempt_manager import (
+    AttemptManager, PASSWORD_ATTEMPTS, MFA_ATTEMPTS)
+from app.managers.token_manager import TokenManager
+from app.revocation import RevocationManager
+from app.local_cache import local_cache
 
 router = APIRouter()
 cfg = get_config()
@@ -40,23 +45,31 @@ async def user_login(session=Depends(get_session), cache=Depends(get_cache),
         raise E("user_login", schema.user_login, Msg.USER_LOGIN_INACTIVE)
 
     user_password = schema.user_password.get_secret_value()
-    password_hash = HashHelper.hash(user_password)
+    password_accepted = await password_executor.verify(
+        user_password, user.password_hash)
+    attempt_manager = AttemptManager(cache)
 
-    if user.password_hash != password_hash:
-        user.password_accepted = False
+    if not password_accepted:
+        suspended = await attempt_manager.increment(
+            PASSWORD_ATTEMPTS, user.id, cfg.USER_LOGIN_ATTEMPTS,
+            cfg.USER_SUSPENDED_TIME)
 
-        if user.password_attempts >= cfg.USER_LOGIN_ATTEMPTS - 1:
-            user.suspended_date = int(time.time()) + cfg.USER_SUSPENDED_TIME
+        if suspended or user.password_accepted:
+            user.password_accepted = False
             user.password_attempts = 0
 
-        else:
-            user.suspended_date = 0
-            user.password_attempts += 1
+            if suspended:
+                user.suspended_date = int(time()) + cfg.USER_SUSPENDED_TIME
+
+            await user_repository.update(user)
 
-        await user_repository.update(user)
         raise E("user_password", user_password, Msg.USER_PASSWORD_INVALID)
 
     else:
+        if PasswordHelper.needs_upgrade(user.password_hash):
+            user.password_hash = await password_executor.hash(user_password)
+
+        await attempt_manager.reset(PASSWORD_ATTEMPTS, user.id)
         user.password_accepted = True
         user.password_attempts = 0
 
@@ -84,7 +97,10 @@ async def token_select(session=Depends(get_session), cache=Depends(get_cache),
         raise E("user_login", schema.user_login, Msg.USER_PASSWORD_UNACCEPTED)
 
     user_totp = user.get_totp(user.mfa_secret)
+    attempt_manager = AttemptManager(cache)
+
     if user_totp == schema.user_totp:
+        await attempt_manager.reset(MFA_ATTEMPTS, user.id)
         user.mfa_attempts = 0
         user.password_accepted = False
 
@@ -98,24 +114,35 @@ async def token_select(session=Depends(get_session), cache=Depends(get_cache),
         return {"user_token": user_token}
 
     else:
-        user.mfa_attempts += 1
+        exceeded = await attempt_manager.increment(
+            MFA_ATTEMPTS, user.id, cfg.USER_MFA_ATTEMPTS,
+            cfg.USER_SUSPENDED_TIME)
 
-        if user.mfa_attempts >= cfg.USER_MFA_ATTEMPTS:
+        if exceeded:
             user.mfa_attempts = 0
             user.password_accepted = False
+            await user_repository.update(user)
 
-        await user_repository.update(user)
         raise E("user_totp", schema.user_totp, Msg.USER_TOTP_INVALID)
 
 
 @router.delete("/auth/token", response_model=TokenDeleteResponse, tags=["auth"])
 async def token_delete(session=Depends(get_session), cache=Depends(get_cache),
                        current_user: User = Depends(auth(UserRole.READER)),
-                       schema=Depends(TokenDeleteRequest)):
+                       schema=Depends(TokenDeleteRequest),
+                       header=Depends(jwt)):
     """Logout: generate new jti."""
+    if cfg.REVOCATION_ENABLED:
+        revocation_manager = RevocationManager(cache)
+        await revocation_manager.revoke(current_user.id, current_user.jti)
+
     user_repository = Repository(session, cache, User)
     current_user.jti = JWTHelper.create_jti()
     await user_repository.update(current_user)
+
+    token_manager = TokenManager(
+        cache, local_cache=local_cache if cfg.LOCAL_CACHE_ENABLED else None)
+    await token_manager.delete(header.credentials)
     return {}
 
 
@@ -130,9 +157,11 @@ async def user_register(session=Depends(get_session), cache=Depends(get_cache),
         raise E("user_login", schema.user_login, Msg.USER_LOGIN_EXISTS)
 
     user_password = schema.user_password.get_secret_value()
+    password_hash = await password_executor.hash(user_password)
     user = User(
         UserRole.READER, schema.user_login, user_password, schema.first_name,
-        schema.last_name, user_summary=schema.user_summary)
+        schema.last_name, user_summary=schema.user_summary,
+        password_hash=password_hash)
     await user_repository.insert(user)
 
     hook = Hook(session, cache)
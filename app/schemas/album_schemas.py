@@ -1,10 +1,24 @@
 from pydantic import BaseModel
 from typing import Optional, Literal, List
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
+from app.helpers.cursor_helper import CursorHelper
 from app.config import get_config
 
 cfg = get_config()
 
+ALBUMS_BATCH_LIMIT = 200
+
+# Cursor value type and bound (int range or str length) per sort column.
+ALBUMS_CURSOR_VALUES = {
+    "id": (int, 2 ** 63),
+    "created_date": (int, 2 ** 31),
+    "updated_date": (int, 2 ** 31),
+    "user_id": (int, 2 ** 63),
+    "album_name": (str, 128),
+    "posts_count": (int, 2 ** 31),
+    "posts_size": (int, 2 ** 63),
+}
+
 
 def _validate_album_name(album_name: str) -> str:
     if len(album_name.strip()) < 2:
@@ -16,6 +30,20 @@ def _validate_album_summary(album_summary: str = None) -> str | None:
     return album_summary.strip() if album_summary else None
 
 
+def _validate_cursor_value(order_by: str, value) -> bool:
+    value_type, bound = ALBUMS_CURSOR_VALUES[order_by]
+    if value is None:
+        return True
+
+    elif type(value) is not value_type:
+        return False
+
+    elif value_type is str:
+        return len(value) <= bound
+
+    return -bound <= value < bound
+
+
 class AlbumInsertRequest(BaseModel):
     is_locked: bool
     album_name: str = Field(..., min_length=2, max_length=128)
@@ -71,13 +99,45 @@ class AlbumDeleteResponse(BaseModel):
 
 class AlbumsListRequest(BaseModel):
     album_name__ilike: Optional[str] = None
-    offset: int = Field(ge=0)
+    offset: int = Field(0, ge=0)
     limit: int = Field(ge=1, le=200)
     order_by: Literal["id", "created_date", "updated_date", "user_id",
                       "album_name", "posts_count", "posts_size"]
     order: Literal["asc", "desc"]
+    cursor: Optional[str] = Field(max_length=512, default=None)
+    count_estimated: bool = False
+
+    @model_validator(mode="after")
+    def validate_cursor(self) -> "AlbumsListRequest":
+        if self.cursor:
+            order_by, order, value, _ = CursorHelper.decode(self.cursor)
+            if (order_by, order) != (self.order_by, self.order):
+                raise ValueError
+            elif not _validate_cursor_value(order_by, value):
+                raise ValueError
+        return self
 
 
 class AlbumsListResponse(BaseModel):
     albums: List[AlbumSelectResponse]
     albums_count: int
+    albums_count_exact: bool = True
+    next_cursor: Optional[str] = None
+
+
+class AlbumsBatchRequest(BaseModel):
+    ids: str = Field(..., pattern=r"^\d+(,\d+)*$")
+
+    @field_validator("ids", mode="after")
+    def validate_ids(cls, ids: str) -> str:
+        if len(ids.split(",")) > ALBUMS_BATCH_LIMIT:
+            raise ValueError
+        return ids
+
+    @property
+    def album_ids(self) -> List[int]:
+        return [int(x) for x in self.ids.split(",")]
+
+
+class AlbumsBatchResponse(BaseModel):
+    albums: List[AlbumSelectResponse]
@@ -0,0 +1,74 @@
+"""Cache warm-up of hot entities at the worker startup."""
+
+from time import monotonic
+from app.cache import CacheBackend
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.managers.entity_manager import (
+    EntityManager, ORDER_BY, ORDER, DESC, OFFSET, LIMIT)
+from app.managers.cache_manager import CacheManager
+from app.models.user_models import User, UserRole
+from app.models.album_models import Album
+from app.config import get_config
+from app.log import get_log
+
+cfg = get_config()
+log = get_log()
+
+WARMUP_LOCK = "lock:warmup"
+WARMUP_BATCH_SIZE = 500
+WARMUP_SETS = {
+    "active_users": (User, {"is_active__eq": True, ORDER_BY: "updated_date",
+                            ORDER: DESC}),
+    "admins": (User, {"user_role__eq": UserRole.ADMIN,
+                      "is_active__eq": True, ORDER_BY: "id", ORDER: DESC}),
+    "recent_albums": (Album, {ORDER_BY: "updated_date", ORDER: DESC}),
+    "top_albums": (Album, {ORDER_BY: "posts_count", ORDER: DESC}),
+}
+
+
+async def warm_up(session: AsyncSession, cache: CacheBackend) -> int:
+    """
+    Preload hot sets of entities (WARMUP_SETS of the config) into the
+    cache with batched queries and pipelined writes. Only the worker
+    that acquires the lock does it, the lock expires with the time
+    budget, so the other workers start at once. Returns the number of
+    cached entities.
+    """
+    budget = cfg.WARMUP_BUDGET
+    if not await cache.set(WARMUP_LOCK, 1, nx=True, ex=budget):
+        return 0
+
+    entity_manager = EntityManager(session)
+    cache_manager = CacheManager(cache)
+    deadline, cached = monotonic() + budget, 0
+
+    for set_name in cfg.WARMUP_SETS:
+        if set_name not in WARMUP_SETS:
+            log.error("Warm-up set unknown; module=warmup; function=warm_up; "
+                      "set=%s;" % set_name)
+            continue
+
+        cls, kwargs = WARMUP_SETS[set_name]
+        set_cached = 0
+
+        while set_cached < cfg.WARMUP_LIMIT and monotonic() < deadline:
+            limit = min(WARMUP_BATCH_SIZE, cfg.WARMUP_LIMIT - set_cached)
+            entities = await entity_manager.select_all(
+                cls, **kwargs, **{OFFSET: set_cached, LIMIT: limit})
+            await cache_manager.set_many(entities)
+
+            set_cached += len(entities)
+            if len(entities) < limit:
+                break
+
+        cached += set_cached
+        log.info("Warm-up progress; module=warmup; function=warm_up; "
+                 "set=%s; entities=%s; elapsed=%.3f;" % (
+                     set_name, set_cached, budget - deadline + monotonic()))
+
+        if monotonic() >= deadline:
+            log.error("Warm-up budget exceeded; module=warmup; "
+                      "function=warm_up; budget=%s;" % budget)
+            break
+
+    return cached
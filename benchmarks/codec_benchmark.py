@@ -0,0 +1,45 @@
+"""
+Compare cache codecs: bytes per entry and encode/decode time.
+Usage: python3 -m benchmarks.codec_benchmark
+"""
+
+import timeit
+from app.helpers.codec_helper import ColumnCodec, SerializerCodec
+from app.models.user_models import User, UserRole
+from app.models.album_models import Album
+
+ITERATIONS = 10000
+CODECS = [SerializerCodec, ColumnCodec]
+
+
+def _create_entities() -> list:
+    """Create user and album entities filled like the real ones."""
+    user = User(UserRole.ADMIN, "dummy", "password", "first", "last",
+                is_active=True, user_summary="x" * 512)
+    user.id, user.created_date, user.updated_date = 1, 1, 1
+
+    album = Album(user.id, False, "album", album_summary="x" * 255)
+    album.id, album.created_date, album.updated_date = 1, 1, 1
+    album.album_user = user
+    return [user, album]
+
+
+def main():
+    for entity in _create_entities():
+        cls = type(entity)
+        for codec in CODECS:
+            data = codec.encode(entity)
+            encode_time = timeit.timeit(
+                lambda: codec.encode(entity), number=ITERATIONS)
+            decode_time = timeit.timeit(
+                lambda: codec.decode(cls, data), number=ITERATIONS)
+
+            print("table=%s; codec=%s; bytes=%s; encode_us=%.2f; "
+                  "decode_us=%.2f;" % (
+                      cls.__tablename__, codec.__name__, len(data),
+                      encode_time / ITERATIONS * 1e6,
+                      decode_time / ITERATIONS * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import unittest
+from pydantic import ValidationError
+from app.helpers.cursor_helper import CursorHelper
+from app.schemas.album_schemas import AlbumsListRequest
+
+
+class AlbumsListRequestTestCase(unittest.TestCase):
+    """Test case for AlbumsListRequest schema."""
+
+    def _create(self, order_by: str, value):
+        """Create the request with a cursor of the value."""
+        cursor = CursorHelper.encode(order_by, "asc", value, 123)
+        return AlbumsListRequest(limit=10, order_by=order_by, order="asc",
+                                 cursor=cursor)
+
+    def test__validate_cursor(self):
+        """Test cursors with values of the sort column type."""
+        for order_by, value in [("id", 123), ("posts_count", 5),
+                                ("album_name", "dummy"),
+                                ("user_id", None)]:
+            self.assertIsNotNone(self._create(order_by, value).cursor)
+
+    def test__validate_cursor_order(self):
+        """Test cursor of another sort column."""
+        cursor = CursorHelper.encode("id", "asc", 123, 123)
+        with self.assertRaises(ValidationError):
+            AlbumsListRequest(limit=10, order_by="posts_count", order="asc",
+                              cursor=cursor)
+
+    def test__validate_cursor_value(self):
+        """Test cursors with values not matching the sort column."""
+        for order_by, value in [("posts_count", "5"), ("posts_count", 5.5),
+                                ("posts_count", True), ("album_name", 5),
+                                ("posts_count", 2 ** 31),
+                                ("created_date", -2 ** 31 - 1),
+                                ("album_name", "a" * 129)]:
+            with self.assertRaises(ValidationError):
+                self._create(order_by, value)
+
+    def test__validate_cursor_id(self):
+        """Test cursors with an oversized or boolean last id."""
+        for obj_id in [2 ** 63, 2 ** 64 - 1, True]:
+            cursor = CursorHelper.encode("id", "asc", 123, obj_id)
+            with self.assertRaises(ValidationError):
+                AlbumsListRequest(limit=10, order_by="id", order="asc",
+                                  cursor=cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
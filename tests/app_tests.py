@@ -0,0 +1,70 @@
+import asyncio
+import asynctest
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+class AfterStartupTestCase(asynctest.TestCase):
+    """Test case for the startup of the worker."""
+
+    @patch("app.app.Hook")
+    @patch("app.app.warm_up")
+    @patch("app.app.sessionmanager")
+    @patch("app.app.cfg")
+    async def test__after_startup_warm_up_error(self, cfg_mock,
+                                                sessionmanager_mock,
+                                                warm_up_mock, hook_mock):
+        """Test startup hooks are executed when the warm-up fails."""
+        from app.app import after_startup
+        from app.hooks import H
+
+        cfg_mock.WARMUP_ENABLED = True
+        cfg_mock.WARMUP_BUDGET = 10
+        warmup_session = AsyncMock()
+        sessionmanager_mock.async_sessionmaker = MagicMock(
+            return_value=warmup_session)
+        sessionmanager_mock.get_session.return_value = AsyncMock()
+        warm_up_mock.side_effect = Exception("dummy")
+        hook_mock.return_value.execute = AsyncMock()
+
+        with patch("app.app.log") as log_mock:
+            await after_startup()
+            log_mock.error.assert_called_once()
+
+        warmup_session.close.assert_called_once()
+        hook_mock.return_value.execute.assert_called_once_with(
+            H.AFTER_STARTUP)
+
+    @patch("app.app.warm_up")
+    @patch("app.app.sessionmanager")
+    @patch("app.app.cfg")
+    async def test__warm_up_cache_budget(self, cfg_mock, sessionmanager_mock,
+                                         warm_up_mock):
+        """Test warm-up is cancelled when the time budget runs out."""
+        from app.app import warm_up_cache
+
+        cfg_mock.WARMUP_BUDGET = 0.01
+        warmup_session = AsyncMock()
+        sessionmanager_mock.async_sessionmaker = MagicMock(
+            return_value=warmup_session)
+        cancelled = asyncio.Event()
+
+        async def slow_warm_up(*args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        warm_up_mock.side_effect = slow_warm_up
+
+        with patch("app.app.log") as log_mock:
+            await warm_up_cache()
+            log_mock.error.assert_called_once()
+
+        self.assertTrue(cancelled.is_set())
+        warmup_session.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
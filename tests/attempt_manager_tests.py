@@ -0,0 +1,65 @@
+import asynctest
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+
+
+class AttemptManagerTestCase(asynctest.TestCase):
+    """Test case for AttemptManager class."""
+
+    async def setUp(self):
+        """Set up the test case environment."""
+        from app.managers.attempt_manager import AttemptManager
+
+        self.cache_mock = MagicMock(delete=AsyncMock())
+        self.script_mock = AsyncMock()
+        self.cache_mock.register_script.return_value = self.script_mock
+        self.attempt_manager = AttemptManager(self.cache_mock)
+
+    async def tearDown(self):
+        """Clean up the test case environment."""
+        del self.cache_mock
+        del self.script_mock
+        del self.attempt_manager
+
+    async def test__init(self):
+        """Test AttemptManager initialization."""
+        from app.managers.attempt_manager import INCREMENT_SCRIPT
+
+        self.assertEqual(self.attempt_manager.cache, self.cache_mock)
+        self.assertEqual(self.attempt_manager.increment_script,
+                         self.script_mock)
+        self.cache_mock.register_script.assert_called_once_with(
+            INCREMENT_SCRIPT)
+
+    async def test__get_key(self):
+        """Test _get_key method of AttemptManager."""
+        result = self.attempt_manager._get_key("password", 123)
+        self.assertEqual(result, "attempts:password:123")
+
+    async def test__attempt_manager_increment(self):
+        """Test increment method of AttemptManager below the limit."""
+        self.script_mock.return_value = 2
+
+        result = await self.attempt_manager.increment("password", 123, 5, 60)
+        self.assertFalse(result)
+
+        self.script_mock.assert_called_once_with(
+            keys=["attempts:password:123"], args=[5, 60])
+
+    async def test__attempt_manager_increment_limit(self):
+        """Test increment method of AttemptManager at the limit."""
+        self.script_mock.return_value = 0
+
+        result = await self.attempt_manager.increment("mfa", 123, 5, 60)
+        self.assertTrue(result)
+
+    async def test__attempt_manager_reset(self):
+        """Test reset method of AttemptManager."""
+        result = await self.attempt_manager.reset("mfa", 123)
+        self.assertIsNone(result)
+
+        self.cache_mock.delete.assert_called_once_with("attempts:mfa:123")
+
+
+if __name__ == "__main__":
+    unittest.main()
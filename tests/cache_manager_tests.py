@@ -3,6 +3,12 @@ import unittest
 from unittest.mock import MagicMock, AsyncMock, patch, call
 
 
+async def _aiter(items: list):
+    """Async iterator over items (mimics redis scan_iter)."""
+    for item in items:
+        yield item
+
+
 class CacheManagerTestCase(asynctest.TestCase):
     """Test case for CacheManager class."""
 
@@ -20,7 +26,11 @@ class CacheManagerTestCase(asynctest.TestCase):
 
     async def test__init(self):
         """Test CacheManager initialization."""
+        from app.helpers.codec_helper import ColumnCodec
+
         self.assertEqual(self.cache_manager.cache, self.cache_mock)
+        self.assertEqual(self.cache_manager.codec, ColumnCodec)
+        self.assertIsNone(self.cache_manager.local_cache)
 
     async def test__get_key_int(self):
         """Test _get_key method with integer id."""
@@ -36,41 +46,349 @@ class CacheManagerTestCase(asynctest.TestCase):
         result = self.cache_manager._get_key(dummy_mock, "*")
         self.assertEqual(result, "dummies:*")
 
+    async def test__get_index_keys(self):
+        """Test _get_index_keys method of CacheManager."""
+        dummy_mock = MagicMock(__tablename__="dummies", dummy_name="dummy",
+                               dummy_code=None,
+                               _cache_keys=("dummy_name", "dummy_code"))
+
+        result = self.cache_manager._get_index_keys(dummy_mock)
+        self.assertListEqual(result, ["index:dummies:dummy_name:dummy"])
+
+    @patch("app.managers.cache_manager.inspect")
+    async def test__get_renamed_index_keys(self, inspect_mock):
+        """Test _get_renamed_index_keys method of CacheManager."""
+        dummy_mock = MagicMock(__tablename__="dummies",
+                               _cache_keys=("dummy_name",))
+        history_mock = MagicMock(deleted=["old"])
+        inspect_mock.return_value.attrs = {
+            "dummy_name": MagicMock(history=history_mock)}
+
+        result = self.cache_manager._get_renamed_index_keys(dummy_mock)
+        self.assertListEqual(result, ["index:dummies:dummy_name:old"])
+
+    async def test__get_policy_default(self):
+        """Test _get_policy method without declared policy."""
+        from app.managers.cache_manager import DEFAULT_POLICY
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+
+        result = self.cache_manager._get_policy(dummy_class_mock)
+        self.assertEqual(result, DEFAULT_POLICY)
+
+    @patch("app.managers.cache_manager.cfg")
+    async def test__get_expire_default(self, cfg_mock):
+        """Test _get_expire method without declared policy."""
+        cfg_mock.REDIS_EXPIRE = 3600
+        cfg_mock.REDIS_COMPRESS_THRESHOLD = 0
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+
+        result = self.cache_manager._get_expire(dummy_class_mock)
+        self.assertEqual(result, 3600)
+
+    @patch("app.managers.cache_manager.random")
+    async def test__get_expire_jitter(self, random_mock):
+        """Test _get_expire method spreads TTL by the jitter."""
+        from app.managers.cache_manager import CachePolicy
+
+        dummy_class_mock = MagicMock(
+            __tablename__="dummies",
+            _cache_policy=CachePolicy(expire=1000, jitter=10))
+
+        random_mock.return_value = 0.0
+        self.assertEqual(self.cache_manager._get_expire(dummy_class_mock), 900)
+
+        random_mock.return_value = 0.5
+        self.assertEqual(
+            self.cache_manager._get_expire(dummy_class_mock), 1000)
+
+        random_mock.return_value = 0.99
+        self.assertEqual(self.cache_manager._get_expire(dummy_class_mock), 1098)
+
+    async def test__cache_manager_get_sliding(self):
+        """Test get method of CacheManager with sliding policy."""
+        from app.managers.cache_manager import CachePolicy
+
+        dummy_class_mock = MagicMock(
+            __tablename__="dummies",
+            _cache_policy=CachePolicy(expire=1000, sliding=True))
+        self.cache_manager.codec = MagicMock()
+        self.cache_mock.getex.return_value = b"dummy"
+
+        result = await self.cache_manager.get(dummy_class_mock, 123,
+                                              early_refresh=True)
+        self.assertEqual(result, self.cache_manager.codec.decode.return_value)
+
+        self.cache_mock.getex.assert_called_once_with("dummies:123", ex=1000)
+        self.cache_mock.get.assert_not_called()
+        self.cache_mock.pipeline.assert_not_called()
+
+    async def test__cache_manager_get_sliding_tombstone(self):
+        """Test get method with sliding policy keeps tombstone TTL."""
+        from app.managers.cache_manager import (
+            CachePolicy, TOMBSTONE, TOMBSTONE_EXPIRE)
+
+        dummy_class_mock = MagicMock(
+            __tablename__="dummies",
+            _cache_policy=CachePolicy(expire=1000, sliding=True))
+        self.cache_mock.getex.return_value = TOMBSTONE
+
+        result = await self.cache_manager.get(dummy_class_mock, 123)
+        self.assertIs(result, False)
+
+        self.cache_mock.expire.assert_called_once_with(
+            "dummies:123", TOMBSTONE_EXPIRE)
+
+    @patch("app.managers.cache_manager.cfg")
+    async def test__encode_compressed(self, cfg_mock):
+        """Test _encode method compresses values above the threshold."""
+        import zlib
+        from app.managers.cache_manager import COMPRESSED, compression_stats
+
+        cfg_mock.REDIS_COMPRESS_THRESHOLD = 16
+        cfg_mock.REDIS_COMPRESS_LEVEL = 1
+        dummy_mock = MagicMock(__tablename__="compressed_dummies")
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.codec.encode.return_value = b"dummy" * 10
+
+        result = self.cache_manager._encode(dummy_mock)
+        self.assertEqual(result[:1], COMPRESSED)
+        self.assertEqual(zlib.decompress(result[1:]), b"dummy" * 10)
+
+        stats = compression_stats["compressed_dummies"]
+        self.assertEqual(stats["compressed"], 1)
+        self.assertEqual(stats["raw_bytes"], 50)
+        self.assertEqual(stats["compressed_bytes"], len(result))
+
+    @patch("app.managers.cache_manager.cfg")
+    async def test__encode_uncompressed(self, cfg_mock):
+        """Test _encode method keeps values below the threshold."""
+        cfg_mock.REDIS_COMPRESS_THRESHOLD = 16
+        dummy_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.codec.encode.return_value = b"dummy"
+
+        result = self.cache_manager._encode(dummy_mock)
+        self.assertEqual(result, b"dummy")
+
+    async def test__decode_compressed(self):
+        """Test _decode method decompresses marked values."""
+        import zlib
+        from app.managers.cache_manager import COMPRESSED
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+
+        result = self.cache_manager._decode(
+            dummy_class_mock, COMPRESSED + zlib.compress(b"[1,2,3]"))
+        self.assertEqual(result, self.cache_manager.codec.decode.return_value)
+
+        self.cache_manager.codec.decode.assert_called_once_with(
+            dummy_class_mock, b"[1,2,3]")
+
+    async def test__decode_uncompressed(self):
+        """Test _decode method passes plain values to the codec."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+
+        self.cache_manager._decode(dummy_class_mock, b"[1,2,3]")
+        self.cache_manager.codec.decode.assert_called_once_with(
+            dummy_class_mock, b"[1,2,3]")
+
+    async def test__get_compression_stats(self):
+        """Test get_compression_stats reports ratio and CPU cost."""
+        from app.managers.cache_manager import (
+            compression_stats, get_compression_stats)
+
+        compression_stats["stats_dummies"].update({
+            "compressed": 2, "raw_bytes": 1000, "compressed_bytes": 250,
+            "compress_time": 0.0001})
+
+        result = get_compression_stats()["stats_dummies"]
+        self.assertDictEqual(result, {
+            "compressed": 2, "decompressed": 0, "ratio": 0.25,
+            "compress_us": 50.0, "decompress_us": None})
+
     @patch("app.managers.cache_manager.cfg")
-    @patch("app.managers.cache_manager.dumps")
-    async def test__cache_manager_set(self, dumps_mock, cfg_mock):
+    async def test__cache_manager_set(self, cfg_mock):
         """Test set method of CacheManager."""
-        dummy_mock = MagicMock(__tablename__="dummies", id=123)
+        cfg_mock.REDIS_EXPIRE = 3600
+        cfg_mock.REDIS_COMPRESS_THRESHOLD = 0
+        dummy_mock = MagicMock(__tablename__="dummies", id=123,
+                               dummy_name="dummy", _cache_keys=("dummy_name",))
+        self.cache_manager.codec = MagicMock()
+        pipe_mock = MagicMock(execute=AsyncMock())
+        self.cache_mock.pipeline = MagicMock(return_value=pipe_mock)
 
         result = await self.cache_manager.set(dummy_mock)
         self.assertIsNone(result)
 
-        dumps_mock.assert_called_once()
-        dumps_mock.assert_called_with(dummy_mock)
+        self.cache_manager.codec.encode.assert_called_once()
+        self.cache_manager.codec.encode.assert_called_with(dummy_mock)
 
-        self.cache_mock.set.assert_called_once()
-        self.cache_mock.set.assert_called_with(
-            "dummies:123", dumps_mock.return_value, ex=cfg_mock.REDIS_EXPIRE)
+        self.cache_mock.pipeline.assert_called_with(transaction=False)
+        self.assertListEqual(pipe_mock.set.call_args_list, [
+            call("dummies:123", self.cache_manager.codec.encode.return_value,
+                 ex=3600),
+            call("index:dummies:dummy_name:dummy", 123,
+                 ex=3600)])
+        pipe_mock.execute.assert_awaited_once()
+
+    @patch("app.managers.cache_manager.cfg")
+    async def test__cache_manager_set_many(self, cfg_mock):
+        """Test set_many method of CacheManager."""
+        cfg_mock.REDIS_EXPIRE = 3600
+        cfg_mock.REDIS_COMPRESS_THRESHOLD = 0
+        dummy_1 = MagicMock(__tablename__="dummies", id=1)
+        dummy_2 = MagicMock(__tablename__="dummies", id=2)
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.codec.encode.side_effect = [b"dummy_1", b"dummy_2"]
+        pipe_mock = MagicMock(execute=AsyncMock())
+        self.cache_mock.pipeline = MagicMock(return_value=pipe_mock)
+
+        result = await self.cache_manager.set_many([dummy_1, dummy_2])
+        self.assertIsNone(result)
+
+        self.cache_mock.pipeline.assert_called_once()
+        self.cache_mock.pipeline.assert_called_with(transaction=False)
+
+        self.assertListEqual(pipe_mock.set.call_args_list, [
+            call("dummies:1", b"dummy_1", ex=3600),
+            call("dummies:2", b"dummy_2", ex=3600)])
+        pipe_mock.execute.assert_awaited_once()
+        self.cache_mock.set.assert_not_called()
+
+    async def test__cache_manager_set_many_empty(self):
+        """Test set_many method of CacheManager with no entities."""
+        self.cache_mock.pipeline = MagicMock()
+
+        result = await self.cache_manager.set_many([])
+        self.assertIsNone(result)
+
+        self.cache_mock.pipeline.assert_not_called()
 
-    @patch("app.managers.cache_manager.loads")
-    async def test__cache_manager_get(self, loads_mock):
+    async def test__cache_manager_get(self):
         """Test get method of CacheManager."""
         dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
 
         result = await self.cache_manager.get(dummy_class_mock, 123)
-        self.assertEqual(result, loads_mock.return_value)
+        self.assertEqual(result, self.cache_manager.codec.decode.return_value)
 
         self.cache_mock.get.assert_called_once()
         self.cache_mock.get.assert_called_with("dummies:123")
 
-        loads_mock.assert_called_once()
-        loads_mock.assert_called_with(self.cache_mock.get.return_value)
+        self.cache_manager.codec.decode.assert_called_once()
+        self.cache_manager.codec.decode.assert_called_with(
+            dummy_class_mock, self.cache_mock.get.return_value)
+
+    async def test__cache_manager_get_early_refresh(self):
+        """Test get method of CacheManager with early refresh."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+        pipe_mock = MagicMock(execute=AsyncMock(
+            return_value=[b"dummy", 60000]))
+        self.cache_mock.pipeline = MagicMock(return_value=pipe_mock)
+
+        result = await self.cache_manager.get(dummy_class_mock, 123,
+                                              early_refresh=True)
+        self.assertEqual(result, self.cache_manager.codec.decode.return_value)
+
+        pipe_mock.get.assert_called_with("dummies:123")
+        pipe_mock.pttl.assert_called_with("dummies:123")
+        self.cache_mock.get.assert_not_called()
+
+    @patch("app.managers.cache_manager.random")
+    async def test__cache_manager_get_early_refresh_expiring(self,
+                                                             random_mock):
+        """Test get method of CacheManager reports expiring key missed."""
+        random_mock.return_value = 0.0001
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+        pipe_mock = MagicMock(execute=AsyncMock(return_value=[b"dummy", 10]))
+        self.cache_mock.pipeline = MagicMock(return_value=pipe_mock)
+
+        result = await self.cache_manager.get(dummy_class_mock, 123,
+                                              early_refresh=True)
+        self.assertIsNone(result)
+
+        self.cache_manager.codec.decode.assert_not_called()
+
+    @patch("app.managers.cache_manager.random")
+    async def test__cache_manager_expires_early(self, random_mock):
+        """Test _expires_early method of CacheManager."""
+        random_mock.return_value = 0.5
+
+        self.assertTrue(self.cache_manager._expires_early(1))
+        self.assertFalse(self.cache_manager._expires_early(60000))
+        self.assertFalse(self.cache_manager._expires_early(-1))
+
+    async def test__cache_manager_lock(self):
+        """Test lock method of CacheManager."""
+        from app.managers.cache_manager import LOCK_EXPIRE
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.set.return_value = None
+
+        result = await self.cache_manager.lock(dummy_class_mock, 123)
+        self.assertIsNone(result)
+
+        self.cache_mock.set.assert_called_once()
+        key, token = self.cache_mock.set.call_args.args
+        self.assertEqual(key, "lock:dummies:123")
+        self.assertEqual(len(token), 32)
+        self.assertDictEqual(self.cache_mock.set.call_args.kwargs,
+                             {"nx": True, "px": LOCK_EXPIRE})
+
+    async def test__cache_manager_lock_acquired(self):
+        """Test lock method of CacheManager returns a random token."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.set.return_value = True
+
+        first = await self.cache_manager.lock(dummy_class_mock, 123)
+        second = await self.cache_manager.lock(dummy_class_mock, 123)
+        self.assertEqual(first, self.cache_mock.set.call_args_list[0].args[1])
+        self.assertNotEqual(first, second)
+
+    async def test__cache_manager_unlock(self):
+        """Test unlock method of CacheManager."""
+        from app.managers.cache_manager import UNLOCK_SCRIPT
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        script_mock = AsyncMock()
+        self.cache_mock.register_script = MagicMock(return_value=script_mock)
+
+        result = await self.cache_manager.unlock(dummy_class_mock, 123, "abc")
+        self.assertIsNone(result)
+
+        self.cache_mock.register_script.assert_called_once_with(UNLOCK_SCRIPT)
+        script_mock.assert_awaited_once_with(
+            keys=["lock:dummies:123"], args=["abc"])
+        self.cache_mock.delete.assert_not_called()
+
+    async def test__cache_manager_unlock_memory(self):
+        """Test unlock keeps the lock taken by another worker."""
+        from app.memory_cache import MemoryCache
+        from app.managers.cache_manager import CacheManager
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        cache_manager = CacheManager(MemoryCache(10))
+
+        token = await cache_manager.lock(dummy_class_mock, 123)
+        await cache_manager.cache.delete("lock:dummies:123")
+        other = await cache_manager.lock(dummy_class_mock, 123)
 
-    @patch("app.managers.cache_manager.loads")
-    async def test__cache_manager_get_none(self, loads_mock):
+        await cache_manager.unlock(dummy_class_mock, 123, token)
+        self.assertIsNone(await cache_manager.lock(dummy_class_mock, 123))
+
+        await cache_manager.unlock(dummy_class_mock, 123, other)
+        self.assertIsNotNone(await cache_manager.lock(dummy_class_mock, 123))
+
+    async def test__cache_manager_get_none(self):
         """Test get method of CacheManager when no data is found."""
         self.cache_mock.get.return_value = None
         dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
 
         result = await self.cache_manager.get(dummy_class_mock, 123)
         self.assertIsNone(result)
@@ -78,7 +396,128 @@ class CacheManagerTestCase(asynctest.TestCase):
         self.cache_mock.get.assert_called_once()
         self.cache_mock.get.assert_called_with("dummies:123")
 
-        loads_mock.assert_not_called()
+        self.cache_manager.codec.decode.assert_not_called()
+
+    async def test__cache_manager_set_local_cache(self):
+        """Test set method of CacheManager fills the local cache."""
+        dummy_mock = MagicMock(__tablename__="dummies", id=123)
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.local_cache = MagicMock()
+        self.cache_mock.pipeline = MagicMock(
+            return_value=MagicMock(execute=AsyncMock()))
+
+        await self.cache_manager.set(dummy_mock)
+
+        self.cache_manager.local_cache.set.assert_called_once()
+        self.cache_manager.local_cache.set.assert_called_with(
+            "dummies:123", self.cache_manager.codec.encode.return_value)
+
+    async def test__cache_manager_get_local_cache_hit(self):
+        """Test get method of CacheManager when the local cache hits."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.local_cache = MagicMock()
+
+        result = await self.cache_manager.get(dummy_class_mock, 123)
+        self.assertEqual(result, self.cache_manager.codec.decode.return_value)
+
+        self.cache_manager.local_cache.get.assert_called_once()
+        self.cache_manager.local_cache.get.assert_called_with("dummies:123")
+        self.cache_mock.get.assert_not_called()
+
+        self.cache_manager.codec.decode.assert_called_with(
+            dummy_class_mock, self.cache_manager.local_cache.get.return_value)
+
+    async def test__cache_manager_get_local_cache_miss(self):
+        """Test get method of CacheManager when the local cache misses."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.local_cache = MagicMock()
+        self.cache_manager.local_cache.get.return_value = None
+
+        result = await self.cache_manager.get(dummy_class_mock, 123)
+        self.assertEqual(result, self.cache_manager.codec.decode.return_value)
+
+        self.cache_mock.get.assert_called_once()
+        self.cache_mock.get.assert_called_with("dummies:123")
+
+        self.cache_manager.local_cache.set.assert_called_once()
+        self.cache_manager.local_cache.set.assert_called_with(
+            "dummies:123", self.cache_mock.get.return_value,
+            self.cache_manager.local_cache.version)
+
+    async def test__cache_manager_get_tombstone(self):
+        """Test get method of CacheManager when entity is missing."""
+        from app.managers.cache_manager import TOMBSTONE, cache_stats
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.get.return_value = TOMBSTONE
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.local_cache = MagicMock()
+        self.cache_manager.local_cache.get.return_value = None
+        tombstone_hits = cache_stats["tombstone_hits"]
+
+        result = await self.cache_manager.get(dummy_class_mock, 123)
+        self.assertIs(result, False)
+        self.assertEqual(cache_stats["tombstone_hits"], tombstone_hits + 1)
+
+        self.cache_manager.codec.decode.assert_not_called()
+        self.cache_manager.local_cache.set.assert_not_called()
+
+    async def test__cache_manager_set_missing(self):
+        """Test set_missing method of CacheManager."""
+        from app.managers.cache_manager import (
+            TOMBSTONE, TOMBSTONE_EXPIRE, cache_stats)
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        pipe_mock = MagicMock(execute=AsyncMock())
+        self.cache_mock.pipeline = MagicMock(return_value=pipe_mock)
+        tombstone_sets = cache_stats["tombstone_sets"]
+
+        result = await self.cache_manager.set_missing(dummy_class_mock,
+                                                      [1, 2])
+        self.assertIsNone(result)
+        self.assertEqual(cache_stats["tombstone_sets"], tombstone_sets + 2)
+
+        self.assertListEqual(pipe_mock.set.call_args_list, [
+            call("dummies:1", TOMBSTONE, ex=TOMBSTONE_EXPIRE),
+            call("dummies:2", TOMBSTONE, ex=TOMBSTONE_EXPIRE)])
+        pipe_mock.execute.assert_awaited_once()
+
+    async def test__cache_manager_get_many(self):
+        """Test get_many method of CacheManager."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        dummy_1, dummy_3 = MagicMock(), MagicMock()
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.codec.decode.side_effect = [dummy_1, dummy_3]
+        self.cache_manager.local_cache = MagicMock()
+        self.cache_manager.local_cache.get.side_effect = [b"dummy_1", None,
+                                                          None, None]
+        self.cache_mock.mget.return_value = [None, b"dummy_3", b"\x00"]
+
+        result = await self.cache_manager.get_many(dummy_class_mock,
+                                                   [1, 2, 3, 4])
+        self.assertDictEqual(result, {1: dummy_1, 3: dummy_3, 4: False})
+
+        self.cache_mock.mget.assert_called_once()
+        self.cache_mock.mget.assert_called_with(
+            ["dummies:2", "dummies:3", "dummies:4"])
+
+        self.assertListEqual(self.cache_manager.codec.decode.call_args_list, [
+            call(dummy_class_mock, b"dummy_1"),
+            call(dummy_class_mock, b"dummy_3")])
+
+    async def test__cache_manager_get_many_local_cache_hits(self):
+        """Test get_many method of CacheManager without MGET."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.codec = MagicMock()
+        self.cache_manager.local_cache = MagicMock()
+
+        result = await self.cache_manager.get_many(dummy_class_mock, [1])
+        self.assertDictEqual(
+            result, {1: self.cache_manager.codec.decode.return_value})
+
+        self.cache_mock.mget.assert_not_called()
 
     async def test__cache_manager_delete(self):
         """Test delete method of CacheManager."""
@@ -90,21 +529,321 @@ class CacheManagerTestCase(asynctest.TestCase):
         self.cache_mock.delete.assert_called_once()
         self.cache_mock.delete.assert_called_with("dummies:123")
 
+    async def test__cache_manager_delete_index_keys(self):
+        """Test delete method of CacheManager drops index keys."""
+        dummy_mock = MagicMock(__tablename__="dummies", id=123,
+                               dummy_name="dummy", _cache_keys=("dummy_name",))
+
+        await self.cache_manager.delete(dummy_mock)
+
+        self.cache_mock.delete.assert_called_once()
+        self.cache_mock.delete.assert_called_with(
+            "dummies:123", "index:dummies:dummy_name:dummy")
+
+    async def test__cache_manager_get_index(self):
+        """Test get_index method of CacheManager."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.get.return_value = b"123"
+
+        result = await self.cache_manager.get_index(dummy_class_mock,
+                                                    "dummy_name", "dummy")
+        self.assertEqual(result, 123)
+
+        self.cache_mock.get.assert_called_once()
+        self.cache_mock.get.assert_called_with(
+            "index:dummies:dummy_name:dummy")
+
+    async def test__cache_manager_get_index_none(self):
+        """Test get_index method of CacheManager when key is missing."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.get.return_value = None
+
+        result = await self.cache_manager.get_index(dummy_class_mock,
+                                                    "dummy_name", "dummy")
+        self.assertIsNone(result)
+
+    async def test__cache_manager_delete_index(self):
+        """Test delete_index method of CacheManager."""
+        await self.cache_manager.delete_index([])
+        self.cache_mock.delete.assert_not_called()
+
+        await self.cache_manager.delete_index(["index:dummies:name:dummy"])
+        self.cache_mock.delete.assert_called_once()
+        self.cache_mock.delete.assert_called_with("index:dummies:name:dummy")
+
+    async def test__cache_manager_delete_local_cache(self):
+        """Test delete method of CacheManager with the local cache."""
+        dummy_mock = MagicMock(__tablename__="dummies", id=123)
+        self.cache_manager.local_cache = MagicMock()
+
+        await self.cache_manager.delete(dummy_mock)
+
+        self.cache_manager.local_cache.delete.assert_called_once()
+        self.cache_manager.local_cache.delete.assert_called_with(
+            "dummies:123")
+
+    async def test__cache_manager_invalidate(self):
+        """Test invalidate method of CacheManager."""
+        from app.local_cache import INVALIDATE_CHANNEL
+
+        dummy_mock = MagicMock(__tablename__="dummies", id=123)
+        self.cache_manager.local_cache = MagicMock()
+
+        result = await self.cache_manager.invalidate(dummy_mock)
+        self.assertIsNone(result)
+
+        self.cache_mock.publish.assert_called_once()
+        self.cache_mock.publish.assert_called_with(
+            INVALIDATE_CHANNEL, "dummies:123")
+
+    async def test__cache_manager_delete_many(self):
+        """Test delete_many method of CacheManager."""
+        dummy_mocks = [
+            MagicMock(__tablename__="dummies", id=1, dummy_name="a",
+                      _cache_keys=("dummy_name",)),
+            MagicMock(__tablename__="dummies", id=2, dummy_name="b",
+                      _cache_keys=("dummy_name",))]
+        self.cache_manager.local_cache = MagicMock()
+
+        await self.cache_manager.delete_many(dummy_mocks)
+
+        self.cache_mock.delete.assert_called_once_with(
+            "dummies:1", "dummies:2", "index:dummies:dummy_name:a",
+            "index:dummies:dummy_name:b")
+        self.cache_manager.local_cache.delete.assert_has_calls([
+            call("dummies:1"), call("dummies:2")])
+
+    async def test__cache_manager_delete_many_empty(self):
+        """Test delete_many method of CacheManager without entities."""
+        await self.cache_manager.delete_many([])
+        self.cache_mock.delete.assert_not_called()
+
+    async def test__cache_manager_delete_ids(self):
+        """Test delete_ids method of CacheManager."""
+        from app.local_cache import INVALIDATE_CHANNEL
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.local_cache = MagicMock()
+        pipe_mock = MagicMock(execute=AsyncMock())
+        self.cache_mock.pipeline = MagicMock(return_value=pipe_mock)
+
+        await self.cache_manager.delete_ids(dummy_class_mock, [1, 2, 3],
+                                            batch_size=2)
+
+        self.assertListEqual(self.cache_mock.unlink.call_args_list, [
+            call("dummies:1", "dummies:2"), call("dummies:3")])
+        self.cache_manager.local_cache.delete.assert_has_calls([
+            call("dummies:1"), call("dummies:2"), call("dummies:3")])
+        pipe_mock.publish.assert_has_calls([
+            call(INVALIDATE_CHANNEL, "dummies:1"),
+            call(INVALIDATE_CHANNEL, "dummies:2"),
+            call(INVALIDATE_CHANNEL, "dummies:3")])
+        pipe_mock.execute.assert_awaited_once()
+
+    async def test__cache_manager_delete_ids_empty(self):
+        """Test delete_ids method of CacheManager without ids."""
+        self.cache_manager.local_cache = MagicMock()
+        self.cache_mock.pipeline = MagicMock()
+
+        await self.cache_manager.delete_ids(MagicMock(), [])
+
+        self.cache_mock.unlink.assert_not_called()
+        self.cache_mock.pipeline.assert_not_called()
+
+    async def test__cache_manager_invalidate_many(self):
+        """Test invalidate_many method of CacheManager."""
+        from app.local_cache import INVALIDATE_CHANNEL
+
+        dummy_mocks = [MagicMock(__tablename__="dummies", id=1),
+                       MagicMock(__tablename__="dummies", id=2)]
+        self.cache_manager.local_cache = MagicMock()
+        pipe_mock = MagicMock(execute=AsyncMock())
+        self.cache_mock.pipeline = MagicMock(return_value=pipe_mock)
+
+        await self.cache_manager.invalidate_many(dummy_mocks)
+
+        pipe_mock.publish.assert_has_calls([
+            call(INVALIDATE_CHANNEL, "dummies:1"),
+            call(INVALIDATE_CHANNEL, "dummies:2")])
+        pipe_mock.execute.assert_awaited_once()
+        self.cache_mock.publish.assert_not_called()
+
+    async def test__cache_manager_invalidate_many_no_local_cache(self):
+        """Test invalidate_many method of CacheManager without local cache."""
+        self.cache_mock.pipeline = MagicMock()
+
+        await self.cache_manager.invalidate_many([MagicMock(id=1)])
+        self.cache_mock.pipeline.assert_not_called()
+
+    async def test__cache_manager_invalidate_no_local_cache(self):
+        """Test invalidate method of CacheManager without local cache."""
+        dummy_mock = MagicMock(__tablename__="dummies", id=123)
+
+        result = await self.cache_manager.invalidate(dummy_mock)
+        self.assertIsNone(result)
+
+        self.cache_mock.publish.assert_not_called()
+
+    async def test__get_query_key(self):
+        """Test _get_query_key method does not depend on kwargs order."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+
+        result = self.cache_manager._get_query_key(
+            dummy_class_mock, "select_all", {"a": 1, "b": "2"})
+        self.assertTrue(result.startswith("query:dummies:select_all:"))
+        self.assertEqual(result, self.cache_manager._get_query_key(
+            dummy_class_mock, "select_all", {"b": "2", "a": 1}))
+        self.assertNotEqual(result, self.cache_manager._get_query_key(
+            dummy_class_mock, "select_all", {"a": 1, "b": "3"}))
+
+    async def test__cache_manager_get_query(self):
+        """Test get_query method of CacheManager."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.mget.return_value = [b"5", b"[5,[1,2]]"]
+
+        result = await self.cache_manager.get_query(
+            dummy_class_mock, "select_all", {"a": 1})
+        self.assertEqual(result, ([1, 2], 5))
+
+        self.cache_mock.mget.assert_called_once()
+        self.cache_mock.mget.assert_called_with(
+            "generation:dummies", self.cache_manager._get_query_key(
+                dummy_class_mock, "select_all", {"a": 1}))
+
+    async def test__cache_manager_get_query_outdated(self):
+        """Test get_query method of CacheManager for old generation."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.mget.return_value = [b"6", b"[5,[1,2]]"]
+
+        result = await self.cache_manager.get_query(
+            dummy_class_mock, "select_all", {"a": 1})
+        self.assertEqual(result, (None, 6))
+
+    async def test__cache_manager_get_query_none(self):
+        """Test get_query method of CacheManager when nothing cached."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.mget.return_value = [None, None]
+
+        result = await self.cache_manager.get_query(
+            dummy_class_mock, "count_all", {})
+        self.assertEqual(result, (None, 0))
+
+    @patch("app.managers.cache_manager.cfg")
+    async def test__cache_manager_set_query(self, cfg_mock):
+        """Test set_query method of CacheManager."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+
+        result = await self.cache_manager.set_query(
+            dummy_class_mock, "count_all", {"a": 1}, 123, 5)
+        self.assertIsNone(result)
+
+        self.cache_mock.set.assert_called_once()
+        self.cache_mock.set.assert_called_with(
+            self.cache_manager._get_query_key(
+                dummy_class_mock, "count_all", {"a": 1}),
+            b"[5,123]", ex=cfg_mock.REDIS_EXPIRE)
+
+    async def test__cache_manager_get_flag(self):
+        """Test get_flag method of CacheManager."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.local_cache = MagicMock()
+        self.cache_manager.local_cache.get.return_value = None
+        self.cache_mock.get.return_value = b"0"
+        key = self.cache_manager._get_flag_key(dummy_class_mock,
+                                               {"key__eq": "value"})
+
+        result = await self.cache_manager.get_flag(dummy_class_mock,
+                                                   {"key__eq": "value"})
+        self.assertIs(result, False)
+        self.assertTrue(key.startswith("flag:dummies:"))
+
+        self.cache_mock.get.assert_called_once_with(key)
+        self.cache_manager.local_cache.set.assert_called_once_with(
+            key, b"0", self.cache_manager.local_cache.version)
+
+    async def test__cache_manager_get_flag_none(self):
+        """Test get_flag method of CacheManager when it is missed."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.get.return_value = None
+
+        result = await self.cache_manager.get_flag(dummy_class_mock,
+                                                   {"key__eq": "value"})
+        self.assertIsNone(result)
+
+    async def test__cache_manager_set_flag(self):
+        """Test set_flag method of CacheManager."""
+        from app.managers.cache_manager import FLAG_EXPIRE
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        key = self.cache_manager._get_flag_key(dummy_class_mock,
+                                               {"key__eq": "value"})
+
+        result = await self.cache_manager.set_flag(
+            dummy_class_mock, {"key__eq": "value"}, True)
+        self.assertIsNone(result)
+
+        self.cache_mock.set.assert_called_once_with(key, b"1",
+                                                    ex=FLAG_EXPIRE)
+
+    async def test__cache_manager_delete_flags(self):
+        """Test delete_flags method of CacheManager."""
+        from app.local_cache import INVALIDATE_CHANNEL
+
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_manager.local_cache = MagicMock()
+        key = self.cache_manager._get_flag_key(dummy_class_mock,
+                                               {"key__eq": "value"})
+
+        await self.cache_manager.delete_flags(dummy_class_mock,
+                                              [{"key__eq": "value"}])
+
+        self.cache_mock.delete.assert_called_once_with(key)
+        self.cache_manager.local_cache.delete.assert_called_once_with(key)
+        self.cache_mock.publish.assert_called_once_with(
+            INVALIDATE_CHANNEL, key)
+
+    async def test__cache_manager_bump_generation(self):
+        """Test bump_generation method of CacheManager."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+
+        result = await self.cache_manager.bump_generation(dummy_class_mock)
+        self.assertIsNone(result)
+
+        self.cache_mock.incr.assert_called_once()
+        self.cache_mock.incr.assert_called_with("generation:dummies")
+
     async def test__cache_manager_delete_all(self):
         """Test delete_all method of CacheManager."""
         dummy_class_mock = MagicMock(__tablename__="dummies")
         key_1, key_2, key_3 = "dummies:1", "dummies:2", "dummies:3"
-        self.cache_mock.keys.return_value = [key_1, key_2, key_3]
+        self.cache_mock.scan_iter = MagicMock(
+            return_value=_aiter([key_1, key_2, key_3]))
+        self.cache_mock.unlink.side_effect = [2, 1]
 
-        result = await self.cache_manager.delete_all(dummy_class_mock)
-        self.assertIsNone(result)
+        result = await self.cache_manager.delete_all(
+            dummy_class_mock, batch_size=2)
+        self.assertEqual(result, 3)
+
+        self.cache_mock.keys.assert_not_called()
+        self.cache_mock.delete.assert_not_called()
+
+        self.cache_mock.scan_iter.assert_called_once()
+        self.cache_mock.scan_iter.assert_called_with(
+            match="dummies:*", count=2)
+
+        self.assertEqual(self.cache_mock.unlink.call_count, 2)
+        self.assertListEqual(self.cache_mock.unlink.call_args_list,
+                             [call(key_1, key_2), call(key_3)])
 
-        self.cache_mock.keys.assert_called_once()
-        self.cache_mock.keys.assert_called_with("dummies:*")
+    async def test__cache_manager_delete_all_empty(self):
+        """Test delete_all method of CacheManager when no keys found."""
+        dummy_class_mock = MagicMock(__tablename__="dummies")
+        self.cache_mock.scan_iter = MagicMock(return_value=_aiter([]))
+
+        result = await self.cache_manager.delete_all(dummy_class_mock)
+        self.assertEqual(result, 0)
 
-        self.assertEqual(self.cache_mock.delete.call_count, 3)
-        self.assertListEqual(self.cache_mock.delete.call_args_list,
-                             [call(key_1), call(key_2), call(key_3)])
+        self.cache_mock.unlink.assert_not_called()
 
 
 if __name__ == "__main__":
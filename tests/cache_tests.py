@@ -0,0 +1,106 @@
+import asynctest
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+
+class CachePoolTestCase(asynctest.TestCase):
+    """Test case for CachePool class."""
+
+    async def setUp(self):
+        """Set up the test case environment."""
+        from app.cache import CachePool
+        self.cachepool = CachePool()
+
+    async def tearDown(self):
+        """Clean up the test case environment."""
+        del self.cachepool
+
+    @patch("app.cache.cfg")
+    @patch("app.cache.redis")
+    async def test__open(self, redis_mock, cfg_mock):
+        """Test open method creates a pool and a client bound to it."""
+        self.cachepool.open()
+
+        redis_mock.BlockingConnectionPool.assert_called_once()
+        redis_mock.BlockingConnectionPool.assert_called_with(
+            host=cfg_mock.REDIS_HOST, port=cfg_mock.REDIS_PORT,
+            decode_responses=cfg_mock.REDIS_DECODE,
+            max_connections=cfg_mock.REDIS_MAX_CONNECTIONS,
+            timeout=cfg_mock.REDIS_POOL_TIMEOUT,
+            health_check_interval=cfg_mock.REDIS_HEALTH_CHECK_INTERVAL,
+            socket_timeout=cfg_mock.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=cfg_mock.REDIS_CONNECT_TIMEOUT)
+
+        redis_mock.Redis.assert_called_once()
+        redis_mock.Redis.assert_called_with(
+            connection_pool=redis_mock.BlockingConnectionPool.return_value)
+
+        self.assertEqual(self.cachepool.client, redis_mock.Redis.return_value)
+
+    @patch("app.cache.cfg")
+    @patch("app.cache.redis")
+    async def test__open_memory(self, redis_mock, cfg_mock):
+        """Test open method creates the in-process cache."""
+        from app.memory_cache import MemoryCache
+
+        cfg_mock.CACHE_BACKEND = "memory"
+        cfg_mock.CACHE_MEMORY_SIZE = 100
+        cfg_mock.UVICORN_WORKERS = 1
+
+        self.cachepool.open()
+        self.assertFalse(self.cachepool.is_shared)
+        self.assertIsInstance(self.cachepool.client, MemoryCache)
+        self.assertEqual(self.cachepool.client.maxsize, 100)
+        self.assertIsNone(self.cachepool.connection_pool)
+
+        redis_mock.BlockingConnectionPool.assert_not_called()
+        self.assertDictEqual(self.cachepool.stats(),
+                             {"size": 0, "maxsize": 100})
+
+    @patch("app.cache.cfg")
+    @patch("app.cache.redis")
+    async def test__open_memory_workers(self, redis_mock, cfg_mock):
+        """Test open method refuses the in-process cache for workers."""
+        cfg_mock.CACHE_BACKEND = "memory"
+        cfg_mock.UVICORN_WORKERS = 4
+
+        with self.assertRaises(ValueError):
+            self.cachepool.open()
+
+        self.assertIsNone(self.cachepool.client)
+        redis_mock.BlockingConnectionPool.assert_not_called()
+
+    async def test__close(self):
+        """Test close method closes the client and the pool."""
+        self.cachepool.client = AsyncMock()
+        self.cachepool.connection_pool = AsyncMock()
+
+        await self.cachepool.close()
+
+        self.cachepool.client.close.assert_called_once()
+        self.cachepool.connection_pool.disconnect.assert_called_once()
+
+    async def test__stats(self):
+        """Test stats method returns pool utilisation."""
+        self.cachepool.connection_pool = MagicMock(
+            max_connections=10, _in_use_connections={1, 2},
+            _available_connections=[3])
+
+        result = self.cachepool.stats()
+        self.assertDictEqual(result, {"max_connections": 10,
+                                      "in_use_connections": 2,
+                                      "idle_connections": 1})
+
+    async def test__get_cache(self):
+        """Test get_cache yields the shared client."""
+        from app.cache import get_cache, cachepool
+
+        cachepool.client = MagicMock()
+        async for result in get_cache():
+            self.assertEqual(result, cachepool.client)
+
+        cachepool.client = None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from app.helpers.codec_helper import ColumnCodec, SerializerCodec
+from app.models.user_models import User, UserRole
+from app.models.album_models import Album
+from sqlalchemy import inspect
+
+
+class CodecHelperTestCase(unittest.TestCase):
+    """Test case for cache codecs."""
+
+    def setUp(self):
+        """Set up the test case environment."""
+        self.user = User(UserRole.ADMIN, "dummy", "password", "first",
+                         "last", is_active=True, user_summary="summary")
+        self.user.id = 123
+        self.user.created_date = 1
+        self.user.updated_date = 2
+
+        self.album = Album(123, False, "album", album_summary="summary")
+        self.album.id = 456
+        self.album.created_date = 3
+        self.album.updated_date = 4
+
+    def tearDown(self):
+        """Clean up the test case environment."""
+        del self.user
+        del self.album
+
+    def test__column_codec_user(self):
+        """Test ColumnCodec round trip for user entity."""
+        data = ColumnCodec.encode(self.user)
+        self.assertTrue(isinstance(data, bytes))
+
+        result = ColumnCodec.decode(User, data)
+        self.assertTrue(isinstance(result, User))
+        self.assertEqual(result.to_dict(), self.user.to_dict())
+        self.assertEqual(result.user_role, UserRole.ADMIN)
+        self.assertEqual(result.jti, self.user.jti)
+        self.assertEqual(result.mfa_secret, self.user.mfa_secret)
+        self.assertTrue(inspect(result).detached)
+
+    def test__column_codec_album(self):
+        """Test ColumnCodec round trip for album entity."""
+        data = ColumnCodec.encode(self.album)
+
+        result = ColumnCodec.decode(Album, data)
+        self.assertTrue(isinstance(result, Album))
+        self.assertEqual(result.to_dict(), self.album.to_dict())
+        self.assertTrue(inspect(result).detached)
+
+    def test__column_codec_schema_mismatch(self):
+        """Test ColumnCodec treats foreign schema payload as a miss."""
+        data = ColumnCodec.encode(self.album)
+
+        result = ColumnCodec.decode(User, data)
+        self.assertIsNone(result)
+
+    def test__column_codec_smaller_than_serializer(self):
+        """Test ColumnCodec payload is smaller than serializer payload."""
+        column_data = ColumnCodec.encode(self.user)
+        serializer_data = SerializerCodec.encode(self.user)
+        self.assertLess(len(column_data), len(serializer_data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from app.helpers.cursor_helper import CursorHelper
+
+
+class CursorHelperTestCase(unittest.TestCase):
+    """Test case for CursorHelper class."""
+
+    def test__encode_decode(self):
+        """Test cursor round trip."""
+        cursor = CursorHelper.encode("album_name", "asc", "dummy", 123)
+        self.assertNotIn("=", cursor)
+        self.assertTupleEqual(CursorHelper.decode(cursor),
+                              ("album_name", "asc", "dummy", 123))
+
+    def test__decode_malformed(self):
+        """Test decode method with malformed cursors."""
+        for cursor in ["!!!", "bm90IGpzb24", "WzEsMl0",
+                       CursorHelper.encode("id", "asc", 1, 2)[:-4]]:
+            with self.assertRaises(ValueError):
+                CursorHelper.decode(cursor)
+
+    def test__decode_id_not_int(self):
+        """Test decode method when the id is not an integer."""
+        cursor = CursorHelper.encode("id", "asc", 1, "2")
+        with self.assertRaises(ValueError):
+            CursorHelper.decode(cursor)
+
+    def test__decode_id_out_of_range(self):
+        """Test decode method when the id is not a positive bigint."""
+        for obj_id in [2 ** 63, 2 ** 64 - 1, 0, -5, True]:
+            cursor = CursorHelper.encode("id", "asc", 1, obj_id)
+            with self.assertRaises(ValueError):
+                CursorHelper.decode(cursor)
+
+    def test__decode_value_not_scalar(self):
+        """Test decode method when the value is not a scalar."""
+        for value in [{"a": 1}, [1]]:
+            cursor = CursorHelper.encode("id", "asc", value, 2)
+            with self.assertRaises(ValueError):
+                CursorHelper.decode(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from app.database import upgrade_schema
+from app.models.user_models import User  # noqa: F401
+from app.models.album_models import Album  # noqa: F401
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Test case for the schema upgrade."""
+
+    def setUp(self):
+        """Set up the test case environment."""
+        self.conn = MagicMock()
+        self.conn.dialect = postgresql.dialect()
+
+    def tearDown(self):
+        """Clean up the test case environment."""
+        del self.conn
+
+    def _get_statements(self):
+        """Compile the executed statements."""
+        return [str(x.args[0].compile(dialect=self.conn.dialect))
+                for x in self.conn.execute.call_args_list]
+
+    @patch("app.database.inspect")
+    def test__upgrade_schema(self, inspect_mock):
+        """Test missing columns and indexes are added to existing tables."""
+        inspect_mock.return_value.has_table.side_effect = (
+            lambda x: x == "users")
+        inspect_mock.return_value.get_columns.return_value = [
+            {"name": x.name} for x in User.__table__.columns
+            if x.name != "jti_hash"]
+
+        upgrade_schema(self.conn)
+        statements = self._get_statements()
+
+        self.assertIn("ALTER TABLE users ADD COLUMN IF NOT EXISTS "
+                      "jti_hash VARCHAR(64)", statements)
+        self.assertIn("CREATE INDEX IF NOT EXISTS ix_users_active_admins "
+                      "ON users (id) WHERE user_role = 'ADMIN' AND "
+                      "is_active IS true", statements)
+        self.assertFalse([x for x in statements if "albums" in x])
+        self.assertEqual(len([x for x in statements if "ALTER" in x]), 1)
+
+    @patch("app.database.inspect")
+    def test__upgrade_schema_not_nullable(self, inspect_mock):
+        """Test not nullable columns are not added."""
+        inspect_mock.return_value.has_table.side_effect = (
+            lambda x: x == "users")
+        inspect_mock.return_value.get_columns.return_value = [
+            {"name": x.name} for x in User.__table__.columns
+            if x.name != "user_login"]
+
+        upgrade_schema(self.conn)
+        statements = self._get_statements()
+
+        self.assertFalse([x for x in statements if "ALTER" in x])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import asynctest
 import unittest
-from unittest.mock import MagicMock, AsyncMock, patch, call
+from unittest.mock import MagicMock, AsyncMock, patch
 
 
 class EntityManagerTestCase(asynctest.TestCase):
@@ -22,70 +22,61 @@ class EntityManagerTestCase(asynctest.TestCase):
         """Test EntityManager initialization."""
         self.assertEqual(self.entity_manager.session, self.session_mock)
 
-    @patch("app.managers.entity_manager.EntityManager._where")
-    @patch("app.managers.entity_manager.select")
-    async def test__exists_true(self, select_mock, where_mock):
+    async def test__exists_true(self):
         """Test exists method when entity exists."""
-        dummy_mock = MagicMock()
-        dummy_class_mock = MagicMock()
+        from app.models.album_models import Album
+
         async_result_mock = MagicMock()
-        async_result_mock.unique.return_value.scalars.return_value.one_or_none.return_value = dummy_mock # noqa E501
+        async_result_mock.scalar.return_value = True
         self.session_mock.execute.return_value = async_result_mock
-        kwargs = {"name__eq": "dummy"}
 
-        result = await self.entity_manager.exists(dummy_class_mock, **kwargs)
+        result = await self.entity_manager.exists(
+            Album, album_name__eq="dummy")
         self.assertTrue(result)
 
-        select_mock.assert_called_once()
-        select_mock.assert_called_with(dummy_class_mock)
-
-        where_mock.assert_called_once()
-        where_mock.assert_called_with(dummy_class_mock, **kwargs)
-
-        select_mock.return_value.where.assert_called_once()
-        select_mock.return_value.where.assert_called_with(
-            *where_mock.return_value)
-
-        select_mock.return_value.where.return_value.limit.assert_called_once()
-        select_mock.return_value.where.return_value.limit.assert_called_with(1)
-
         self.session_mock.execute.assert_called_once()
-        self.session_mock.execute.assert_called_with(
-            select_mock.return_value.where.return_value.limit.return_value)
+        query = str(self.session_mock.execute.call_args.args[0])
+        self.assertTrue(query.startswith("SELECT EXISTS (SELECT 1"))
+        self.assertIn("WHERE albums.album_name = :album_name_1", query)
+        self.assertNotIn("users", query)
 
-        async_result_mock.unique.return_value.scalars.return_value.one_or_none.assert_called_once() # noqa E501
-
-    @patch("app.managers.entity_manager.EntityManager._where")
-    @patch("app.managers.entity_manager.select")
-    async def test__exists_false(self, select_mock, where_mock):
+    async def test__exists_false(self):
         """Test exists method when entity does not exist."""
-        dummy_class_mock = MagicMock()
+        from app.models.album_models import Album
+
         async_result_mock = MagicMock()
-        async_result_mock.unique.return_value.scalars.return_value.one_or_none.return_value = None # noqa E501
+        async_result_mock.scalar.return_value = False
         self.session_mock.execute.return_value = async_result_mock
-        kwargs = {"name__eq": "dummy"}
 
-        result = await self.entity_manager.exists(dummy_class_mock, **kwargs)
+        result = await self.entity_manager.exists(
+            Album, album_name__eq="dummy")
         self.assertFalse(result)
 
-        select_mock.assert_called_once()
-        select_mock.assert_called_with(dummy_class_mock)
+    async def test__exists_many(self):
+        """Test exists_many method checks conditions in one query."""
+        from app.models.album_models import Album
+        from app.models.user_models import User
 
-        where_mock.assert_called_once()
-        where_mock.assert_called_with(dummy_class_mock, **kwargs)
-
-        select_mock.return_value.where.assert_called_once()
-        select_mock.return_value.where.assert_called_with(
-            *where_mock.return_value)
+        async_result_mock = MagicMock()
+        async_result_mock.one.return_value = (True, False)
+        self.session_mock.execute.return_value = async_result_mock
 
-        select_mock.return_value.where.return_value.limit.assert_called_once()
-        select_mock.return_value.where.return_value.limit.assert_called_with(1)
+        result = await self.entity_manager.exists_many([
+            (Album, {"album_name__eq": "dummy"}),
+            (User, {"user_login__eq": "dummy"})])
+        self.assertListEqual(result, [True, False])
 
         self.session_mock.execute.assert_called_once()
-        self.session_mock.execute.assert_called_with(
-            select_mock.return_value.where.return_value.limit.return_value)
+        query = str(self.session_mock.execute.call_args.args[0])
+        self.assertEqual(query.count("EXISTS (SELECT 1"), 2)
+        self.assertIn("FROM albums", query)
+        self.assertIn("FROM users", query)
 
-        async_result_mock.unique.return_value.scalars.return_value.one_or_none.assert_called_once() # noqa E501
+    async def test__exists_many_empty(self):
+        """Test exists_many method without conditions."""
+        result = await self.entity_manager.exists_many([])
+        self.assertListEqual(result, [])
+        self.session_mock.execute.assert_not_called()
 
     @patch("app.managers.entity_manager.EntityManager.flush")
     @patch("app.managers.entity_manager.EntityManager.commit")
@@ -189,6 +180,32 @@ class EntityManagerTestCase(asynctest.TestCase):
 
         async_result_mock.unique.return_value.scalars.return_value.one_or_none.assert_called_once() # noqa E501
 
+    @patch("app.managers.entity_manager.select")
+    async def test__entity_manager_select_many(self, select_mock):
+        """Test select_many method for fetching entities by ids."""
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+        dummy_class_mock = MagicMock()
+        async_result_mock = MagicMock()
+        async_result_mock.unique.return_value.scalars.return_value.all.return_value = dummy_mocks # noqa E501
+        self.session_mock.execute.return_value = async_result_mock
+
+        result = await self.entity_manager.select_many(dummy_class_mock, [1, 2])
+        self.assertListEqual(result, dummy_mocks)
+
+        select_mock.assert_called_once()
+        select_mock.assert_called_with(dummy_class_mock)
+
+        dummy_class_mock.id.in_.assert_called_once()
+        dummy_class_mock.id.in_.assert_called_with([1, 2])
+
+        select_mock.return_value.where.assert_called_once()
+        select_mock.return_value.where.assert_called_with(
+            dummy_class_mock.id.in_.return_value)
+
+        self.session_mock.execute.assert_called_once()
+        self.session_mock.execute.assert_called_with(
+            select_mock.return_value.where.return_value)
+
     @patch("app.managers.entity_manager.EntityManager._where")
     @patch("app.managers.entity_manager.select")
     async def test__entity_manager_select_by(self, select_mock, where_mock):
@@ -386,108 +403,48 @@ class EntityManagerTestCase(asynctest.TestCase):
 
         commit_mock.assert_not_called()
 
-    @patch("app.managers.entity_manager.EntityManager.delete")
-    @patch("app.managers.entity_manager.EntityManager.select_all")
-    async def test__delete_all(self, select_all_mock, delete_mock):
-        """Test delete_all method for deleting multiple entities."""
-        from app.managers.entity_manager import DELETE_ALL_BATCH_SIZE
+    async def test__delete_all(self):
+        """Test delete_all method deletes in set-based batches."""
+        from app.models.album_models import Album
 
-        dummy_class_mock = MagicMock()
-        entity_1, entity_2, entity_3 = MagicMock(), MagicMock(), MagicMock()
-        select_all_mock.side_effect = [[entity_1, entity_2], [entity_3], []]
+        async_result_mocks = [MagicMock(), MagicMock()]
+        async_result_mocks[0].scalars.return_value.all.return_value = [2, 1]
+        async_result_mocks[1].scalars.return_value.all.return_value = [3]
+        self.session_mock.execute.side_effect = async_result_mocks
 
         result = await self.entity_manager.delete_all(
-            dummy_class_mock, name__eq="dummy")
-        self.assertIsNone(result)
+            Album, batch_size=2, album_name__ilike="dummy")
+        self.assertListEqual(result, [1, 2, 3])
 
-        self.assertEqual(select_all_mock.call_count, 3)
-        self.assertListEqual(select_all_mock.call_args_list, [
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=0, limit=DELETE_ALL_BATCH_SIZE),
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=DELETE_ALL_BATCH_SIZE, limit=DELETE_ALL_BATCH_SIZE),
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=DELETE_ALL_BATCH_SIZE * 2,
-                 limit=DELETE_ALL_BATCH_SIZE)])
-
-        self.assertEqual(delete_mock.call_count, 3)
-        self.assertListEqual(delete_mock.call_args_list, [
-            call(entity_1, commit=False),
-            call(entity_2, commit=False),
-            call(entity_3, commit=False),
-        ])
+        self.assertEqual(self.session_mock.execute.call_count, 2)
+        first_query = str(self.session_mock.execute.call_args_list[0].args[0])
+        self.assertIn("DELETE FROM albums WHERE albums.id IN (SELECT",
+                      first_query)
+        self.assertIn("LIMIT", first_query)
+        self.assertIn("RETURNING albums.id", first_query)
+        self.assertNotIn("albums.id >", first_query)
 
-    @patch("app.managers.entity_manager.EntityManager.delete")
-    @patch("app.managers.entity_manager.EntityManager.select_all")
-    async def test__delete_all_commit_true(self, select_all_mock, delete_mock):
-        """Test delete_all method with commit set to True."""
-        from app.managers.entity_manager import DELETE_ALL_BATCH_SIZE
+        last_query = self.session_mock.execute.call_args_list[1].args[0]
+        self.assertIn("albums.id > :id_1", str(last_query))
+        self.assertEqual(last_query.compile().params["id_1"], 2)
 
-        dummy_class_mock = MagicMock()
-        entity_1, entity_2, entity_3 = MagicMock(), MagicMock(), MagicMock()
-        select_all_mock.side_effect = [[entity_1, entity_2], [entity_3], []]
+        self.session_mock.commit.assert_not_called()
 
-        result = await self.entity_manager.delete_all(
-            dummy_class_mock, commit=True, name__eq="dummy")
-        self.assertIsNone(result)
+    async def test__delete_all_commit_true(self):
+        """Test delete_all method commits each batch."""
+        from app.models.album_models import Album
 
-        self.assertEqual(select_all_mock.call_count, 3)
-        self.assertListEqual(select_all_mock.call_args_list, [
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=0, limit=DELETE_ALL_BATCH_SIZE),
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=DELETE_ALL_BATCH_SIZE, limit=DELETE_ALL_BATCH_SIZE),
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=DELETE_ALL_BATCH_SIZE * 2,
-                 limit=DELETE_ALL_BATCH_SIZE)])
-
-        self.assertEqual(delete_mock.call_count, 3)
-        self.assertListEqual(delete_mock.call_args_list, [
-            call(entity_1, commit=True),
-            call(entity_2, commit=True),
-            call(entity_3, commit=True),
-        ])
-
-    @patch("app.managers.entity_manager.EntityManager.delete")
-    @patch("app.managers.entity_manager.EntityManager.select_all")
-    async def test__delete_all_commit_false(self, select_all_mock,
-                                            delete_mock):
-        """Test delete_all method with commit set to False."""
-        from app.managers.entity_manager import DELETE_ALL_BATCH_SIZE
-
-        dummy_class_mock = MagicMock()
-        entity_1, entity_2, entity_3 = MagicMock(), MagicMock(), MagicMock()
-        select_all_mock.side_effect = [[entity_1, entity_2], [entity_3], []]
+        async_result_mocks = [MagicMock(), MagicMock()]
+        async_result_mocks[0].scalars.return_value.all.return_value = [1, 2]
+        async_result_mocks[1].scalars.return_value.all.return_value = []
+        self.session_mock.execute.side_effect = async_result_mocks
 
         result = await self.entity_manager.delete_all(
-            dummy_class_mock, commit=False, name__eq="dummy")
-        self.assertIsNone(result)
+            Album, commit=True, batch_size=2)
+        self.assertListEqual(result, [1, 2])
 
-        self.assertEqual(select_all_mock.call_count, 3)
-        self.assertListEqual(select_all_mock.call_args_list, [
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=0, limit=DELETE_ALL_BATCH_SIZE),
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=DELETE_ALL_BATCH_SIZE, limit=DELETE_ALL_BATCH_SIZE),
-            call(dummy_class_mock, name__eq="dummy",
-                 order_by="id", order="asc",
-                 offset=DELETE_ALL_BATCH_SIZE * 2,
-                 limit=DELETE_ALL_BATCH_SIZE)])
-
-        self.assertEqual(delete_mock.call_count, 3)
-        self.assertListEqual(delete_mock.call_args_list, [
-            call(entity_1, commit=False),
-            call(entity_2, commit=False),
-            call(entity_3, commit=False),
-        ])
+        self.assertEqual(self.session_mock.execute.call_count, 2)
+        self.assertEqual(self.session_mock.commit.call_count, 2)
 
     @patch("app.managers.entity_manager.EntityManager._where")
     @patch("app.managers.entity_manager.func")
@@ -732,12 +689,296 @@ class EntityManagerTestCase(asynctest.TestCase):
         desc_mock.assert_called_once()
         desc_mock.assert_called_with(column_mock)
 
+    @patch("app.managers.entity_manager.EntityManager.count_all")
+    async def test__select_all_counted(self, count_all_mock):
+        """Test select_all_counted method reads the window count."""
+        from app.models.album_models import Album
+
+        dummy_mocks = [MagicMock(), MagicMock()]
+        async_result_mock = MagicMock()
+        async_result_mock.unique.return_value.all.return_value = [
+            (dummy_mocks[0], 10), (dummy_mocks[1], 10)]
+        self.session_mock.execute.return_value = async_result_mock
+
+        result = await self.entity_manager.select_all_counted(
+            Album, order_by="id", order="asc", offset=0, limit=2)
+        self.assertTupleEqual(result, (dummy_mocks, 10))
+
+        query = self.session_mock.execute.call_args.args[0]
+        self.assertIn("count(*) OVER ()", str(query))
+        count_all_mock.assert_not_called()
+
+    @patch("app.managers.entity_manager.EntityManager.count_all")
+    async def test__select_all_counted_past_end(self, count_all_mock):
+        """Test select_all_counted method for a page past the end."""
+        from app.models.album_models import Album
+
+        async_result_mock = MagicMock()
+        async_result_mock.unique.return_value.all.return_value = []
+        self.session_mock.execute.return_value = async_result_mock
+        count_all_mock.return_value = 10
+        kwargs = {"order_by": "id", "order": "asc", "offset": 20, "limit": 2}
+
+        result = await self.entity_manager.select_all_counted(Album, **kwargs)
+        self.assertTupleEqual(result, ([], 10))
+        count_all_mock.assert_called_once_with(Album, **kwargs)
+
+    @patch("app.managers.entity_manager.EntityManager.count_all")
+    @patch("app.managers.entity_manager.EntityManager.select_all")
+    async def test__select_all_counted_cursor(self, select_all_mock,
+                                              count_all_mock):
+        """Test select_all_counted method with a cursor."""
+        dummy_class_mock = MagicMock()
+        select_all_mock.return_value = [MagicMock()]
+        count_all_mock.return_value = 10
+        kwargs = {"order_by": "id", "order": "asc", "cursor": "dummy"}
+
+        result = await self.entity_manager.select_all_counted(
+            dummy_class_mock, **kwargs)
+        self.assertTupleEqual(result, (select_all_mock.return_value, 10))
+
+        select_all_mock.assert_called_once_with(dummy_class_mock, **kwargs)
+        count_all_mock.assert_called_once_with(dummy_class_mock, **kwargs)
+        self.session_mock.execute.assert_not_called()
+
+    async def test__estimate_all_unfiltered(self):
+        """Test estimate_all method reads reltuples without filters."""
+        from app.models.album_models import Album
+
+        async_result_mock = MagicMock()
+        async_result_mock.scalars.return_value.one_or_none.return_value = 123
+        self.session_mock.execute.return_value = async_result_mock
+
+        result = await self.entity_manager.estimate_all(Album)
+        self.assertEqual(result, 123)
+
+        query, params = self.session_mock.execute.call_args.args
+        self.assertIn("reltuples", str(query))
+        self.assertDictEqual(params, {"table_name": "albums"})
+
+    async def test__estimate_all_filtered(self):
+        """Test estimate_all method reads EXPLAIN estimate with filters."""
+        from app.models.album_models import Album
+        from sqlalchemy.dialects.postgresql.asyncpg import dialect
+
+        self.session_mock.execute.return_value.scalar = MagicMock(
+            return_value='[{"Plan": {"Plan Rows": 42}}]')
+
+        result = await self.entity_manager.estimate_all(
+            Album, album_name__ilike="dummy")
+        self.assertEqual(result, 42)
+
+        query = self.session_mock.execute.call_args.args[0].compile(
+            dialect=dialect())
+        self.assertTrue(str(query).startswith(
+            "EXPLAIN (FORMAT JSON) SELECT"))
+        self.assertIn("ILIKE $1", str(query))
+        self.assertDictEqual(query.params, {"album_name_1": "%dummy%"})
+
+    async def test__estimate_all_filtered_enum(self):
+        """Test estimate_all method keeps bind types of enum filters."""
+        from app.models.user_models import User, UserRole
+        from sqlalchemy.dialects.postgresql.asyncpg import dialect
+
+        self.session_mock.execute.return_value.scalar = MagicMock(
+            return_value=[{"Plan": {"Plan Rows": 1}}])
+
+        result = await self.entity_manager.estimate_all(
+            User, user_role__eq=UserRole.ADMIN)
+        self.assertEqual(result, 1)
+
+        query = self.session_mock.execute.call_args.args[0].compile(
+            dialect=dialect(), compile_kwargs={"literal_binds": True})
+        self.assertIn("users.user_role = 'ADMIN'", str(query))
+
+    async def test__insert_many(self):
+        """Test insert_many method inserts in batches with RETURNING."""
+        from app.models.album_models import Album
+
+        albums = [Album(1, False, "album-%s" % i) for i in range(3)]
+        inserted_mocks = [MagicMock(), MagicMock(), MagicMock()]
+        self.session_mock.scalars.side_effect = [
+            MagicMock(all=MagicMock(return_value=inserted_mocks[:2])),
+            MagicMock(all=MagicMock(return_value=inserted_mocks[2:]))]
+
+        result = await self.entity_manager.insert_many(
+            Album, albums, batch_size=2, commit=True)
+        self.assertListEqual(result, inserted_mocks)
+
+        self.assertEqual(self.session_mock.scalars.call_count, 2)
+        query, params = self.session_mock.scalars.call_args_list[0].args
+        self.assertIn("RETURNING", str(query))
+        self.assertEqual(len(params), 2)
+        self.assertEqual(params[1]["album_name"], "album-1")
+        self.assertNotIn("id", params[1])
+        self.session_mock.commit.assert_called_once()
+
+    async def test__update_many(self):
+        """Test update_many method updates changed columns only."""
+        from sqlalchemy import inspect
+        from sqlalchemy.orm.attributes import set_committed_value
+        from app.models.album_models import Album
+
+        albums = [Album(1, False, "album-%s" % i) for i in range(3)]
+        for i, album in enumerate(albums):
+            for attr in inspect(Album).column_attrs:
+                set_committed_value(album, attr.key,
+                                    getattr(album, attr.key))
+            set_committed_value(album, "id", i + 1)
+
+        albums[0].album_name = "renamed"
+        albums[2].posts_count = 5
+
+        result = await self.entity_manager.update_many(
+            Album, albums, batch_size=2)
+        self.assertIsNone(result)
+
+        self.assertEqual(self.session_mock.execute.call_count, 2)
+        _, params = self.session_mock.execute.call_args_list[0].args
+        self.assertEqual(len(params), 1)
+        self.assertEqual(params[0]["id"], 1)
+        self.assertEqual(params[0]["album_name"], "renamed")
+        self.assertIn("updated_date", params[0])
+        _, params = self.session_mock.execute.call_args_list[1].args
+        self.assertEqual(params[0]["posts_count"], 5)
+
+        self.assertFalse(inspect(albums[0]).attrs["album_name"]
+                         .history.has_changes())
+        self.assertEqual(albums[0].updated_date, params[0]["updated_date"])
+        self.session_mock.commit.assert_not_called()
+
+    async def test__copy_many(self):
+        """Test copy_many method copies records with defaults."""
+        from app.models.album_models import Album
+        from sqlalchemy.dialects.postgresql.asyncpg import dialect
+
+        conn_mock = AsyncMock(dialect=dialect())
+        self.session_mock.connection.return_value = conn_mock
+        raw_conn_mock = conn_mock.get_raw_connection.return_value
+        albums = [Album(1, False, "album-%s" % i) for i in range(2)]
+
+        result = await self.entity_manager.copy_many(Album, albums)
+        self.assertEqual(result, 2)
+
+        copy_mock = raw_conn_mock.driver_connection.copy_records_to_table
+        copy_mock.assert_called_once()
+        conn_mock.exec_driver_sql.assert_awaited_once_with("SELECT 1")
+        self.session_mock.commit.assert_not_called()
+        self.assertEqual(copy_mock.call_args.args, ("albums",))
+        columns = copy_mock.call_args.kwargs["columns"]
+        records = copy_mock.call_args.kwargs["records"]
+        self.assertNotIn("id", columns)
+        self.assertEqual(len(records), 2)
+        record = dict(zip(columns, records[1]))
+        self.assertEqual(record["album_name"], "album-1")
+        self.assertIsInstance(record["created_date"], int)
+
+    async def test__copy_many_empty(self):
+        """Test copy_many method without entities."""
+        result = await self.entity_manager.copy_many(MagicMock(), [])
+        self.assertEqual(result, 0)
+        self.session_mock.connection.assert_not_called()
+
+    async def test__tiebreaker(self):
+        """Test _tiebreaker method orders ties by id."""
+        from app.models.album_models import Album
+
+        result = self.entity_manager._tiebreaker(
+            Album, order_by="posts_count", order="desc")
+        self.assertListEqual([str(x) for x in result], ["albums.id DESC"])
+
+        result = self.entity_manager._tiebreaker(
+            Album, order_by="id", order="desc")
+        self.assertListEqual(result, [])
+
+    async def test__seek_empty(self):
+        """Test _seek method without a cursor."""
+        result = self.entity_manager._seek(
+            MagicMock(), order_by="id", order="asc", cursor=None)
+        self.assertListEqual(result, [])
+
+    async def test__seek_asc(self):
+        """Test _seek method for ascending order."""
+        from app.models.album_models import Album
+        from app.helpers.cursor_helper import CursorHelper
+
+        cursor = CursorHelper.encode("posts_count", "asc", 5, 123)
+        result = self.entity_manager._seek(
+            Album, order_by="posts_count", order="asc", cursor=cursor)
+        self.assertListEqual([str(x) for x in result], [
+            "albums.posts_count >= :posts_count_1 OR "
+            "albums.posts_count IS NULL",
+            "albums.posts_count > :posts_count_1 OR "
+            "albums.posts_count IS NULL OR albums.id > :id_1"])
+
+    async def test__seek_asc_not_nullable(self):
+        """Test _seek method for ascending order of a not null column."""
+        from app.models.user_models import User
+        from app.helpers.cursor_helper import CursorHelper
+
+        cursor = CursorHelper.encode("user_login", "asc", "dummy", 123)
+        result = self.entity_manager._seek(
+            User, order_by="user_login", order="asc", cursor=cursor)
+        self.assertListEqual([str(x) for x in result], [
+            "users.user_login >= :user_login_1",
+            "users.user_login > :user_login_1 OR users.id > :id_1"])
+
+    async def test__seek_asc_null(self):
+        """Test _seek method for ascending order after a null value."""
+        from app.models.album_models import Album
+        from app.helpers.cursor_helper import CursorHelper
+
+        cursor = CursorHelper.encode("posts_count", "asc", None, 123)
+        result = self.entity_manager._seek(
+            Album, order_by="posts_count", order="asc", cursor=cursor)
+        self.assertListEqual([str(x) for x in result], [
+            "albums.posts_count IS NULL", "albums.id > :id_1"])
+
+    async def test__seek_desc_null(self):
+        """Test _seek method for descending order after a null value."""
+        from app.models.album_models import Album
+        from app.helpers.cursor_helper import CursorHelper
+
+        cursor = CursorHelper.encode("posts_count", "desc", None, 123)
+        result = self.entity_manager._seek(
+            Album, order_by="posts_count", order="desc", cursor=cursor)
+        self.assertListEqual([str(x) for x in result], [
+            "albums.posts_count IS NOT NULL OR albums.id < :id_1"])
+
+    async def test__seek_desc(self):
+        """Test _seek method for descending order."""
+        from app.models.album_models import Album
+        from app.helpers.cursor_helper import CursorHelper
+
+        cursor = CursorHelper.encode("posts_count", "desc", 5, 123)
+        result = self.entity_manager._seek(
+            Album, order_by="posts_count", order="desc", cursor=cursor)
+        self.assertListEqual([str(x) for x in result], [
+            "albums.posts_count <= :posts_count_1",
+            "albums.posts_count < :posts_count_1 OR albums.id < :id_1"])
+
+    async def test__seek_id(self):
+        """Test _seek method when ordered by id."""
+        from app.models.album_models import Album
+        from app.helpers.cursor_helper import CursorHelper
+
+        cursor = CursorHelper.encode("id", "desc", 123, 123)
+        result = self.entity_manager._seek(
+            Album, order_by="id", order="desc", cursor=cursor)
+        self.assertListEqual([str(x) for x in result], ["albums.id < :id_1"])
+
     async def test__offset(self):
         """Test _offset method for setting offset."""
         kwargs = {"offset": 123}
         result = self.entity_manager._offset(**kwargs)
         self.assertEqual(result, 123)
 
+    async def test__offset_cursor(self):
+        """Test _offset method ignores offset with a cursor."""
+        kwargs = {"offset": 123, "cursor": "dummy"}
+        result = self.entity_manager._offset(**kwargs)
+        self.assertIsNone(result)
+
     async def test__limit(self):
         """Test _limit method for setting limit."""
         kwargs = {"limit": 123}
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+from app.models.user_models import User, UserRole
+
+
+class FernetMixinTestCase(unittest.TestCase):
+    """Test case for FernetMixin and encrypted User properties."""
+
+    def setUp(self):
+        """Set up the test case environment."""
+        self.user = User(UserRole.READER, "dummy", "password", "first",
+                         "last")
+
+    def tearDown(self):
+        """Clean up the test case environment."""
+        del self.user
+
+    def test__decrypt_memoized(self):
+        """Test encrypted properties are decrypted once per instance."""
+        with patch.object(User, "decrypt", return_value="jti") as decrypt:
+            self.assertEqual(self.user.jti, "jti")
+            self.assertEqual(self.user.jti, "jti")
+
+        decrypt.assert_called_once_with(self.user.jti_encrypted)
+
+    def test__decrypt_memoized_not_in_dict(self):
+        """Test plaintexts are not kept in the instance dict."""
+        self.assertIsNotNone(self.user.jti)
+        self.assertIsNotNone(self.user.mfa_secret)
+
+        self.assertNotIn(self.user.jti, self.user.__dict__.values())
+        self.assertNotIn(self.user.mfa_secret, self.user.__dict__.values())
+
+    def test__setter_forgets_decrypted(self):
+        """Test setters drop memoized plaintexts."""
+        self.assertIsNotNone(self.user.jti)
+
+        self.user.jti = "new"
+        self.assertEqual(self.user.jti, "new")
+
+        self.user.mfa_secret = "A" * 32
+        self.assertEqual(self.user.mfa_secret, "A" * 32)
+        self.assertEqual(self.user.jti, "new")
+
+    @patch("app.models.user_models.cfg")
+    def test__check_jti_hash(self, cfg_mock):
+        """Test check_jti compares keyed hashes without decryption."""
+        cfg_mock.JTI_HASH_ENABLED = True
+        self.user.jti = "jti"
+        self.assertEqual(len(self.user.jti_hash), 64)
+
+        with patch.object(User, "decrypt") as decrypt:
+            self.user.forget_decrypted()
+            self.assertTrue(self.user.check_jti("jti"))
+            self.assertFalse(self.user.check_jti("other"))
+
+        decrypt.assert_not_called()
+
+    @patch("app.models.user_models.cfg")
+    def test__check_jti_decrypt(self, cfg_mock):
+        """Test check_jti decrypts the jti without the keyed hash."""
+        cfg_mock.JTI_HASH_ENABLED = False
+        self.user.jti = "jti"
+        self.assertIsNone(self.user.jti_hash)
+
+        self.assertTrue(self.user.check_jti("jti"))
+        self.assertFalse(self.user.check_jti("other"))
+
+
+if __name__ == "__main__":
+    unittest.main()
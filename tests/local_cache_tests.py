@@ -0,0 +1,176 @@
+import asynctest
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.local_cache import LocalCache
+
+
+class LocalCacheTestCase(unittest.TestCase):
+    """Test case for LocalCache class."""
+
+    def setUp(self):
+        """Set up the test case environment."""
+        self.local_cache = LocalCache(2, 10)
+
+    def tearDown(self):
+        """Clean up the test case environment."""
+        del self.local_cache
+
+    def test__init(self):
+        """Test LocalCache initialization."""
+        self.assertEqual(self.local_cache.maxsize, 2)
+        self.assertEqual(self.local_cache.expire, 10)
+        self.assertDictEqual(self.local_cache.items, {})
+        self.assertEqual(self.local_cache.hits, 0)
+        self.assertEqual(self.local_cache.misses, 0)
+
+    def test__get_hit(self):
+        """Test get method when the key is cached."""
+        self.local_cache.set("dummies:1", b"dummy")
+
+        result = self.local_cache.get("dummies:1")
+        self.assertEqual(result, b"dummy")
+        self.assertEqual(self.local_cache.hits, 1)
+        self.assertEqual(self.local_cache.misses, 0)
+
+    def test__get_miss(self):
+        """Test get method when the key is not cached."""
+        result = self.local_cache.get("dummies:1")
+        self.assertIsNone(result)
+        self.assertEqual(self.local_cache.hits, 0)
+        self.assertEqual(self.local_cache.misses, 1)
+
+    @patch("app.local_cache.monotonic")
+    def test__get_expired(self, monotonic_mock):
+        """Test get method when the key is expired."""
+        monotonic_mock.return_value = 100
+        self.local_cache.set("dummies:1", b"dummy")
+        monotonic_mock.return_value = 111
+
+        result = self.local_cache.get("dummies:1")
+        self.assertIsNone(result)
+        self.assertNotIn("dummies:1", self.local_cache.items)
+        self.assertEqual(self.local_cache.misses, 1)
+
+    def test__set_evicts_least_recently_used(self):
+        """Test set method evicts the least recently used key."""
+        self.local_cache.set("dummies:1", b"dummy_1")
+        self.local_cache.set("dummies:2", b"dummy_2")
+        self.local_cache.get("dummies:1")
+        self.local_cache.set("dummies:3", b"dummy_3")
+
+        self.assertListEqual(list(self.local_cache.items),
+                             ["dummies:1", "dummies:3"])
+
+    def test__delete(self):
+        """Test delete method."""
+        self.local_cache.set("dummies:1", b"dummy")
+        self.local_cache.delete("dummies:1")
+        self.local_cache.delete("dummies:2")
+        self.assertDictEqual(self.local_cache.items, {})
+
+    def test__delete_all(self):
+        """Test delete_all method removes keys by prefix."""
+        self.local_cache.set("dummies:1", b"dummy")
+        self.local_cache.set("others:1", b"other")
+        self.local_cache.delete_all("dummies:")
+        self.assertListEqual(list(self.local_cache.items), ["others:1"])
+
+    def test__set_invalidated_key(self):
+        """Test set method skips a value read before its key changed."""
+        version = self.local_cache.version
+        self.local_cache.delete("dummies:1")
+
+        self.local_cache.set("dummies:1", b"dummy", version)
+        self.local_cache.set("dummies:2", b"dummy", version)
+        self.assertIsNone(self.local_cache.get("dummies:1"))
+        self.assertEqual(self.local_cache.get("dummies:2"), b"dummy")
+
+        self.local_cache.set("dummies:1", b"dummy", self.local_cache.version)
+        self.assertEqual(self.local_cache.get("dummies:1"), b"dummy")
+
+    def test__set_invalidated_all(self):
+        """Test set method skips values read before a namespace changed."""
+        version = self.local_cache.version
+        self.local_cache.delete_all("dummies:")
+
+        self.local_cache.set("dummies:1", b"dummy", version)
+        self.assertIsNone(self.local_cache.get("dummies:1"))
+
+    def test__set_invalidated_evicted(self):
+        """Test set method when the invalidated key is evicted."""
+        version = self.local_cache.version
+        for key in ["dummies:1", "dummies:2", "dummies:3"]:
+            self.local_cache.delete(key)
+
+        self.assertNotIn("dummies:1", self.local_cache.invalidated)
+        self.local_cache.set("dummies:1", b"dummy", version)
+        self.assertIsNone(self.local_cache.get("dummies:1"))
+
+    def test__clear(self):
+        """Test clear method."""
+        self.local_cache.set("dummies:1", b"dummy")
+        self.local_cache.set("others:1", b"other")
+
+        self.local_cache.clear()
+        self.assertDictEqual(self.local_cache.items, {})
+
+    def test__stats(self):
+        """Test stats method."""
+        self.local_cache.set("dummies:1", b"dummy")
+        self.local_cache.get("dummies:1")
+        self.local_cache.get("dummies:2")
+
+        result = self.local_cache.stats()
+        self.assertDictEqual(result, {"size": 1, "maxsize": 2, "hits": 1,
+                                      "misses": 1})
+
+
+class ListenInvalidationsTestCase(asynctest.TestCase):
+    """Test case for listen_invalidations function."""
+
+    @patch("app.local_cache.asyncio.sleep")
+    @patch("app.local_cache._listen_invalidations")
+    async def test__listen_invalidations_restart(self, listen_mock,
+                                                 sleep_mock):
+        """Test the listener is restarted after a connection error."""
+        import asyncio
+        from app.local_cache import listen_invalidations, RECONNECT_DELAY
+
+        listen_mock.side_effect = [ConnectionError("dummy"), None,
+                                   asyncio.CancelledError()]
+
+        with self.assertRaises(asyncio.CancelledError):
+            await listen_invalidations()
+
+        self.assertEqual(listen_mock.call_count, 3)
+        sleep_mock.assert_called_with(RECONNECT_DELAY)
+
+    @patch("app.local_cache.local_cache")
+    @patch("app.local_cache.redis")
+    async def test__listen_invalidations(self, redis_mock, local_cache_mock):
+        """Test the local cache is cleared and keys are invalidated."""
+        from app.local_cache import _listen_invalidations, INVALIDATE_CHANNEL
+
+        async def listen():
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": "dummies:1"}
+            yield {"type": "message", "data": "dummies:*"}
+
+        conn_mock = MagicMock(aclose=AsyncMock())
+        pubsub_mock = MagicMock(subscribe=AsyncMock(), aclose=AsyncMock(),
+                                listen=listen)
+        conn_mock.pubsub.return_value = pubsub_mock
+        redis_mock.Redis.return_value = conn_mock
+
+        await _listen_invalidations()
+
+        pubsub_mock.subscribe.assert_awaited_once_with(INVALIDATE_CHANNEL)
+        local_cache_mock.clear.assert_called_once()
+        local_cache_mock.delete.assert_called_once_with("dummies:1")
+        local_cache_mock.delete_all.assert_called_once_with("dummies:")
+        pubsub_mock.aclose.assert_awaited_once()
+        conn_mock.aclose.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
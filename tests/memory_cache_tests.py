@@ -0,0 +1,136 @@
+import asynctest
+import unittest
+from unittest.mock import patch
+from app.memory_cache import MemoryCache, memory_script
+
+
+class MemoryCacheTestCase(asynctest.TestCase):
+    """Test case for MemoryCache class."""
+
+    async def setUp(self):
+        """Set up the test case environment."""
+        self.cache = MemoryCache(3)
+
+    async def tearDown(self):
+        """Clean up the test case environment."""
+        del self.cache
+
+    async def test__set_get(self):
+        """Test set and get methods store values as bytes."""
+        self.assertTrue(await self.cache.set("dummies:1", b"dummy"))
+        await self.cache.set("index:dummies:name:dummy", 1)
+
+        self.assertEqual(await self.cache.get("dummies:1"), b"dummy")
+        self.assertEqual(await self.cache.get("index:dummies:name:dummy"),
+                         b"1")
+        self.assertIsNone(await self.cache.get("dummies:2"))
+
+    async def test__set_nx(self):
+        """Test set method with nx does not overwrite the key."""
+        self.assertTrue(await self.cache.set("lock:1", 1, nx=True, px=3000))
+        self.assertIsNone(await self.cache.set("lock:1", 2, nx=True))
+        self.assertEqual(await self.cache.get("lock:1"), b"1")
+
+    @patch("app.memory_cache.monotonic")
+    async def test__expire(self, monotonic_mock):
+        """Test keys expire by TTL and getex resets it."""
+        monotonic_mock.return_value = 100
+        await self.cache.set("dummies:1", b"dummy", ex=10)
+        await self.cache.set("dummies:2", b"dummy", ex=10)
+
+        monotonic_mock.return_value = 105
+        self.assertEqual(await self.cache.pttl("dummies:1"), 5000)
+        self.assertEqual(await self.cache.getex("dummies:1", ex=10),
+                         b"dummy")
+
+        monotonic_mock.return_value = 111
+        self.assertEqual(await self.cache.get("dummies:1"), b"dummy")
+        self.assertIsNone(await self.cache.get("dummies:2"))
+        self.assertEqual(await self.cache.pttl("dummies:2"), -2)
+
+    async def test__lru(self):
+        """Test the least recently used key is evicted."""
+        for key in ["dummies:1", "dummies:2", "dummies:3"]:
+            await self.cache.set(key, b"dummy")
+
+        await self.cache.get("dummies:1")
+        await self.cache.set("dummies:4", b"dummy")
+
+        self.assertListEqual(await self.cache.mget("dummies:1", "dummies:2"),
+                             [b"dummy", None])
+
+    async def test__incr(self):
+        """Test incr method keeps the TTL."""
+        self.assertEqual(await self.cache.incr("generation:dummies"), 1)
+        await self.cache.expire("generation:dummies", 10)
+        self.assertEqual(await self.cache.incr("generation:dummies"), 2)
+        self.assertGreater(await self.cache.pttl("generation:dummies"), 0)
+
+    async def test__delete_scan(self):
+        """Test delete, unlink and scan_iter methods."""
+        for key in ["dummies:1", "dummies:2", "others:1"]:
+            await self.cache.set(key, b"dummy")
+
+        keys = [x async for x in self.cache.scan_iter(match="dummies:*")]
+        self.assertListEqual(keys, ["dummies:1", "dummies:2"])
+
+        self.assertEqual(await self.cache.unlink(*keys), 2)
+        self.assertEqual(await self.cache.delete("others:1", "others:2"), 1)
+        self.assertDictEqual(self.cache.items, {})
+
+    async def test__pipeline(self):
+        """Test pipeline runs queued commands on execute."""
+        pipe = self.cache.pipeline(transaction=False)
+        pipe.set("dummies:1", b"dummy", ex=10)
+        pipe.get("dummies:1")
+        pipe.pttl("dummies:2")
+
+        result = await pipe.execute()
+        self.assertListEqual(result, [True, b"dummy", -2])
+        self.assertListEqual(pipe.commands, [])
+
+    async def test__register_script(self):
+        """Test register_script returns the Python equivalent."""
+        @memory_script("return 1")
+        async def dummy_script(cache, keys, args):
+            return await cache.set(keys[0], args[0])
+
+        script = self.cache.register_script("return 1")
+        self.assertTrue(await script(keys=["dummies:1"], args=[b"dummy"]))
+        self.assertEqual(await self.cache.get("dummies:1"), b"dummy")
+
+    async def test__publish(self):
+        """Test publish method has no subscribers."""
+        self.assertEqual(await self.cache.publish("channel", "key"), 0)
+
+    async def test__cache_manager(self):
+        """Test CacheManager round trip over the in-process cache."""
+        from app.managers.cache_manager import CacheManager
+        from app.models.album_models import Album
+
+        cache_manager = CacheManager(MemoryCache(100))
+        album = Album(1, False, "dummy")
+        album.id, album.created_date, album.updated_date = 1, 1, 1
+
+        await cache_manager.set(album)
+        result = await cache_manager.get(Album, 1, early_refresh=True)
+        self.assertEqual(result.album_name, "dummy")
+        self.assertEqual(await cache_manager.get_index(
+            Album, "album_name", "dummy"), 1)
+
+        await cache_manager.delete(album)
+        self.assertIsNone(await cache_manager.get(Album, 1))
+
+    async def test__attempt_manager(self):
+        """Test AttemptManager over the in-process cache."""
+        from app.managers.attempt_manager import AttemptManager
+
+        attempt_manager = AttemptManager(self.cache)
+
+        self.assertFalse(await attempt_manager.increment("mfa", 1, 2, 60))
+        self.assertTrue(await attempt_manager.increment("mfa", 1, 2, 60))
+        self.assertIsNone(await self.cache.get("attempts:mfa:1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
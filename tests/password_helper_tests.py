@@ -0,0 +1,72 @@
+import asynctest
+import unittest
+from unittest.mock import patch
+from app.helpers.hash_helper import HashHelper
+from app.helpers.password_helper import PasswordHelper, PasswordExecutor
+
+
+@patch("app.helpers.password_helper.cfg")
+class PasswordHelperTestCase(asynctest.TestCase):
+    """Test case for PasswordHelper and PasswordExecutor classes."""
+
+    def _set_params(self, cfg_mock, n: int = 16, r: int = 1, p: int = 1):
+        """Set cheap scrypt parameters."""
+        cfg_mock.SCRYPT_N, cfg_mock.SCRYPT_R, cfg_mock.SCRYPT_P = n, r, p
+
+    async def test__hash(self, cfg_mock):
+        """Test hash method stores parameters in the hash."""
+        self._set_params(cfg_mock)
+
+        result = PasswordHelper.hash("password")
+        self.assertTrue(result.startswith("scrypt$16$1$1$"))
+        self.assertLessEqual(len(result), 128)
+        self.assertNotEqual(result, PasswordHelper.hash("password"))
+
+    async def test__verify(self, cfg_mock):
+        """Test verify method with scrypt hash."""
+        self._set_params(cfg_mock)
+        password_hash = PasswordHelper.hash("password")
+
+        self._set_params(cfg_mock, n=32)
+        self.assertTrue(PasswordHelper.verify("password", password_hash))
+        self.assertFalse(PasswordHelper.verify("other", password_hash))
+
+    async def test__verify_legacy(self, cfg_mock):
+        """Test verify method with legacy sha512 hash."""
+        password_hash = HashHelper.hash("password")
+
+        self.assertTrue(PasswordHelper.verify("password", password_hash))
+        self.assertFalse(PasswordHelper.verify("other", password_hash))
+
+    async def test__needs_upgrade(self, cfg_mock):
+        """Test needs_upgrade method."""
+        self._set_params(cfg_mock)
+        password_hash = PasswordHelper.hash("password")
+
+        self.assertFalse(PasswordHelper.needs_upgrade(password_hash))
+        self.assertTrue(PasswordHelper.needs_upgrade(
+            HashHelper.hash("password")))
+
+        self._set_params(cfg_mock, n=32)
+        self.assertTrue(PasswordHelper.needs_upgrade(password_hash))
+
+    async def test__executor(self, cfg_mock):
+        """Test PasswordExecutor runs hashing in the pool."""
+        self._set_params(cfg_mock)
+        password_executor = PasswordExecutor(2)
+
+        password_hash = await password_executor.hash("password")
+        result = await password_executor.verify("password", password_hash)
+        self.assertTrue(result)
+
+        stats = password_executor.stats()
+        self.assertEqual(stats["completed"], 2)
+        self.assertEqual(stats["running"], 0)
+        self.assertEqual(stats["waiting"], 0)
+        self.assertIsNotNone(stats["average_ms"])
+
+        password_executor.executor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import asyncio
 import asynctest
 import unittest
-from unittest.mock import MagicMock, AsyncMock, call
+from unittest.mock import MagicMock, AsyncMock, patch, call
 from app.repository import Repository
 
 
@@ -19,6 +20,7 @@ class RepositoryTestCase(asynctest.TestCase):
         """Test Repository initialization."""
         from app.managers.entity_manager import EntityManager
         from app.managers.cache_manager import CacheManager
+        from app.local_cache import local_cache
 
         session_mock = MagicMock()
         cache_mock = MagicMock()
@@ -31,6 +33,7 @@ class RepositoryTestCase(asynctest.TestCase):
 
         self.assertTrue(isinstance(repository.cache_manager, CacheManager))
         self.assertEqual(repository.cache_manager.cache, cache_mock)
+        self.assertEqual(repository.cache_manager.local_cache, local_cache)
 
         self.assertEqual(repository.entity_class, dummy_class_mock)
 
@@ -53,6 +56,10 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.cache_manager.set.assert_called_once()
         repository.cache_manager.set.assert_called_with(dummy_mock)
 
+        repository.cache_manager.bump_generation.assert_called_once()
+        repository.cache_manager.bump_generation.assert_called_with(
+            dummy_class_mock)
+
     async def test__repository_insert_cacheable_commit_false(self):
         """Test insert with cacheable entity and commit False."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
@@ -70,6 +77,12 @@ class RepositoryTestCase(asynctest.TestCase):
             dummy_mock, commit=False)
 
         repository.cache_manager.set.assert_not_called()
+        repository.cache_manager.delete.assert_called_once()
+        repository.cache_manager.delete.assert_called_with(dummy_mock)
+
+        repository.cache_manager.bump_generation.assert_called_once()
+        repository.cache_manager.bump_generation.assert_called_with(
+            dummy_class_mock)
 
     async def test__repository_insert_uncacheable_commit_true(self):
         """Test insert with uncacheable entity and commit True."""
@@ -89,6 +102,8 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.set.assert_not_called()
 
+        repository.cache_manager.bump_generation.assert_not_called()
+
     async def test__repository_insert_uncacheable_commit_false(self):
         """Test insert with uncacheable entity and commit False."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
@@ -107,6 +122,8 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.set.assert_not_called()
 
+        repository.cache_manager.bump_generation.assert_not_called()
+
     async def test__repository_select_id_cacheable_cached(self):
         """Test select by id with cacheable entity when cached."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
@@ -125,10 +142,10 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.get.assert_called_once()
         repository.cache_manager.get.assert_called_with(
-            dummy_class_mock, dummy_mock.id)
+            dummy_class_mock, dummy_mock.id, early_refresh=True)
 
-        repository.cache_manager.set.assert_called_once()
-        repository.cache_manager.set.assert_called_with(dummy_mock)
+        repository.cache_manager.set.assert_not_called()
+        repository.cache_manager.lock.assert_not_called()
 
     async def test__repository_select_id_cacheable_uncached(self):
         """Test select by id with cacheable entity when not cached."""
@@ -151,11 +168,107 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.get.assert_called_once()
         repository.cache_manager.get.assert_called_with(
+            dummy_class_mock, dummy_mock.id, early_refresh=True)
+
+        repository.cache_manager.lock.assert_called_once()
+        repository.cache_manager.lock.assert_called_with(
             dummy_class_mock, dummy_mock.id)
 
         repository.cache_manager.set.assert_called_once()
         repository.cache_manager.set.assert_called_with(dummy_mock)
 
+        repository.cache_manager.unlock.assert_called_once()
+        repository.cache_manager.unlock.assert_called_with(
+            dummy_class_mock, dummy_mock.id,
+            repository.cache_manager.lock.return_value)
+
+    async def test__repository_select_id_cacheable_not_found(self):
+        """Test select by id when entity is not found."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select.return_value = None
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_key = MagicMock(
+            return_value="dummies:123")
+        repository.cache_manager.get.return_value = None
+
+        result = await repository.select(id=123)
+        self.assertIsNone(result)
+
+        repository.entity_manager.select.assert_called_once()
+        repository.cache_manager.set.assert_not_called()
+        repository.cache_manager.set_missing.assert_called_once()
+        repository.cache_manager.set_missing.assert_called_with(
+            dummy_class_mock, [123])
+
+    async def test__repository_select_id_cacheable_tombstoned(self):
+        """Test select by id when entity is known to be missing."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get.return_value = False
+
+        result = await repository.select(id=123)
+        self.assertIsNone(result)
+
+        repository.entity_manager.select.assert_not_called()
+        repository.cache_manager.lock.assert_not_called()
+        repository.cache_manager.set_missing.assert_not_called()
+
+    @patch("app.repository.asyncio.sleep")
+    async def test__repository_select_id_cacheable_locked(self, sleep_mock):
+        """Test select by id when another worker holds the lock."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mock = MagicMock(id=123)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_key = MagicMock(
+            return_value="dummies:123")
+        repository.cache_manager.get.side_effect = [None, None, dummy_mock]
+        repository.cache_manager.lock.return_value = None
+
+        result = await repository.select(id=dummy_mock.id)
+        self.assertEqual(result, dummy_mock)
+
+        self.assertEqual(repository.cache_manager.get.call_count, 3)
+        self.assertEqual(repository.cache_manager.lock.call_count, 2)
+        sleep_mock.assert_called_once()
+
+        repository.entity_manager.select.assert_not_called()
+        repository.cache_manager.set.assert_not_called()
+        repository.cache_manager.unlock.assert_not_called()
+
+    async def test__repository_select_id_cacheable_coalesced(self):
+        """Test concurrent selects by id share one database load."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mock = MagicMock(id=123)
+
+        async def select_mock(*args):
+            await asyncio.sleep(0)
+            return dummy_mock
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select.side_effect = select_mock
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_key = MagicMock(
+            return_value="dummies:123")
+        repository.cache_manager.get.side_effect = [None, None, dummy_mock]
+
+        result = await asyncio.gather(repository.select(id=dummy_mock.id),
+                                      repository.select(id=dummy_mock.id))
+        self.assertListEqual(result, [dummy_mock, dummy_mock])
+
+        repository.entity_manager.select.assert_called_once()
+        repository.cache_manager.lock.assert_called_once()
+        repository.cache_manager.set.assert_called_once()
+
     async def test__repository_select_id_uncacheable(self):
         """Test select by id with uncacheable entity."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
@@ -200,6 +313,78 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.cache_manager.set.assert_called_once()
         repository.cache_manager.set.assert_called_with(dummy_mock)
 
+    async def test__repository_select_by_index_hit(self):
+        """Test select by unique column resolved through the index."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_keys=("dummy_name",))
+        dummy_mock = MagicMock(id=123, dummy_name="dummy")
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_index.return_value = 123
+        repository.cache_manager.get.return_value = dummy_mock
+
+        result = await repository.select(dummy_name__eq="dummy")
+        self.assertEqual(result, dummy_mock)
+
+        repository.cache_manager.get_index.assert_called_once()
+        repository.cache_manager.get_index.assert_called_with(
+            dummy_class_mock, "dummy_name", "dummy")
+        repository.cache_manager.get.assert_called_once()
+        repository.cache_manager.get.assert_called_with(
+            dummy_class_mock, 123, early_refresh=True)
+
+        repository.entity_manager.select.assert_not_called()
+        repository.entity_manager.select_by.assert_not_called()
+        repository.cache_manager.delete_index.assert_not_called()
+
+    async def test__repository_select_by_index_miss(self):
+        """Test select by unique column when the index is missed."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_keys=("dummy_name",))
+        dummy_mock = MagicMock(id=123, dummy_name="dummy")
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_by.return_value = dummy_mock
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_index.return_value = None
+
+        result = await repository.select(dummy_name__eq="dummy")
+        self.assertEqual(result, dummy_mock)
+
+        repository.cache_manager.get.assert_not_called()
+        repository.entity_manager.select_by.assert_called_once()
+        repository.entity_manager.select_by.assert_called_with(
+            dummy_class_mock, dummy_name__eq="dummy")
+        repository.cache_manager.set.assert_called_once()
+        repository.cache_manager.set.assert_called_with(dummy_mock)
+
+    async def test__repository_select_by_index_stale(self):
+        """Test select by unique column when the index is stale."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_keys=("dummy_name",))
+        renamed_mock = MagicMock(id=123, dummy_name="renamed")
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_by.return_value = None
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_index_key = MagicMock(
+            return_value="index:dummies:dummy_name:dummy")
+        repository.cache_manager.get_index.return_value = 123
+        repository.cache_manager.get.return_value = renamed_mock
+
+        result = await repository.select(dummy_name__eq="dummy")
+        self.assertIsNone(result)
+
+        repository.cache_manager.delete_index.assert_called_once()
+        repository.cache_manager.delete_index.assert_called_with(
+            ["index:dummies:dummy_name:dummy"])
+        repository.entity_manager.select_by.assert_called_once()
+        repository.cache_manager.set.assert_not_called()
+
     async def test__repository_select_by_uncacheable(self):
         """Test select by criteria with uncacheable entity."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
@@ -222,6 +407,86 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.cache_manager.get.assert_not_called()
         repository.cache_manager.set.assert_not_called()
 
+    async def test__repository_select_many_cacheable(self):
+        """Test select many with cacheable entities."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_1, dummy_2, dummy_3 = (MagicMock(id=1), MagicMock(id=2),
+                                     MagicMock(id=3))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_many.return_value = [dummy_1]
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_many.return_value = {3: dummy_3}
+
+        result = await repository.select_many([3, 1, 2, 1])
+        self.assertListEqual(result, [dummy_3, dummy_1, dummy_1])
+
+        repository.cache_manager.get_many.assert_called_once()
+        repository.cache_manager.get_many.assert_called_with(
+            dummy_class_mock, [3, 1, 2, 1])
+
+        repository.entity_manager.select_many.assert_called_once()
+        repository.entity_manager.select_many.assert_called_with(
+            dummy_class_mock, [1, 2])
+
+        repository.cache_manager.set_many.assert_called_once()
+        repository.cache_manager.set_many.assert_called_with([dummy_1])
+        self.assertNotIn(dummy_2, result)
+
+        repository.cache_manager.set_missing.assert_called_once()
+        repository.cache_manager.set_missing.assert_called_with(
+            dummy_class_mock, [2])
+
+    async def test__repository_select_many_tombstoned(self):
+        """Test select many skips ids known to be missing."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_1 = MagicMock(id=1)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_many.return_value = {1: dummy_1,
+                                                          2: False}
+
+        result = await repository.select_many([1, 2])
+        self.assertListEqual(result, [dummy_1])
+
+        repository.entity_manager.select_many.assert_not_called()
+        repository.cache_manager.set_missing.assert_not_called()
+
+    async def test__repository_select_many_cached(self):
+        """Test select many when all entities are cached."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_1 = MagicMock(id=1)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_many.return_value = {1: dummy_1}
+
+        result = await repository.select_many([1])
+        self.assertListEqual(result, [dummy_1])
+
+        repository.entity_manager.select_many.assert_not_called()
+        repository.cache_manager.set_many.assert_not_called()
+
+    async def test__repository_select_many_uncacheable(self):
+        """Test select many with uncacheable entities."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
+        dummy_1 = MagicMock(id=1)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_many.return_value = [dummy_1]
+        repository.cache_manager = AsyncMock()
+
+        result = await repository.select_many([1])
+        self.assertListEqual(result, [dummy_1])
+
+        repository.cache_manager.get_many.assert_not_called()
+        repository.cache_manager.set_many.assert_not_called()
+
     async def test__repository_select_all_cacheable(self):
         """Test select all with cacheable entities."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
@@ -231,6 +496,7 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.entity_manager = AsyncMock()
         repository.entity_manager.select_all.return_value = dummy_mocks
         repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (None, 5)
 
         result = await repository.select_all(key__eq=dummy_mocks[0].key)
         self.assertListEqual(result, dummy_mocks)
@@ -239,10 +505,88 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.entity_manager.select_all.assert_called_with(
             dummy_class_mock, key__eq=dummy_mocks[0].key)
 
-        self.assertEqual(repository.cache_manager.set.call_count, 2)
-        self.assertListEqual(
-            repository.cache_manager.set.call_args_list,
-            [call(dummy_mocks[0]), call(dummy_mocks[1])])
+        repository.cache_manager.set.assert_not_called()
+        repository.cache_manager.set_many.assert_called_once()
+        repository.cache_manager.set_many.assert_called_with(dummy_mocks)
+
+        repository.cache_manager.get_query.assert_called_once()
+        repository.cache_manager.get_query.assert_called_with(
+            dummy_class_mock, "select_all", {"key__eq": "value"})
+
+        repository.cache_manager.set_query.assert_called_once()
+        repository.cache_manager.set_query.assert_called_with(
+            dummy_class_mock, "select_all", {"key__eq": "value"},
+            [dummy_mocks[0].id, dummy_mocks[1].id], 5)
+
+    async def test__repository_select_all_cacheable_query_cached(self):
+        """Test select all when the query result is cached."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = ([1, 2], 5)
+        repository.cache_manager.get_many.return_value = {
+            1: dummy_mocks[0], 2: dummy_mocks[1]}
+
+        result = await repository.select_all(key__eq="value")
+        self.assertListEqual(result, dummy_mocks)
+
+        repository.cache_manager.get_many.assert_called_once()
+        repository.cache_manager.get_many.assert_called_with(
+            dummy_class_mock, [1, 2])
+
+        repository.entity_manager.select_all.assert_not_called()
+        repository.entity_manager.select_many.assert_not_called()
+        repository.cache_manager.set_query.assert_not_called()
+
+    async def test__repository_select_all_cacheable_defer(self):
+        """Test select all with cacheable entities and deferred write."""
+        from app.repository import CACHE_DEFER
+
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(key="value"), MagicMock(key="value")]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_all.return_value = dummy_mocks
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (None, 5)
+
+        result = await repository.select_all(
+            cache_mode=CACHE_DEFER, key__eq=dummy_mocks[0].key)
+        self.assertListEqual(result, dummy_mocks)
+
+        repository.entity_manager.select_all.assert_called_with(
+            dummy_class_mock, key__eq=dummy_mocks[0].key)
+
+        repository.cache_manager.set_many.assert_not_awaited()
+        await asyncio.sleep(0)
+        repository.cache_manager.set_many.assert_awaited_once_with(
+            dummy_mocks)
+
+    async def test__repository_select_all_cacheable_skip(self):
+        """Test select all with cacheable entities and skipped write."""
+        from app.repository import CACHE_SKIP
+
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(key="value"), MagicMock(key="value")]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_all.return_value = dummy_mocks
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (None, 5)
+
+        result = await repository.select_all(
+            cache_mode=CACHE_SKIP, key__eq=dummy_mocks[0].key)
+        self.assertListEqual(result, dummy_mocks)
+
+        repository.entity_manager.select_all.assert_called_with(
+            dummy_class_mock, key__eq=dummy_mocks[0].key)
+
+        repository.cache_manager.set_many.assert_not_called()
 
     async def test__repository_select_all_uncacheable(self):
         """Test select all with uncacheable entities."""
@@ -261,7 +605,281 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.entity_manager.select_all.assert_called_with(
             dummy_class_mock, key__eq=dummy_mocks[0].key)
 
-        repository.cache_manager.set.assert_not_called()
+        repository.cache_manager.set_many.assert_not_called()
+
+    @patch("app.repository.cfg")
+    async def test__repository_insert_many_cacheable_commit_true(self,
+                                                                 cfg_mock):
+        """Test insert many with cacheable entities and commit True."""
+        cfg_mock.BULK_BATCH_SIZE = 100
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(), MagicMock()]
+        inserted_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.insert_many.return_value = inserted_mocks
+        repository.cache_manager = AsyncMock()
+
+        result = await repository.insert_many(dummy_mocks)
+        self.assertListEqual(result, inserted_mocks)
+
+        repository.entity_manager.insert_many.assert_called_once_with(
+            dummy_class_mock, dummy_mocks, batch_size=100, commit=True)
+        repository.cache_manager.set_many.assert_called_once_with(
+            inserted_mocks)
+        repository.cache_manager.delete_many.assert_not_called()
+        repository.cache_manager.bump_generation.assert_called_once_with(
+            dummy_class_mock)
+
+    async def test__repository_insert_many_cacheable_commit_false(self):
+        """Test insert many with cacheable entities and commit False."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        inserted_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.insert_many.return_value = inserted_mocks
+        repository.cache_manager = AsyncMock()
+
+        await repository.insert_many([MagicMock(), MagicMock()], commit=False)
+
+        repository.cache_manager.set_many.assert_not_called()
+        repository.cache_manager.delete_many.assert_called_once_with(
+            inserted_mocks)
+        self.assertTrue(repository.uncommitted)
+
+    async def test__repository_copy_many(self):
+        """Test copy many does not write to the cache."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(), MagicMock()]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.copy_many.return_value = 2
+        repository.cache_manager = AsyncMock()
+
+        result = await repository.copy_many(dummy_mocks)
+        self.assertEqual(result, 2)
+
+        repository.entity_manager.copy_many.assert_called_once_with(
+            dummy_class_mock, dummy_mocks, commit=True)
+        repository.cache_manager.set_many.assert_not_called()
+        repository.cache_manager.bump_generation.assert_called_once_with(
+            dummy_class_mock)
+
+    @patch("app.repository.cfg")
+    async def test__repository_update_many_cacheable_commit_true(self,
+                                                                 cfg_mock):
+        """Test update many with cacheable entities and commit True."""
+        cfg_mock.BULK_BATCH_SIZE = 100
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_renamed_index_keys = MagicMock(
+            side_effect=[["index:dummies:dummy_name:old"], []])
+
+        result = await repository.update_many(dummy_mocks)
+        self.assertIsNone(result)
+
+        repository.entity_manager.update_many.assert_called_once_with(
+            dummy_class_mock, dummy_mocks, batch_size=100, commit=True)
+        repository.cache_manager.delete_index.assert_called_once_with(
+            ["index:dummies:dummy_name:old"])
+        repository.cache_manager.set_many.assert_called_once_with(dummy_mocks)
+        repository.cache_manager.delete_many.assert_not_called()
+        repository.cache_manager.invalidate_many.assert_called_once_with(
+            dummy_mocks)
+        repository.cache_manager.bump_generation.assert_called_once_with(
+            dummy_class_mock)
+
+    async def test__repository_update_many_cacheable_commit_false(self):
+        """Test update many with cacheable entities and commit False."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_renamed_index_keys = MagicMock(
+            return_value=[])
+
+        await repository.update_many(dummy_mocks, commit=False)
+
+        repository.cache_manager.set_many.assert_not_called()
+        repository.cache_manager.delete_many.assert_called_once_with(
+            dummy_mocks)
+        self.assertTrue(repository.uncommitted)
+
+    async def test__repository_update_many_uncacheable(self):
+        """Test update many with uncacheable entities."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+
+        await repository.update_many(dummy_mocks)
+
+        repository.entity_manager.update_many.assert_called_once()
+        repository.cache_manager.set_many.assert_not_called()
+        repository.cache_manager.invalidate_many.assert_not_called()
+
+    async def test__repository_delete_all_cacheable(self):
+        """Test delete all with cacheable entities."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.delete_all.return_value = [1, 2]
+        repository.cache_manager = AsyncMock()
+
+        result = await repository.delete_all(key__eq="value")
+        self.assertEqual(result, 2)
+
+        repository.entity_manager.delete_all.assert_called_once_with(
+            dummy_class_mock, commit=True, key__eq="value")
+        repository.cache_manager.delete_ids.assert_called_once_with(
+            dummy_class_mock, [1, 2])
+        repository.cache_manager.bump_generation.assert_called_once_with(
+            dummy_class_mock)
+
+    async def test__repository_delete_all_uncacheable(self):
+        """Test delete all with uncacheable entities."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.delete_all.return_value = [1, 2]
+        repository.cache_manager = AsyncMock()
+
+        result = await repository.delete_all(commit=False)
+        self.assertEqual(result, 2)
+
+        repository.cache_manager.delete_ids.assert_not_called()
+
+    async def test__repository_select_all_counted_cacheable(self):
+        """Test select all counted when the count is not cached."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_all_counted.return_value = (
+            dummy_mocks, 10)
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (None, 5)
+
+        result = await repository.select_all_counted(key__eq="value",
+                                                     offset=20, limit=2)
+        self.assertTupleEqual(result, (dummy_mocks, 10))
+
+        repository.entity_manager.select_all_counted.assert_called_once_with(
+            dummy_class_mock, key__eq="value", offset=20, limit=2)
+        repository.entity_manager.select_all.assert_not_called()
+        repository.entity_manager.count_all.assert_not_called()
+
+        repository.cache_manager.get_query.assert_called_once_with(
+            dummy_class_mock, "count_all", {"key__eq": "value"})
+        repository.cache_manager.set_many.assert_called_once_with(dummy_mocks)
+        repository.cache_manager.set_query.assert_has_calls([
+            call(dummy_class_mock, "select_all",
+                 {"key__eq": "value", "offset": 20, "limit": 2}, [1, 2], 5),
+            call(dummy_class_mock, "count_all", {"key__eq": "value"}, 10, 5),
+        ])
+
+    async def test__repository_select_all_counted_count_cached(self):
+        """Test select all counted when the count is cached."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_all.return_value = dummy_mocks
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.side_effect = [(10, 5), (None, 5)]
+
+        result = await repository.select_all_counted(key__eq="value")
+        self.assertTupleEqual(result, (dummy_mocks, 10))
+
+        repository.entity_manager.select_all_counted.assert_not_called()
+        repository.entity_manager.select_all.assert_called_once_with(
+            dummy_class_mock, key__eq="value")
+
+    async def test__repository_select_all_counted_uncacheable(self):
+        """Test select all counted with uncacheable entities."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
+        dummy_mocks = [MagicMock(id=1), MagicMock(id=2)]
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.select_all_counted.return_value = (
+            dummy_mocks, 10)
+        repository.cache_manager = AsyncMock()
+
+        result = await repository.select_all_counted(key__eq="value")
+        self.assertTupleEqual(result, (dummy_mocks, 10))
+
+        repository.cache_manager.get_query.assert_not_called()
+        repository.cache_manager.set_many.assert_not_called()
+        repository.cache_manager.set_query.assert_not_called()
+
+    async def test__repository_estimate_all_cached(self):
+        """Test estimate all when the exact count is cached."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (10, 5)
+
+        result = await repository.estimate_all(key__eq="value", limit=10)
+        self.assertTupleEqual(result, (10, True))
+        repository.entity_manager.estimate_all.assert_not_called()
+        repository.cache_manager.get_query.assert_called_once_with(
+            dummy_class_mock, "count_all", {"key__eq": "value"})
+
+    @patch("app.repository.cfg")
+    async def test__repository_estimate_all_estimated(self, cfg_mock):
+        """Test estimate all when the estimate is above the threshold."""
+        cfg_mock.COUNT_ESTIMATE_THRESHOLD = 1000
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.estimate_all.return_value = 5000
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (None, 5)
+
+        result = await repository.estimate_all(key__eq="value")
+        self.assertTupleEqual(result, (5000, False))
+
+        repository.entity_manager.estimate_all.assert_called_once_with(
+            dummy_class_mock, key__eq="value")
+        repository.entity_manager.count_all.assert_not_called()
+
+    @patch("app.repository.cfg")
+    async def test__repository_estimate_all_counted(self, cfg_mock):
+        """Test estimate all when the estimate is below the threshold."""
+        cfg_mock.COUNT_ESTIMATE_THRESHOLD = 1000
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.estimate_all.return_value = -1
+        repository.entity_manager.count_all.return_value = 10
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (None, 5)
+
+        result = await repository.estimate_all(key__eq="value")
+        self.assertTupleEqual(result, (10, True))
+
+        repository.entity_manager.count_all.assert_called_once_with(
+            dummy_class_mock, key__eq="value")
 
     async def test__repository_update_cacheable_commit_true(self):
         """Test update with cacheable entity and commit True."""
@@ -271,6 +889,8 @@ class RepositoryTestCase(asynctest.TestCase):
         repository = Repository(None, None, dummy_class_mock)
         repository.entity_manager = AsyncMock()
         repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_renamed_index_keys = MagicMock(
+            return_value=["index:dummies:dummy_name:old"])
 
         result = await repository.update(dummy_mock, commit=True)
         self.assertIsNone(result)
@@ -283,6 +903,17 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.cache_manager.set.assert_called_with(dummy_mock)
         repository.cache_manager.delete.assert_not_called()
 
+        repository.cache_manager.delete_index.assert_called_once()
+        repository.cache_manager.delete_index.assert_called_with(
+            ["index:dummies:dummy_name:old"])
+
+        repository.cache_manager.invalidate.assert_called_once()
+        repository.cache_manager.invalidate.assert_called_with(dummy_mock)
+
+        repository.cache_manager.bump_generation.assert_called_once()
+        repository.cache_manager.bump_generation.assert_called_with(
+            dummy_class_mock)
+
     async def test__repository_update_cacheable_commit_false(self):
         """Test update with cacheable entity and commit False."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
@@ -291,6 +922,8 @@ class RepositoryTestCase(asynctest.TestCase):
         repository = Repository(None, None, dummy_class_mock)
         repository.entity_manager = AsyncMock()
         repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_renamed_index_keys = MagicMock(
+            return_value=["index:dummies:dummy_name:old"])
 
         result = await repository.update(dummy_mock, commit=False)
         self.assertIsNone(result)
@@ -303,6 +936,17 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.cache_manager.delete.assert_called_once()
         repository.cache_manager.delete.assert_called_with(dummy_mock)
 
+        repository.cache_manager.delete_index.assert_called_once()
+        repository.cache_manager.delete_index.assert_called_with(
+            ["index:dummies:dummy_name:old"])
+
+        repository.cache_manager.invalidate.assert_called_once()
+        repository.cache_manager.invalidate.assert_called_with(dummy_mock)
+
+        repository.cache_manager.bump_generation.assert_called_once()
+        repository.cache_manager.bump_generation.assert_called_with(
+            dummy_class_mock)
+
     async def test__repository_update_uncacheable_commit_true(self):
         """Test update with uncacheable entity and commit True."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
@@ -322,6 +966,8 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.cache_manager.set.assert_not_called()
         repository.cache_manager.delete.assert_not_called()
 
+        repository.cache_manager.bump_generation.assert_not_called()
+
     async def test__repository_update_uncacheable_commit_false(self):
         """Test update with uncacheable entity and commit False."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
@@ -341,6 +987,8 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.cache_manager.set.assert_not_called()
         repository.cache_manager.delete.assert_not_called()
 
+        repository.cache_manager.bump_generation.assert_not_called()
+
     async def test__repository_delete_cacheable_commit_true(self):
         """Test delete with cacheable entity and commit True."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
@@ -359,6 +1007,12 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.delete.assert_called_once()
         repository.cache_manager.delete.assert_called_with(dummy_mock)
+        repository.cache_manager.invalidate.assert_called_once()
+        repository.cache_manager.invalidate.assert_called_with(dummy_mock)
+
+        repository.cache_manager.bump_generation.assert_called_once()
+        repository.cache_manager.bump_generation.assert_called_with(
+            dummy_class_mock)
 
     async def test__repository_delete_cacheable_commit_false(self):
         """Test delete with cacheable entity and commit False."""
@@ -378,6 +1032,12 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.delete.assert_called_once()
         repository.cache_manager.delete.assert_called_with(dummy_mock)
+        repository.cache_manager.invalidate.assert_called_once()
+        repository.cache_manager.invalidate.assert_called_with(dummy_mock)
+
+        repository.cache_manager.bump_generation.assert_called_once()
+        repository.cache_manager.bump_generation.assert_called_with(
+            dummy_class_mock)
 
     async def test__repository_delete_uncacheable_commit_true(self):
         """Test delete with uncacheable entity and commit True."""
@@ -397,6 +1057,8 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.delete.assert_not_called()
 
+        repository.cache_manager.bump_generation.assert_not_called()
+
     async def test__repository_delete_uncacheable_commit_false(self):
         """Test delete with uncacheable entity and commit False."""
         dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=False)
@@ -415,9 +1077,11 @@ class RepositoryTestCase(asynctest.TestCase):
 
         repository.cache_manager.delete.assert_not_called()
 
+        repository.cache_manager.bump_generation.assert_not_called()
+
     async def test__repository_count_all(self):
         """Test count_all method."""
-        dummy_class_mock = MagicMock()
+        dummy_class_mock = MagicMock(_cacheable=False)
         dummies_count = 123
 
         repository = Repository(None, None, dummy_class_mock)
@@ -431,6 +1095,44 @@ class RepositoryTestCase(asynctest.TestCase):
         repository.entity_manager.count_all.assert_called_with(
             dummy_class_mock, key__eq="value")
 
+    async def test__repository_count_all_cacheable(self):
+        """Test count_all method with cacheable entities."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.count_all.return_value = 123
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (None, 5)
+
+        result = await repository.count_all(
+            key__eq="value", order_by="id", order="asc", cursor="dummy")
+        self.assertEqual(result, 123)
+
+        repository.cache_manager.get_query.assert_called_once()
+        repository.cache_manager.get_query.assert_called_with(
+            dummy_class_mock, "count_all", {"key__eq": "value"})
+
+        repository.entity_manager.count_all.assert_called_once()
+        repository.cache_manager.set_query.assert_called_once()
+        repository.cache_manager.set_query.assert_called_with(
+            dummy_class_mock, "count_all", {"key__eq": "value"}, 123, 5)
+
+    async def test__repository_count_all_cacheable_cached(self):
+        """Test count_all method when the count is cached."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_query.return_value = (0, 5)
+
+        result = await repository.count_all(key__eq="value")
+        self.assertEqual(result, 0)
+
+        repository.entity_manager.count_all.assert_not_called()
+        repository.cache_manager.set_query.assert_not_called()
+
     async def test__repository_sum_all(self):
         """Test sum_all method."""
         dummy_class_mock = MagicMock()
@@ -451,12 +1153,196 @@ class RepositoryTestCase(asynctest.TestCase):
         """Test commit method."""
         repository = Repository(None, None, None)
         repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
 
         result = await repository.commit()
         self.assertIsNone(result)
 
         repository.entity_manager.commit.assert_called_once()
         repository.entity_manager.commit.assert_called_with()
+        repository.cache_manager.bump_generation.assert_not_called()
+
+    async def test__repository_commit_uncommitted(self):
+        """Test commit method after uncommitted changes."""
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True)
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+
+        await repository.delete(MagicMock(), commit=False)
+        self.assertTrue(repository.uncommitted)
+
+        result = await repository.commit()
+        self.assertIsNone(result)
+        self.assertFalse(repository.uncommitted)
+
+        self.assertEqual(
+            repository.cache_manager.bump_generation.call_count, 2)
+
+    async def test__repository_commit_uncommitted_flags(self):
+        """Test commit method drops flags of uncommitted changes."""
+        flag = {"dummy_role__eq": "admin"}
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_flags=(flag,))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+
+        await repository.insert(MagicMock(), commit=False)
+        self.assertListEqual(repository.uncommitted_flags, [flag])
+
+        await repository.commit()
+        self.assertListEqual(repository.uncommitted_flags, [])
+
+        self.assertEqual(repository.cache_manager.delete_flags.call_count, 2)
+        repository.cache_manager.delete_flags.assert_called_with(
+            dummy_class_mock, [flag])
+
+    async def test__repository_exists_flag_hit(self):
+        """Test exists with declared criteria answered by the flag."""
+        flag = {"dummy_role__eq": "admin"}
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_flags=(flag,))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_flag.return_value = True
+
+        result = await repository.exists(dummy_role__eq="admin")
+        self.assertTrue(result)
+
+        repository.cache_manager.get_flag.assert_called_once_with(
+            dummy_class_mock, flag)
+        repository.entity_manager.exists.assert_not_called()
+        repository.cache_manager.set_flag.assert_not_called()
+
+    async def test__repository_exists_flag_negative(self):
+        """Test exists with declared criteria does not cache negatives."""
+        flag = {"dummy_role__eq": "admin"}
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_flags=(flag,))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.exists.return_value = False
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_flag.return_value = False
+
+        result = await repository.exists(dummy_role__eq="admin")
+        self.assertFalse(result)
+
+        repository.entity_manager.exists.assert_called_once_with(
+            dummy_class_mock, dummy_role__eq="admin")
+        repository.cache_manager.set_flag.assert_not_called()
+
+    async def test__repository_exists_flag_miss(self):
+        """Test exists with declared criteria on a cold miss."""
+        flag = {"dummy_role__eq": "admin"}
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_flags=(flag,))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.exists.return_value = True
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_flag.return_value = None
+
+        result = await repository.exists(dummy_role__eq="admin")
+        self.assertTrue(result)
+
+        repository.entity_manager.exists.assert_called_once_with(
+            dummy_class_mock, dummy_role__eq="admin")
+        repository.cache_manager.set_flag.assert_called_once_with(
+            dummy_class_mock, flag, True)
+
+    async def test__repository_exists_other_criteria(self):
+        """Test exists with criteria that is not declared."""
+        dummy_class_mock = MagicMock(
+            __tablename__="dummies", _cacheable=True,
+            _cache_flags=({"dummy_role__eq": "admin"},))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+
+        await repository.exists(dummy_role__eq="reader")
+
+        repository.entity_manager.exists.assert_called_once()
+        repository.cache_manager.get_flag.assert_not_called()
+
+    async def test__repository_exists_many(self):
+        """Test exists many with flagged and other criteria."""
+        flag = {"dummy_role__eq": "admin"}
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_flags=(flag,))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.exists_many.return_value = [
+            True, True, False]
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_flag.return_value = None
+
+        result = await repository.exists_many([
+            {"dummy_name__eq": "dummy"}, flag, {"id__eq": 1}])
+        self.assertListEqual(result, [True, True, False])
+
+        repository.cache_manager.get_flag.assert_called_once_with(
+            dummy_class_mock, flag)
+        repository.entity_manager.exists_many.assert_called_once_with([
+            (dummy_class_mock, {"dummy_name__eq": "dummy"}),
+            (dummy_class_mock, flag),
+            (dummy_class_mock, {"id__eq": 1})])
+        repository.cache_manager.set_flag.assert_called_once_with(
+            dummy_class_mock, flag, True)
+
+    async def test__repository_exists_many_flag_hit(self):
+        """Test exists many when the flagged criteria is cached."""
+        flag = {"dummy_role__eq": "admin"}
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_flags=(flag,))
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.entity_manager.exists_many.return_value = [False]
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager.get_flag.return_value = True
+
+        result = await repository.exists_many([flag, {"id__eq": 1}])
+        self.assertListEqual(result, [True, False])
+
+        repository.entity_manager.exists_many.assert_called_once_with([
+            (dummy_class_mock, {"id__eq": 1})])
+        repository.cache_manager.set_flag.assert_not_called()
+
+    @patch("app.repository.inspect")
+    async def test__repository_update_changed_flags(self, inspect_mock):
+        """Test update drops flags which criteria columns changed."""
+        role_flag = {"dummy_role__eq": "admin"}
+        name_flag = {"dummy_name__eq": "dummy"}
+        dummy_class_mock = MagicMock(__tablename__="dummies", _cacheable=True,
+                                     _cache_flags=(role_flag, name_flag))
+        inspect_mock.return_value.attrs = {
+            "dummy_role": MagicMock(history=MagicMock(
+                has_changes=MagicMock(return_value=True))),
+            "dummy_name": MagicMock(history=MagicMock(
+                has_changes=MagicMock(return_value=False))),
+        }
+
+        repository = Repository(None, None, dummy_class_mock)
+        repository.entity_manager = AsyncMock()
+        repository.cache_manager = AsyncMock()
+        repository.cache_manager._get_renamed_index_keys = MagicMock(
+            return_value=[])
+
+        await repository.update(MagicMock(), commit=True)
+
+        repository.cache_manager.delete_flags.assert_called_once_with(
+            dummy_class_mock, [role_flag])
+        self.assertListEqual(repository.uncommitted_flags, [])
 
     async def test__repository_rollback(self):
         """Test rollback method."""
@@ -0,0 +1,205 @@
+import asynctest
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+
+class BloomFilterTestCase(asynctest.TestCase):
+    """Test case for BloomFilter class."""
+
+    async def test__init(self):
+        """Test BloomFilter initialization."""
+        from app.revocation import BloomFilter
+
+        bloom_filter = BloomFilter(1000, 0.001)
+        self.assertEqual(bloom_filter.size, 14378)
+        self.assertEqual(bloom_filter.hashes, 10)
+        self.assertEqual(len(bloom_filter.bits), 1798)
+        self.assertEqual(bloom_filter.count, 0)
+        self.assertFalse(bloom_filter.synced)
+
+    async def test__add(self):
+        """Test add method and membership of BloomFilter."""
+        from app.revocation import BloomFilter
+
+        bloom_filter = BloomFilter(1000, 0.001)
+        bloom_filter.add("dummy")
+        self.assertIn("dummy", bloom_filter)
+        self.assertNotIn("other", bloom_filter)
+        self.assertEqual(bloom_filter.count, 1)
+
+    async def test__false_positives(self):
+        """Test false positive rate of BloomFilter within capacity."""
+        from app.revocation import BloomFilter
+
+        bloom_filter = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom_filter.add("added-%s" % i)
+
+        self.assertTrue(all("added-%s" % i in bloom_filter
+                            for i in range(1000)))
+        false_positives = sum("missing-%s" % i in bloom_filter
+                              for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    async def test__reset(self):
+        """Test reset method replaces all items of BloomFilter."""
+        from app.revocation import BloomFilter
+
+        bloom_filter = BloomFilter(1000, 0.001)
+        bloom_filter.add("dummy")
+        bloom_filter.reset(["first", "second"])
+        self.assertNotIn("dummy", bloom_filter)
+        self.assertIn("first", bloom_filter)
+        self.assertIn("second", bloom_filter)
+        self.assertEqual(bloom_filter.count, 2)
+
+    async def test__clear(self):
+        """Test clear method of BloomFilter."""
+        from app.revocation import BloomFilter
+
+        bloom_filter = BloomFilter(1000, 0.001)
+        bloom_filter.add("dummy")
+        bloom_filter.clear()
+        self.assertNotIn("dummy", bloom_filter)
+        self.assertEqual(bloom_filter.count, 0)
+
+
+class RevocationManagerTestCase(asynctest.TestCase):
+    """Test case for RevocationManager class."""
+
+    async def setUp(self):
+        """Set up the test case environment."""
+        from app.revocation import RevocationManager
+
+        self.cache_mock = AsyncMock()
+        self.revocation_manager = RevocationManager(self.cache_mock)
+
+    async def tearDown(self):
+        """Clean up the test case environment."""
+        del self.cache_mock
+        del self.revocation_manager
+
+    async def test__get_key(self):
+        """Test _get_key method of RevocationManager."""
+        result = self.revocation_manager._get_key(123)
+        self.assertEqual(result, "revoked:123")
+
+    @patch("app.revocation.revoked_users")
+    @patch("app.revocation.time")
+    @patch("app.revocation.HashHelper")
+    @patch("app.revocation.cfg")
+    async def test__revoke(self, cfg_mock, hash_mock, time_mock, bloom_mock):
+        """Test revoke method of RevocationManager."""
+        from app.revocation import REVOCATION_CHANNEL, REVOCATION_LEEWAY
+
+        cfg_mock.JWT_EXPIRES = 60
+        hash_mock.keyed_hash.return_value = "abc"
+        time_mock.return_value = 1000.5
+
+        await self.revocation_manager.revoke(123, "dummy")
+        hash_mock.keyed_hash.assert_called_once_with("dummy")
+        self.cache_mock.set.assert_called_once_with(
+            "revoked:123", "1000:abc", ex=60 + REVOCATION_LEEWAY)
+        self.cache_mock.publish.assert_called_once_with(
+            REVOCATION_CHANNEL, "123")
+        bloom_mock.add.assert_called_once_with("123")
+
+    @patch("app.revocation.revoked_users", new=set())
+    async def test__is_revoked_filtered(self):
+        """Test is_revoked method when the filter rules the user out."""
+        result = await self.revocation_manager.is_revoked(
+            {"user_id": 123, "iat": 900, "jti": "dummy"})
+        self.assertFalse(result)
+        self.cache_mock.get.assert_not_called()
+
+    @patch("app.revocation.revoked_users", new={"123"})
+    @patch("app.revocation.HashHelper.keyed_hash")
+    async def test__is_revoked_before_cutoff(self, keyed_hash_mock):
+        """Test is_revoked method for tokens issued before the cutoff."""
+        keyed_hash_mock.return_value = "def"
+        self.cache_mock.get.return_value = b"1000:abc"
+
+        result = await self.revocation_manager.is_revoked(
+            {"user_id": 123, "iat": 999, "jti": "other"})
+        self.assertTrue(result)
+        self.cache_mock.get.assert_called_once_with("revoked:123")
+
+    @patch("app.revocation.revoked_users", new={"123"})
+    @patch("app.revocation.HashHelper.keyed_hash")
+    async def test__is_revoked_cutoff_jti(self, keyed_hash_mock):
+        """Test is_revoked method for the revoked jti at the cutoff."""
+        keyed_hash_mock.side_effect = lambda x: {"dummy": "abc"}.get(x, "def")
+        self.cache_mock.get.return_value = "1000:abc"
+
+        result = await self.revocation_manager.is_revoked(
+            {"user_id": 123, "iat": 1000, "jti": "dummy"})
+        self.assertTrue(result)
+
+        result = await self.revocation_manager.is_revoked(
+            {"user_id": 123, "iat": 1000, "jti": "other"})
+        self.assertFalse(result)
+
+    @patch("app.revocation.revoked_users", new={"123"})
+    async def test__is_revoked_false_positive(self):
+        """Test is_revoked method when the filter gives false positive."""
+        self.cache_mock.get.return_value = None
+
+        result = await self.revocation_manager.is_revoked(
+            {"user_id": 123, "iat": 900, "jti": "dummy"})
+        self.assertFalse(result)
+        self.cache_mock.get.assert_called_once_with("revoked:123")
+
+
+class ListenRevocationsTestCase(asynctest.TestCase):
+    """Test case for listen_revocations function."""
+
+    @patch("app.revocation.asyncio.sleep")
+    @patch("app.revocation._listen_revocations")
+    async def test__listen_revocations_restart(self, listen_mock,
+                                               sleep_mock):
+        """Test the listener is restarted after a connection error."""
+        import asyncio
+        from app.revocation import listen_revocations, RECONNECT_DELAY
+
+        listen_mock.side_effect = [ConnectionError("dummy"), None,
+                                   asyncio.CancelledError()]
+
+        with self.assertRaises(asyncio.CancelledError):
+            await listen_revocations()
+
+        self.assertEqual(listen_mock.call_count, 3)
+        sleep_mock.assert_called_with(RECONNECT_DELAY)
+
+    @patch("app.revocation.revoked_users")
+    @patch("app.revocation.redis")
+    async def test__listen_revocations_reload(self, redis_mock, bloom_mock):
+        """Test the filter is reloaded from the revoked keys."""
+        from app.revocation import _listen_revocations, REVOCATION_CHANNEL
+
+        async def scan_iter(match, count):
+            for key in ["revoked:1", "revoked:2"]:
+                yield key
+
+        async def listen():
+            self.assertTrue(bloom_mock.synced)
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": "3"}
+
+        conn_mock = MagicMock(aclose=AsyncMock(), scan_iter=scan_iter)
+        pubsub_mock = MagicMock(subscribe=AsyncMock(), aclose=AsyncMock(),
+                                listen=listen)
+        conn_mock.pubsub.return_value = pubsub_mock
+        redis_mock.Redis.return_value = conn_mock
+
+        await _listen_revocations()
+
+        pubsub_mock.subscribe.assert_awaited_once_with(REVOCATION_CHANNEL)
+        bloom_mock.reset.assert_called_once_with(["1", "2"])
+        bloom_mock.add.assert_called_once_with("3")
+        self.assertFalse(bloom_mock.synced)
+        pubsub_mock.aclose.assert_awaited_once()
+        conn_mock.aclose.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asynctest
+import orjson
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+
+class TokenManagerTestCase(asynctest.TestCase):
+    """Test case for TokenManager class."""
+
+    async def setUp(self):
+        """Set up the test case environment."""
+        from app.managers.token_manager import TokenManager
+
+        self.cache_mock = AsyncMock()
+        self.token_manager = TokenManager(self.cache_mock)
+
+    async def tearDown(self):
+        """Clean up the test case environment."""
+        del self.cache_mock
+        del self.token_manager
+
+    async def test__init(self):
+        """Test TokenManager initialization."""
+        self.assertEqual(self.token_manager.cache, self.cache_mock)
+        self.assertIsNone(self.token_manager.local_cache)
+
+    async def test__get_key(self):
+        """Test _get_key method does not expose the token."""
+        result = self.token_manager._get_key("dummy")
+        self.assertTrue(result.startswith("token:"))
+        self.assertNotIn("dummy", result)
+        self.assertEqual(len(result), 70)
+
+    @patch("app.managers.token_manager.time")
+    async def test__token_manager_get(self, time_mock):
+        """Test get method of TokenManager."""
+        time_mock.return_value = 100
+        token_payload = {"user_id": 1, "user_role": "admin",
+                         "jti_version": "abc", "exp": 200}
+        self.cache_mock.get.return_value = orjson.dumps(token_payload)
+
+        result = await self.token_manager.get("dummy")
+        self.assertDictEqual(result, token_payload)
+
+        self.cache_mock.get.assert_called_once_with(
+            self.token_manager._get_key("dummy"))
+
+    @patch("app.managers.token_manager.time")
+    async def test__token_manager_get_expired(self, time_mock):
+        """Test get method of TokenManager when the token expired."""
+        time_mock.return_value = 300
+        self.cache_mock.get.return_value = orjson.dumps({"exp": 200})
+
+        result = await self.token_manager.get("dummy")
+        self.assertIsNone(result)
+
+    async def test__token_manager_get_none(self):
+        """Test get method of TokenManager when the token is missed."""
+        self.cache_mock.get.return_value = None
+
+        result = await self.token_manager.get("dummy")
+        self.assertIsNone(result)
+
+    @patch("app.managers.token_manager.time")
+    async def test__token_manager_get_local_cache(self, time_mock):
+        """Test get method of TokenManager with the local cache hit."""
+        time_mock.return_value = 100
+        self.token_manager.local_cache = MagicMock()
+        self.token_manager.local_cache.get.return_value = orjson.dumps(
+            {"exp": 200})
+
+        result = await self.token_manager.get("dummy")
+        self.assertDictEqual(result, {"exp": 200})
+
+        self.cache_mock.get.assert_not_called()
+
+    @patch("app.managers.token_manager.time")
+    async def test__token_manager_set(self, time_mock):
+        """Test set method of TokenManager caps TTL at the expiration."""
+        time_mock.return_value = 100
+        self.token_manager.local_cache = MagicMock()
+
+        result = await self.token_manager.set("dummy", 1, "admin", "abc", 160)
+        self.assertIsNone(result)
+
+        key = self.token_manager._get_key("dummy")
+        token_bytes = orjson.dumps({"user_id": 1, "user_role": "admin",
+                                    "jti_version": "abc", "exp": 160})
+        self.cache_mock.set.assert_called_once_with(key, token_bytes, ex=60)
+        self.token_manager.local_cache.set.assert_called_once_with(
+            key, token_bytes)
+
+    @patch("app.managers.token_manager.time")
+    async def test__token_manager_set_expired(self, time_mock):
+        """Test set method of TokenManager skips expired tokens."""
+        time_mock.return_value = 200
+
+        await self.token_manager.set("dummy", 1, "admin", "abc", 160)
+        self.cache_mock.set.assert_not_called()
+
+    async def test__token_manager_delete(self):
+        """Test delete method of TokenManager."""
+        from app.local_cache import INVALIDATE_CHANNEL
+
+        self.token_manager.local_cache = MagicMock()
+
+        result = await self.token_manager.delete("dummy")
+        self.assertIsNone(result)
+
+        key = self.token_manager._get_key("dummy")
+        self.cache_mock.delete.assert_called_once_with(key)
+        self.token_manager.local_cache.delete.assert_called_once_with(key)
+        self.cache_mock.publish.assert_called_once_with(
+            INVALIDATE_CHANNEL, key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import asynctest
+import unittest
+from unittest.mock import AsyncMock, patch
+
+
+class WarmupTestCase(asynctest.TestCase):
+    """Test case for cache warm-up."""
+
+    @patch("app.warmup.CacheManager")
+    @patch("app.warmup.EntityManager")
+    @patch("app.warmup.cfg")
+    async def test__warm_up(self, cfg_mock, entity_manager_mock,
+                            cache_manager_mock):
+        """Test warm_up loads hot sets in batches."""
+        from app.warmup import warm_up, WARMUP_LOCK, WARMUP_SETS
+        from app.managers.entity_manager import OFFSET, LIMIT
+
+        cfg_mock.WARMUP_BUDGET = 10
+        cfg_mock.WARMUP_SETS = ["top_albums", "unknown"]
+        cfg_mock.WARMUP_LIMIT = 3
+        cache_mock = AsyncMock()
+        cache_mock.set.return_value = True
+        select_all_mock = AsyncMock(side_effect=[[1, 2, 3]])
+        entity_manager_mock.return_value.select_all = select_all_mock
+        set_many_mock = AsyncMock()
+        cache_manager_mock.return_value.set_many = set_many_mock
+
+        result = await warm_up(None, cache_mock)
+        self.assertEqual(result, 3)
+
+        cache_mock.set.assert_called_once_with(WARMUP_LOCK, 1, nx=True,
+                                               ex=10)
+        cls, kwargs = WARMUP_SETS["top_albums"]
+        select_all_mock.assert_called_once_with(
+            cls, **kwargs, **{OFFSET: 0, LIMIT: 3})
+        set_many_mock.assert_called_once_with([1, 2, 3])
+
+    @patch("app.warmup.WARMUP_BATCH_SIZE", 2)
+    @patch("app.warmup.CacheManager")
+    @patch("app.warmup.EntityManager")
+    @patch("app.warmup.cfg")
+    async def test__warm_up_batches(self, cfg_mock, entity_manager_mock,
+                                    cache_manager_mock):
+        """Test warm_up stops when a batch is not full."""
+        from app.warmup import warm_up
+
+        cfg_mock.WARMUP_BUDGET = 10
+        cfg_mock.WARMUP_SETS = ["active_users"]
+        cfg_mock.WARMUP_LIMIT = 10
+        cache_mock = AsyncMock()
+        cache_mock.set.return_value = True
+        select_all_mock = AsyncMock(side_effect=[[1, 2], [3]])
+        entity_manager_mock.return_value.select_all = select_all_mock
+        cache_manager_mock.return_value.set_many = AsyncMock()
+
+        result = await warm_up(None, cache_mock)
+        self.assertEqual(result, 3)
+        self.assertEqual(select_all_mock.call_count, 2)
+
+    @patch("app.warmup.EntityManager")
+    @patch("app.warmup.cfg")
+    async def test__warm_up_locked(self, cfg_mock, entity_manager_mock):
+        """Test warm_up is skipped when another worker holds the lock."""
+        from app.warmup import warm_up
+
+        cfg_mock.WARMUP_BUDGET = 10
+        cache_mock = AsyncMock()
+        cache_mock.set.return_value = None
+
+        result = await warm_up(None, cache_mock)
+        self.assertEqual(result, 0)
+
+        entity_manager_mock.assert_not_called()
+
+    @patch("app.warmup.monotonic")
+    @patch("app.warmup.CacheManager")
+    @patch("app.warmup.EntityManager")
+    @patch("app.warmup.cfg")
+    async def test__warm_up_budget(self, cfg_mock, entity_manager_mock,
+                                   cache_manager_mock, monotonic_mock):
+        """Test warm_up stops when the time budget is exceeded."""
+        from app.warmup import warm_up
+
+        cfg_mock.WARMUP_BUDGET = 10
+        cfg_mock.WARMUP_SETS = ["admins", "top_albums"]
+        cfg_mock.WARMUP_LIMIT = 10
+        monotonic_mock.side_effect = [0, 11, 11, 11]
+        cache_mock = AsyncMock()
+        cache_mock.set.return_value = True
+        select_all_mock = AsyncMock()
+        entity_manager_mock.return_value.select_all = select_all_mock
+
+        result = await warm_up(None, cache_mock)
+        self.assertEqual(result, 0)
+
+        select_all_mock.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()